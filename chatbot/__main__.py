@@ -1,12 +1,26 @@
-"""Entry point for running the chatbot: python -m chatbot [--web] [--port PORT]"""
+"""Entry point for running the chatbot: python -m chatbot [--web] [--port PORT] [--build-snapshot] [--import-sqlite DB_PATH]"""
 
+import logging
 import sys
 
 
 def main():
     args = sys.argv[1:]
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-    if "--web" in args:
+    if "--import-sqlite" in args:
+        # Convert the CSV source into an indexed SQLite database
+        from chatbot.presentation.cli import import_sqlite_main
+        idx = args.index("--import-sqlite")
+        if idx + 1 >= len(args):
+            print("Kullanım: python -m chatbot --import-sqlite DB_PATH")
+            sys.exit(1)
+        import_sqlite_main(args[idx + 1])
+    elif "--build-snapshot" in args:
+        # Deploy step: parse the CSV once and write the catalog snapshot
+        from chatbot.presentation.cli import build_snapshot_main
+        build_snapshot_main()
+    elif "--web" in args:
         # Web UI mode
         from chatbot.presentation.web import main as web_main
         web_main()
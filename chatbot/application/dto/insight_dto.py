@@ -42,4 +42,5 @@ class InsightDTO:
     polarizing: List[Dict[str, Any]] = field(default_factory=list)
     best_value: List[Dict[str, Any]] = field(default_factory=list)
     category_insights: List[CategoryInsightDTO] = field(default_factory=list)
+    comment_trends: Dict[str, Any] = field(default_factory=dict)
     llm_context: str = ""
@@ -1,4 +1,10 @@
-from .analysis_service import AnalysisService
+from .analysis_service import AnalysisService, CatalogState
 from .chatbot_service import ChatbotService
+from .catalog_watcher import CatalogWatcher
+from .context_retriever import ContextRetriever, RetrievedContext
+from .conversation_store import ConversationStore
 
-__all__ = ["AnalysisService", "ChatbotService"]
+__all__ = [
+    "AnalysisService", "CatalogState", "ChatbotService", "CatalogWatcher", "ContextRetriever", "RetrievedContext",
+    "ConversationStore",
+]
@@ -1,47 +1,139 @@
 """Analysis Service - application service that orchestrates data loading and analysis."""
 
 from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List
 
+from chatbot.domain.entities.product import Product
 from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.entities.catalog_query import CatalogQuery, QueryPage
 from chatbot.domain.services.product_analyzer import ProductAnalyzer
 from chatbot.application.dto.insight_dto import InsightDTO, CategoryInsightDTO
-from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+from chatbot.infrastructure.data.repository_factory import create_repository
+
+
+@dataclass(frozen=True)
+class CatalogState:
+    """One loaded catalog version together with its analyzer.
+
+    `pushdown` says whether the repository's own search still matches the
+    catalog, which stops being true once a delta is applied in memory.
+    """
+
+    catalog: ProductCatalog
+    analyzer: ProductAnalyzer
+    version: int
+    loaded_at: float
+    load_seconds: float
+    pushdown: bool
 
 
 class AnalysisService:
     """Application service that coordinates loading data and running analysis.
 
-    Acts as the bridge between infrastructure (CSV loading) and domain (analysis).
+    Acts as the bridge between infrastructure (CSV or SQLite loading) and domain (analysis).
+    The catalog and analyzer are published together as one `CatalogState`, so a
+    reload builds the next state off to the side and swaps it in atomically.
     """
 
     def __init__(self, csv_path: str) -> None:
-        self._repository = CsvProductRepository(csv_path)
-        self._catalog: ProductCatalog | None = None
-        self._analyzer: ProductAnalyzer | None = None
+        self._repository = create_repository(csv_path)
+        self._state: CatalogState | None = None
+        self._reload_lock = threading.Lock()
 
     def initialize(self) -> None:
         """Load data and prepare the analyzer."""
-        self._catalog = self._repository.load_catalog()
-        self._analyzer = ProductAnalyzer(self._catalog)
+        with self._reload_lock:
+            self._state = self._build_state()
+
+    def reload(self) -> CatalogState:
+        """Build a fresh catalog and analyzer from the source, then swap them in.
+
+        Readers keep using the previous state until the swap; callers holding a
+        reference to the old catalog or analyzer can finish with it safely.
+        """
+        with self._reload_lock:
+            self._state = self._build_state()
+            return self._state
+
+    def apply_delta(self, delta_path: str) -> Dict[str, int]:
+        """Apply a partial CSV export to a copy of the loaded catalog, then swap it in.
+
+        Like a reload, readers keep the previous state until the swap, and a
+        delta that fails leaves it untouched. The change lives in memory
+        only: a restart or full reload goes back to the main CSV, which the
+        scraper is expected to refresh as well.
+        """
+        delta = self._repository.load_delta(delta_path)
+        with self._reload_lock:
+            state = self.state
+            started = time.perf_counter()
+            catalog = state.catalog.copy()
+            result = catalog.apply_delta(delta)
+            self._state = CatalogState(
+                catalog=catalog,
+                analyzer=ProductAnalyzer(catalog),
+                version=state.version + 1,
+                loaded_at=time.time(),
+                load_seconds=time.perf_counter() - started,
+                pushdown=False,
+            )
+        return result
 
     @property
-    def catalog(self) -> ProductCatalog:
-        if self._catalog is None:
+    def state(self) -> CatalogState:
+        if self._state is None:
             raise RuntimeError("Önce initialize() çağrılmalı.")
-        return self._catalog
+        return self._state
+
+    @property
+    def catalog(self) -> ProductCatalog:
+        return self.state.catalog
 
     @property
     def analyzer(self) -> ProductAnalyzer:
-        if self._analyzer is None:
-            raise RuntimeError("Önce initialize() çağrılmalı.")
-        return self._analyzer
+        return self.state.analyzer
+
+    @property
+    def is_reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    def source_signature(self) -> tuple:
+        """Cheap change marker of the underlying data source."""
+        return self._repository.source_signature()
+
+    def search_products(self, keyword: str, limit: int = 10) -> List[Product]:
+        """Keyword search, falling back to typo-tolerant name matching when nothing matches.
+
+        The keyword step is answered by the database's full-text index when one
+        backs the catalog.
+        """
+        state = self.state
+        if state.pushdown:
+            products = self._repository.search(keyword, limit)
+        else:
+            products = state.catalog.search(keyword, limit)
+        return products or state.catalog.fuzzy_search(keyword, limit)
+
+    def query_products(self, query: CatalogQuery) -> QueryPage:
+        """Filtered, sorted page of the in-memory catalog; see `CatalogQuery`."""
+        return self.catalog.query(query)
 
     def generate_full_insights(self) -> InsightDTO:
         """Generate complete insights DTO with all analysis results."""
-        analyzer = self.analyzer
-        catalog = self.catalog
+        state = self.state
+        return self.build_insights(state.analyzer, state.catalog)
+
+    @staticmethod
+    def build_insights(analyzer: ProductAnalyzer, catalog: ProductCatalog) -> InsightDTO:
+        """All analysis results of `catalog`; categories appear in catalog (sorted) order.
 
-        # Build category insights
+        Category aggregates come from the analyzer's snapshot, which computes
+        them for every category at once; the per-category work here is
+        formatting. The context below reuses the memoized category analyses.
+        """
         category_insights = []
         for cat in catalog.categories:
             cat_analysis = analyzer.category_analysis(cat)
@@ -65,9 +157,28 @@ class AnalysisService:
             polarizing=analyzer.polarizing_products(5),
             best_value=analyzer.best_value_products(5),
             category_insights=category_insights,
+            comment_trends=analyzer.trend_summary(5),
             llm_context=analyzer.generate_llm_context(),
         )
 
-    def get_llm_context(self) -> str:
-        """Get the analysis context string for the LLM."""
-        return self.analyzer.generate_llm_context()
+    def get_llm_context(self, max_tokens: int | None = None) -> str:
+        """Get the analysis context string for the LLM, cut to `max_tokens` when given."""
+        return self.analyzer.generate_llm_context(max_tokens)
+
+    def get_summary_context(self) -> str:
+        """Get the compact catalog summary used as the fixed LLM prefix."""
+        return self.analyzer.generate_summary_context()
+
+    def _build_state(self) -> CatalogState:
+        started = time.perf_counter()
+        catalog = self._repository.load_catalog()
+        analyzer = ProductAnalyzer(catalog)
+        previous = self._state
+        return CatalogState(
+            catalog=catalog,
+            analyzer=analyzer,
+            version=previous.version + 1 if previous else 1,
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - started,
+            pushdown=hasattr(self._repository, "search"),
+        )
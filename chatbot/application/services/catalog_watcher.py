@@ -0,0 +1,58 @@
+"""Catalog Watcher - background thread that reloads the chatbot when its data source changes."""
+
+from __future__ import annotations
+import logging
+import threading
+
+from chatbot.application.services.chatbot_service import ChatbotService
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogWatcher:
+    """Polls the chatbot's data source and triggers `ChatbotService.reload` on change.
+
+    A change is acted on only once the source signature has been stable for
+    one full interval, so a CSV that is still being written is not loaded
+    half-way through.
+    """
+
+    def __init__(self, chatbot: ChatbotService, interval: float = 30.0) -> None:
+        self._chatbot = chatbot
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        loaded = self._signature()
+        pending = None
+        while not self._stop.wait(self._interval):
+            current = self._signature()
+            if current is None or current == loaded:
+                pending = None
+                continue
+            if current != pending:
+                # First sighting of the change: wait one more interval for writes to settle
+                pending = current
+                continue
+            try:
+                if self._chatbot.reload():
+                    loaded = current
+                    pending = None
+            except Exception as e:
+                logger.warning("Uyarı: Katalog yeniden yüklenemedi: %s", e)
+
+    def _signature(self) -> tuple | None:
+        try:
+            return self._chatbot.source_signature()
+        except OSError:
+            return None
@@ -1,10 +1,21 @@
 """Chatbot Service - application service that orchestrates the chatbot experience."""
 
 from __future__ import annotations
-from typing import Generator
+import logging
+import threading
+import time
+from typing import Any, Dict, Generator, List
 
 from chatbot.application.services.analysis_service import AnalysisService
+from chatbot.application.services.context_retriever import ContextRetriever, RetrievedContext
+from chatbot.application.services.conversation_store import ConversationStore
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.catalog_query import CatalogQuery
+from chatbot.domain.services.context_builder import char_budget
 from chatbot.infrastructure.llm.gemini_client import GeminiClient
+from chatbot.infrastructure.settings import env_float, env_int
+
+logger = logging.getLogger(__name__)
 
 
 class ChatbotService:
@@ -12,14 +23,40 @@ class ChatbotService:
 
     This is the main orchestrator that:
     1. Loads and analyzes product data
-    2. Injects analysis context into the LLM
-    3. Handles user conversations
+    2. Injects a compact catalog summary into the LLM
+    3. Handles user conversations, retrieving the catalog data each message needs
+
+    Messages with a `session_id` (the web server's users) get a conversation
+    of their own from a `ConversationStore`; without one they share the LLM
+    client's single conversation (the CLI). All of them share the catalog and
+    its summary context.
     """
 
-    def __init__(self, csv_path: str, gemini_api_key: str) -> None:
+    def __init__(
+        self,
+        csv_path: str,
+        gemini_api_key: str,
+        context_budget: int | None = None,
+        sessions: ConversationStore | None = None,
+    ) -> None:
         self._analysis_service = AnalysisService(csv_path)
         self._llm_client = GeminiClient(gemini_api_key)
+        self._retriever = ContextRetriever()
+        # Token budget of the per-message context; 0 means unlimited
+        if context_budget is None:
+            context_budget = env_int("BEAUTYBOT_CONTEXT_BUDGET", 0)
+        self._context_budget = max(0, context_budget) or None
+        if sessions is None:
+            sessions = ConversationStore(
+                self._llm_client.new_conversation,
+                max_sessions=env_int("BEAUTYBOT_MAX_SESSIONS", 1000),
+                ttl_seconds=env_float("BEAUTYBOT_SESSION_TTL", 1800.0),
+                max_bytes=int(env_float("BEAUTYBOT_SESSION_MEMORY_MB", 64.0) * 1024 * 1024),
+            )
+        self._sessions = sessions
         self._initialized = False
+        self._reload_lock = threading.Lock()
+        self._last_reload_seconds: float | None = None
 
     def initialize(self) -> str:
         """Initialize the chatbot: load data, analyze, and inject context into LLM.
@@ -30,11 +67,11 @@ class ChatbotService:
         self._analysis_service.initialize()
         catalog = self._analysis_service.catalog
 
-        # Step 2: Generate analysis context
-        llm_context = self._analysis_service.get_llm_context()
+        # Step 2: Generate the catalog summary; details are retrieved per message
+        summary_context = self._analysis_service.get_summary_context()
 
-        # Step 3: Inject context into LLM
-        self._llm_client.inject_context(llm_context)
+        # Step 3: Inject the summary into LLM
+        self._llm_client.inject_context(summary_context)
 
         self._initialized = True
 
@@ -43,25 +80,119 @@ class ChatbotService:
             f"{len(catalog.categories)} kategori analiz edildi."
         )
 
-    def chat_stream(self, user_message: str) -> Generator[str, None, None]:
-        """Process a user message and stream the response."""
+    def reload(self) -> bool:
+        """Rebuild the catalog and analysis from the source and swap them in.
+
+        New conversations get the refreshed LLM context; conversations and
+        streams already in progress keep the context they started with.
+        Returns False without doing anything if a reload or delta is already running.
+        """
         self._ensure_initialized()
-        yield from self._llm_client.chat_stream(user_message)
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            started = time.perf_counter()
+            state = self._analysis_service.reload()
+            self._llm_client.inject_context(state.analyzer.generate_summary_context())
+            self._last_reload_seconds = time.perf_counter() - started
+            logger.info(
+                "Katalog yeniden yüklendi: sürüm %d, %d ürün, %.2f sn",
+                state.version, state.catalog.total_products, self._last_reload_seconds,
+            )
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def apply_delta(self, delta_path: str) -> Dict[str, int] | None:
+        """Apply a partial CSV export and refresh the LLM context for new conversations.
+
+        Deltas and reloads take turns: returns None without doing anything if
+        either is already running.
+        """
+        self._ensure_initialized()
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            result = self._analysis_service.apply_delta(delta_path)
+            self._llm_client.inject_context(self._analysis_service.analyzer.generate_summary_context())
+        finally:
+            self._reload_lock.release()
+        logger.info(
+            "Katalog güncellendi: %d güncellendi, %d eklendi, %d silindi",
+            result["updated"], result["added"], result["deleted"],
+        )
+        return result
 
-    def chat(self, user_message: str) -> str:
+    def catalog_status(self) -> Dict[str, Any]:
+        """Version and reload timings of the catalog currently being served."""
+        self._ensure_initialized()
+        state = self._analysis_service.state
+        return {
+            "catalog_version": state.version,
+            "total_products": state.catalog.total_products,
+            "loaded_at": state.loaded_at,
+            "load_seconds": round(state.load_seconds, 3),
+            "last_reload_seconds": (
+                round(self._last_reload_seconds, 3) if self._last_reload_seconds is not None else None
+            ),
+            "reloading": self._reload_lock.locked(),
+            "analysis_cache": state.analyzer.cache_stats(),
+            "context_budget_tokens": self._context_budget,
+            "sessions": self._sessions.stats(),
+        }
+
+    def source_signature(self) -> tuple:
+        return self._analysis_service.source_signature()
+
+    def chat_stream(self, user_message: str, session_id: str | None = None) -> Generator[str, None, None]:
+        """Process a user message and stream the response, in the session's conversation if given."""
+        self._ensure_initialized()
+        retrieved = self.retrieve_context(user_message)
+        if session_id is None:
+            yield from self._llm_client.chat_stream(user_message, retrieved.text)
+            return
+        conversation = self._sessions.get(session_id)
+        try:
+            yield from self._llm_client.chat_stream(user_message, retrieved.text, conversation)
+        finally:
+            self._sessions.update(session_id)
+
+    def chat(self, user_message: str, session_id: str | None = None) -> str:
         """Process a user message and return the full response."""
+        return "".join(self.chat_stream(user_message, session_id))
+
+    def retrieve_context(self, user_message: str) -> RetrievedContext:
+        """Catalog data relevant to `user_message` within the context budget, logged with its size."""
         self._ensure_initialized()
-        return self._llm_client.chat(user_message)
+        state = self._analysis_service.state
+        started = time.perf_counter()
+        retrieved = self._retriever.retrieve(
+            user_message, state.catalog, state.analyzer, char_budget(self._context_budget)
+        )
+        report = retrieved.report
+        logger.info(
+            "Soru bağlamı: %d karakter (~%d token, bütçe %s), sabit özet %d karakter; "
+            "%d kategori, %d ürün, niyet: %s, özellik: %s; %s; %.1f ms",
+            report.size, report.estimated_tokens, self._context_budget or "yok",
+            len(state.analyzer.generate_summary_context()),
+            len(retrieved.categories), len(retrieved.products), ", ".join(retrieved.intents) or "-",
+            ", ".join(retrieved.aspects) or "-", report.describe(), (time.perf_counter() - started) * 1000,
+        )
+        return retrieved
 
-    def reset_conversation(self) -> None:
-        """Reset the conversation while keeping the analysis context."""
-        self._llm_client.reset_conversation()
+    def reset_conversation(self, session_id: str | None = None) -> None:
+        """Reset the conversation (the session's, if given) while keeping the analysis context."""
+        if session_id is None:
+            self._llm_client.reset_conversation()
+        else:
+            self._sessions.reset(session_id)
 
     def get_quick_stats(self) -> str:
         """Get a quick stats summary without using the LLM."""
         self._ensure_initialized()
-        overview = self._analysis_service.analyzer.catalog_overview()
-        sentiment = self._analysis_service.analyzer.sentiment_analysis_summary()
+        analyzer = self._analysis_service.analyzer
+        overview = analyzer.catalog_overview()
+        sentiment = analyzer.sentiment_analysis_summary()
 
         lines = [
             f"Toplam Ürün: {overview['total_products']}",
@@ -74,6 +205,38 @@ class ChatbotService:
         ]
         return "\n".join(lines)
 
+    def search_products(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Find products for a free-text query without using the LLM; tolerates typos."""
+        self._ensure_initialized()
+        return [self._product_summary(p) for p in self._analysis_service.search_products(query, limit)]
+
+    def query_products(self, query: CatalogQuery) -> Dict[str, Any]:
+        """Filter, sort and paginate the catalog without using the LLM."""
+        self._ensure_initialized()
+        page = self._analysis_service.query_products(query)
+        return {
+            "total": page.total,
+            "offset": page.offset,
+            "limit": page.limit,
+            "has_more": page.has_more,
+            "results": [self._product_summary(p) for p in page.products],
+            "facets": page.facets,
+        }
+
+    @staticmethod
+    def _product_summary(p: Product) -> Dict[str, Any]:
+        return {
+            "product_id": p.product_id,
+            "name": p.name,
+            "category": p.subcategory,
+            "price": str(p.price),
+            "rating": str(p.rating),
+            "comment_count": p.comment_count,
+            "color": p.color,
+            "origin": p.origin,
+            "url": p.url,
+        }
+
     def _ensure_initialized(self) -> None:
         if not self._initialized:
             raise RuntimeError("Chatbot henüz başlatılmadı. Önce initialize() çağrılmalı.")
@@ -0,0 +1,301 @@
+"""Context Retriever - picks the catalog data relevant to one user message."""
+
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from chatbot.domain.aspect_lexicon import match_aspect
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.entities.catalog_query import CatalogQuery
+from chatbot.domain.entities.trigram_index import trigrams
+from chatbot.domain.services.context_builder import ContextReport, ContextSection, fit_sections
+from chatbot.domain.services.product_analyzer import ProductAnalyzer
+from chatbot.domain.text_normalizer import fold, tokenize
+
+
+@dataclass(frozen=True)
+class RetrievedContext:
+    """Catalog data selected for one message, and the context text rendered from it."""
+
+    categories: Tuple[str, ...]
+    intents: Tuple[str, ...]
+    aspects: Tuple[str, ...]
+    products: Tuple[Product, ...]
+    price_range: Tuple[Optional[float], Optional[float]]
+    report: ContextReport
+
+    @property
+    def text(self) -> str:
+        return self.report.text
+
+    @property
+    def size(self) -> int:
+        return self.report.size
+
+
+class ContextRetriever:
+    """Builds a compact, question-specific context block from local indexes.
+
+    A message is matched against three things, all Turkish-folded:
+
+    - categories: every word of a category name must appear in the message,
+      allowing plural/case suffixes ("rujlar", "maskarası") and typos
+      (trigram similarity); a category whose matched words are a subset of
+      another match's ("maskara" inside "kaş maskarası") is dropped;
+    - intents: question words mapped to a ranking (yorum -> comments,
+      ucuz -> best value, trend -> rising comment rate, ...) and an
+      optional price bound ("200 TL altı");
+    - aspects: words of the comment aspect lexicon ("kalıcı", "kokusu"),
+      answered with the products whose comments praise or criticize them;
+    - products: the remaining words, through the catalog's keyword search.
+
+    Only the sections for what matched are rendered; a message that matches
+    nothing gets a few catalog-wide highlights. With a character budget the
+    sections are fitted in the order above (categories first, then products,
+    price filter, intents and aspects), cutting the last ones first.
+    """
+
+    MAX_CATEGORIES = 3
+    MAX_PRODUCTS = 5
+    MAX_ASPECTS = 2
+    LIMIT = 5
+    FALLBACK_LIMIT = 3
+    TYPO_SIMILARITY = 0.5
+
+    # intent -> folded word prefixes that signal it
+    INTENTS: Dict[str, Tuple[str, ...]] = {
+        "comments": ("yorum",),
+        "value": ("performans", "ucuz", "uygun", "ekonomik", "deger", "hesapli"),
+        "polarizing": ("tartismali", "kutuplas"),
+        "engagement": ("populer", "etkilesim", "favori"),
+        "rising": ("trend", "yukselen", "gundem"),
+        "price": ("fiyat", "pahali"),
+        "rating": ("puan", "iyi", "oner", "kaliteli"),
+    }
+    STOPWORDS = frozenset({
+        "en", "cok", "az", "bir", "bu", "su", "o", "ve", "veya", "ile", "icin", "gibi", "kadar", "daha",
+        "mi", "mu", "ne", "neler", "nedir", "nasil", "hangi", "hangisi", "hangileri", "var", "yok",
+        "bana", "bize", "ben", "sen", "misin", "musun", "mudur", "midir", "alan", "olan", "urun",
+        "urunler", "urunu", "urunleri", "kategori", "kategorisi", "kategoride", "analiz", "analizi",
+        "tl", "lira", "alti", "altinda", "ustu", "ustunde", "uzeri", "uzerinde", "arasi", "arasinda",
+        "hakkinda", "soyle", "goster", "listele", "karsilastir", "tavsiye", "almak", "istiyorum",
+    })
+    # Plural and case suffixes a category word may carry ("rujlar", "maskarası", "fondötenler")
+    _SUFFIX = re.compile(r"(lar|ler)?(i|u|si|su|in|un|nin|nun|a|e|ya|ye|da|de|ta|te|dan|den|tan|ten|la|le)?")
+    _PRICE_RANGE = re.compile(r"(\d+(?:[.,]\d+)?)\s*-\s*(\d+(?:[.,]\d+)?)\s*(?:tl|lira)?\S*\s*aras")
+    _PRICE_BOUND = re.compile(
+        r"(\d+(?:[.,]\d+)?)\s*(?:(?:tl|lira)\S*\s*|\s)(?:ve\s+)?(alt|ucuz|kadar|ust|uzer|pahali|fazla)"
+    )
+
+    def __init__(self) -> None:
+        # Folded words of each category, rebuilt when the catalog changes
+        self._catalog: ProductCatalog | None = None
+        self._version = -1
+        self._category_words: Dict[str, Tuple[str, ...]] = {}
+
+    def retrieve(
+        self, message: str, catalog: ProductCatalog, analyzer: ProductAnalyzer, budget: int | None = None
+    ) -> RetrievedContext:
+        words = tokenize(message)
+        categories, category_words = self._match_categories(words, catalog)
+        intents, intent_words = self._match_intents(words)
+        aspects, aspect_words = self._match_aspects([w for w in words if w not in category_words])
+        low, high = self._price_bounds(fold(message))
+
+        used = category_words | intent_words | aspect_words
+        keywords = [w for w in words if w not in used and w not in self.STOPWORDS and len(w) > 2 and not w.isdigit()]
+        products: List[Product] = catalog.search(" ".join(keywords), self.MAX_PRODUCTS, mode="or") if keywords else []
+
+        sections: List[ContextSection] = []
+        for category in categories:
+            sections.append(ContextSection.of(f"category:{category}", analyzer.category_section(category)))
+        sections.append(
+            ContextSection.of("products", analyzer.product_list_section("SORUDA GEÇEN ÜRÜNLER", products))
+        )
+        if low is not None or high is not None:
+            sections.extend(self._price_sections(catalog, analyzer, categories, intents, low, high))
+        for intent in intents:
+            if products and not categories and intent in ("comments", "rating"):
+                continue  # asked about the named products, which carry their own ratings and comments
+            sections.extend(self._intent_sections(intent, catalog, analyzer, categories))
+        for aspect in aspects:
+            for category in categories or [None]:
+                sections.append(ContextSection.of(
+                    f"aspect:{aspect}:{category or 'all'}", analyzer.aspect_section(aspect, category, self.LIMIT)
+                ))
+
+        if all(section.is_empty for section in sections):
+            sections = [
+                ContextSection.of("most_discussed", analyzer.most_discussed_section(self.FALLBACK_LIMIT)),
+                ContextSection.of("best_value", analyzer.best_value_section(self.FALLBACK_LIMIT)),
+            ]
+        return RetrievedContext(
+            categories=tuple(categories),
+            intents=tuple(intents),
+            aspects=tuple(aspects),
+            products=tuple(products),
+            price_range=(low, high),
+            report=fit_sections(sections, budget),
+        )
+
+    # --- Matching ---
+
+    def _match_categories(self, words: List[str], catalog: ProductCatalog) -> Tuple[List[str], Set[str]]:
+        matches: Dict[str, Set[str]] = {}
+        for category, category_words in self._vocabulary(catalog).items():
+            matched: Set[str] = set()
+            for cw in category_words:
+                hits = [w for w in words if self._word_matches(cw, w)]
+                if not hits:
+                    break
+                matched.update(hits)
+            else:
+                matches[category] = matched
+
+        # "kaş maskarası" also matches "maskara"; keep the more specific category
+        kept = [
+            cat for cat, matched in matches.items()
+            if not any(matched < other for other in matches.values())
+        ]
+        kept.sort(key=lambda cat: -len(matches[cat]))
+        kept = kept[: self.MAX_CATEGORIES]
+        return kept, set().union(*(matches[cat] for cat in kept))
+
+    def _word_matches(self, category_word: str, word: str) -> bool:
+        if word == category_word:
+            return True
+        if word.startswith(category_word) and len(category_word) >= 3:
+            return self._SUFFIX.fullmatch(word, len(category_word)) is not None
+        if len(category_word) >= 5 and len(word) >= 4:
+            a, b = trigrams(category_word), trigrams(word)
+            return len(a & b) / len(a | b) >= self.TYPO_SIMILARITY
+        return False
+
+    def _match_intents(self, words: List[str]) -> Tuple[List[str], Set[str]]:
+        intents: List[str] = []
+        matched: Set[str] = set()
+        for intent, prefixes in self.INTENTS.items():
+            hits = {w for w in words if w.startswith(prefixes)}
+            if hits:
+                intents.append(intent)
+                matched |= hits
+        return intents, matched
+
+    def _match_aspects(self, words: List[str]) -> Tuple[List[str], Set[str]]:
+        aspects: Dict[str, None] = {}
+        matched: Set[str] = set()
+        for w in words:
+            aspect = match_aspect(w) if w not in self.STOPWORDS else None
+            if aspect is not None:
+                aspects[aspect] = None
+                matched.add(w)
+        return list(aspects)[: self.MAX_ASPECTS], matched
+
+    def _price_bounds(self, text: str) -> Tuple[Optional[float], Optional[float]]:
+        match = self._PRICE_RANGE.search(text)
+        if match:
+            low, high = sorted((_number(match.group(1)), _number(match.group(2))))
+            return low, high
+        match = self._PRICE_BOUND.search(text)
+        if not match:
+            return None, None
+        amount = _number(match.group(1))
+        if match.group(2) in ("alt", "ucuz", "kadar"):
+            return None, amount
+        return amount, None
+
+    def _vocabulary(self, catalog: ProductCatalog) -> Dict[str, Tuple[str, ...]]:
+        if catalog is not self._catalog or catalog.version != self._version:
+            self._category_words = {cat: tuple(tokenize(cat)) for cat in catalog.categories}
+            self._catalog, self._version = catalog, catalog.version
+        return self._category_words
+
+    # --- Rendering ---
+
+    def _intent_sections(
+        self, intent: str, catalog: ProductCatalog, analyzer: ProductAnalyzer, categories: List[str]
+    ) -> List[ContextSection]:
+        if intent == "price":
+            return [ContextSection.of("price_ranges", analyzer.price_ranges_section(categories or None))]
+        if intent == "rating":
+            # The category sections already list their best rated products
+            return [] if categories else [ContextSection.of("top_rated", analyzer.top_rated_section())]
+        if not categories:
+            render = {
+                "comments": analyzer.most_discussed_section,
+                "value": analyzer.best_value_section,
+                "polarizing": analyzer.polarizing_section,
+                "engagement": analyzer.engagement_section,
+                "rising": analyzer.rising_section,
+            }[intent]
+            return [ContextSection.of(intent, render(self.LIMIT))]
+
+        if intent == "rising":
+            return [
+                ContextSection.of(f"rising:{cat}", analyzer.rising_section(self.LIMIT, cat)) for cat in categories
+            ]
+
+        if intent == "value":
+            # Cheapest well-rated products of the category
+            return [
+                ContextSection.of(f"value:{cat}", analyzer.product_list_section(
+                    f"{cat}: UYGUN FİYATLI İYİ PUANLI ÜRÜNLER",
+                    catalog.query(category=cat, min_rating=3.5, sort="price", limit=self.LIMIT).products,
+                ))
+                for cat in categories
+            ]
+        metric, title = {
+            "comments": ("comments", "EN ÇOK YORUM ALAN ÜRÜNLER"),
+            "polarizing": ("polarization", "TARTIŞMALI ÜRÜNLER"),
+            "engagement": ("engagement", "EN YÜKSEK ETKİLEŞİM ALAN ÜRÜNLER"),
+        }[intent]
+        return [
+            ContextSection.of(
+                f"{intent}:{cat}",
+                analyzer.product_list_section(f"{cat}: {title}", catalog.ranking(metric, self.LIMIT, cat)),
+            )
+            for cat in categories
+        ]
+
+    def _price_sections(
+        self,
+        catalog: ProductCatalog,
+        analyzer: ProductAnalyzer,
+        categories: List[str],
+        intents: List[str],
+        low: Optional[float],
+        high: Optional[float],
+    ) -> List[ContextSection]:
+        sort = {"comments": "comments", "engagement": "engagement", "value": "price"}.get(
+            intents[0] if intents else "", "rating"
+        )
+        bound = " - ".join(f"{v:.0f} TL" for v in (low, high) if v is not None)
+        label = {(True, False): f"{bound} ve üstü", (False, True): f"{bound} ve altı"}.get(
+            (low is not None, high is not None), bound
+        )
+        sections = []
+        for category in categories or [None]:
+            page = catalog.query(CatalogQuery(
+                category=category, min_price=low, max_price=high, sort=sort, limit=self.LIMIT,
+            ))
+            scope = f"{category}, " if category else ""
+            section = analyzer.product_list_section(f"FİYAT FİLTRESİ ({scope}{label})", page.products)
+            if section:
+                section.insert(1, f"Filtreye uyan ürün sayısı: {page.total}")
+                # Where the bounds sit in the price distribution, from the price sketch
+                positions = [
+                    (amount, analyzer.price_position(amount, category)) for amount in (low, high) if amount
+                ]
+                section[2:2] = [
+                    f"{amount:.0f} TL'den pahalı {category or 'katalog'} ürünleri: %{position['cheaper_than']:.0f}"
+                    for amount, position in positions
+                    if position is not None
+                ]
+            sections.append(ContextSection.of(f"price:{category or 'all'}", section))
+        return sections
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
@@ -0,0 +1,130 @@
+"""Conversation Store - per-session chat histories of the web server, bounded in count, time and memory."""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from chatbot.infrastructure.llm.gemini_client import Conversation
+
+
+@dataclass
+class _Session:
+    conversation: Conversation
+    last_used: float
+    # Conversation size when last accounted for in the store's total
+    size: int = 0
+
+
+class ConversationStore:
+    """Conversations by session id, safe to use from many request threads.
+
+    Sessions are kept in least recently used order. A session idle for
+    `ttl_seconds` expires; beyond `max_sessions` or `max_bytes` (the turns
+    of all conversations; the shared context prefix is not counted) the
+    least recently used sessions are evicted (for memory, only those with
+    turns). A single conversation larger than `max_bytes` loses its oldest
+    exchanges instead. `stats` reports the active sessions, their memory
+    and the evictions by cause.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Conversation],
+        max_sessions: int = 1000,
+        ttl_seconds: float = 1800.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._factory = factory
+        self._max_sessions = max(1, max_sessions)
+        self._ttl = ttl_seconds
+        self._max_bytes = max(1, max_bytes)
+        self._clock = clock
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._created = 0
+        self._resets = 0
+        self._evicted = {"ttl": 0, "lru": 0, "memory": 0}
+
+    def get(self, session_id: str) -> Conversation:
+        """The session's conversation, starting a new one for unknown or expired sessions."""
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session(self._factory(), now)
+                self._created += 1
+                while len(self._sessions) > self._max_sessions:
+                    self._evict("lru")
+            else:
+                self._sessions.move_to_end(session_id)
+                session.last_used = now
+            return session.conversation
+
+    def update(self, session_id: str) -> None:
+        """Account for a session's grown conversation after a message, evicting to stay in `max_bytes`."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            self._account(session)
+            # Least recently used first; sessions without turns would free nothing
+            for other in [sid for sid, s in self._sessions.items() if s.size and sid != session_id]:
+                if self._total_bytes <= self._max_bytes:
+                    break
+                self._evict("memory", other)
+            if self._total_bytes > self._max_bytes:
+                session.conversation.trim(self._max_bytes)
+                self._account(session)
+
+    def reset(self, session_id: str) -> bool:
+        """Forget a session's conversation; False if there was none."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._total_bytes -= session.size
+            self._resets += 1
+            return True
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(self._clock())
+            return {
+                "active_sessions": len(self._sessions),
+                "total_bytes": self._total_bytes,
+                "max_sessions": self._max_sessions,
+                "max_bytes": self._max_bytes,
+                "ttl_seconds": self._ttl,
+                "created": self._created,
+                "resets": self._resets,
+                "evicted": dict(self._evicted),
+            }
+
+    # --- Helpers (called with the lock held) ---
+
+    def _expire(self, now: float) -> None:
+        # Sessions are in last-use order, so the idle ones are at the front
+        while self._sessions and now - next(iter(self._sessions.values())).last_used > self._ttl:
+            self._evict("ttl")
+
+    def _evict(self, cause: str, session_id: str | None = None) -> None:
+        if session_id is None:
+            _, session = self._sessions.popitem(last=False)
+        else:
+            session = self._sessions.pop(session_id)
+        self._total_bytes -= session.size
+        self._evicted[cause] += 1
+
+    def _account(self, session: _Session) -> None:
+        size = session.conversation.size
+        self._total_bytes += size - session.size
+        session.size = size
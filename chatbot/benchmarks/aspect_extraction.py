@@ -0,0 +1,69 @@
+"""Aspect extraction benchmark - batch aspect analysis over a million comments.
+
+Usage: python -m chatbot.benchmarks.aspect_extraction [CSV_PATH] [--comments N] [--repeat R]
+
+The catalog's comments are repeated until there are N of them (default one
+million). "Okuma" times reading texts and rates from the comment exports,
+"Çıkarım" the aspect extraction over all N comments, and "İndeks" a full
+`AspectIndex` build over the catalog's own products (reading included).
+Mention counts per aspect follow.
+"""
+
+from __future__ import annotations
+import sys
+import time
+
+import numpy as np
+
+from chatbot.benchmarks.category_scaling import best_of
+from chatbot.domain.aspect_lexicon import ASPECT_KEYS, aspect_label, extract_aspects
+from chatbot.domain.entities.aspect_index import AspectIndex
+from chatbot.infrastructure.data.csv_sources import default_csv_path
+from chatbot.infrastructure.data.repository_factory import create_repository
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    options = {"--comments": "1000000", "--repeat": "3"}
+    for name in options:
+        if name in args:
+            idx = args.index(name)
+            options[name] = args[idx + 1]
+            del args[idx:idx + 2]
+    target = int(options["--comments"])
+    repeat = int(options["--repeat"])
+
+    products = create_repository(args[0] if args else default_csv_path()).load_catalog().products
+    started = time.perf_counter()
+    texts, rates = [], []
+    for p in products:
+        product_texts, product_rates = p.comments.texts_and_rates()
+        texts += product_texts
+        rates += product_rates
+    read = time.perf_counter() - started
+    if not texts:
+        print("Katalogda yorum yok.")
+        sys.exit(1)
+    source = len(texts)
+    copies = -(-target // source)
+    texts, rates = (texts * copies)[:target], (rates * copies)[:target]
+
+    extract = best_of(lambda: extract_aspects(texts, rates), repeat)
+    index = best_of(lambda: AspectIndex(products), repeat)
+    print(
+        f"Ürün: {len(products)}, kaynak yorum: {source}, ölçülen yorum: {len(texts)} (en iyi {repeat} deneme)\n"
+        f"Okuma {read:.2f} s, çıkarım {extract:.2f} s ({len(texts) / extract / 1e6:.2f} milyon yorum/s), "
+        f"indeks {index:.2f} s"
+    )
+
+    _, aspects, sentiment = extract_aspects(texts, rates)
+    for code, key in enumerate(ASPECT_KEYS):
+        mask = aspects == code
+        print(
+            f"  {aspect_label(key)}: {int(mask.sum())} | olumlu {int(np.count_nonzero(sentiment[mask] > 0))} | "
+            f"olumsuz {int(np.count_nonzero(sentiment[mask] < 0))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
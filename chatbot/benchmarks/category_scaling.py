@@ -0,0 +1,165 @@
+"""Category scaling benchmark - per-category analysis cost as the category count grows.
+
+Usage: python -m chatbot.benchmarks.category_scaling [CSV_PATH] [--categories 10,100,1000]
+       [--workers 1,2,4] [--repeat R]
+
+The catalog's products are spread over N synthetic categories (product i
+goes to category i * 7919 mod N, so every category gets a mix of the
+source's products). For each N it reports:
+
+- "Döngü": the category aggregates computed one category at a time, as
+  the analyzer did before the grouped reductions (the reference);
+- "Gruplu": `AggregationEngine.build`, which computes them for all
+  categories at once; both results are compared before timing;
+- "Tam analiz": `AnalysisService.build_insights` on a fresh analyzer;
+- "Paralel": the per-category formatting fanned out over W forked worker
+  processes that share the catalog copy-on-write, for each W of
+  `--workers`; the results are checked against the serial order.
+"""
+
+from __future__ import annotations
+import gc
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from chatbot.application.services.analysis_service import AnalysisService
+from chatbot.domain.entities.product_catalog import PRICE_QUANTILES, ProductCatalog
+from chatbot.domain.services.aggregation_engine import AggregationEngine, CategoryStats
+from chatbot.domain.services.product_analyzer import ProductAnalyzer
+from chatbot.infrastructure.data.csv_sources import default_csv_path
+from chatbot.infrastructure.data.repository_factory import create_repository
+
+# Analyzer the forked workers read; set only while a pool runs
+_SHARED: ProductAnalyzer | None = None
+
+
+def per_category_stats(catalog: ProductCatalog) -> Dict[str, CategoryStats]:
+    """Category aggregates one category at a time: index, mask and reduce per category."""
+    cols = catalog.columns
+    has_rating, has_comments, valid_price = cols.has_rating, cols.has_comments, cols.valid_price
+    products = catalog.products
+    stats = {}
+    for name in cols.category_names:
+        rows = cols.category_rows(name)
+        if not len(rows):
+            continue
+        prices = cols.price[rows[valid_price[rows]]]
+        ratings = cols.rating_score[rows[has_rating[rows]]]
+        stats[name] = CategoryStats(
+            product_count=len(rows),
+            rated_count=len(ratings),
+            commented_count=int(np.count_nonzero(has_comments[rows])),
+            average_rating=sum(ratings.tolist()) / len(ratings) if len(ratings) else 0.0,
+            total_comments=int(cols.comment_count[rows].sum()),
+            total_favorites=int(cols.favorites[rows].sum()),
+            price_range=(
+                (float(prices.min()), float(prices.max()), sum(prices.tolist()) / len(prices))
+                if len(prices) else None
+            ),
+            price_quantiles=(
+                tuple(catalog.price_sketch.quantiles(PRICE_QUANTILES, name)) if len(prices) else None
+            ),
+            top_rated=tuple(
+                products[i]
+                for i in catalog.leaderboards.top("rating", AggregationEngine.CATEGORY_DEPTH, name).tolist()
+            ),
+        )
+    return stats
+
+
+def regrouped(products: list, categories: int) -> ProductCatalog:
+    for i, product in enumerate(products):
+        product.subcategory = f"kategori_{(i * 7919) % categories:05d}"
+    catalog = ProductCatalog()
+    catalog.load(products)
+    return catalog
+
+
+def analyze(analyzer: ProductAnalyzer, category: str) -> dict:
+    # Unmemoized, so every run does the work (and a forked worker never waits on the cache lock)
+    return ProductAnalyzer.category_analysis.__wrapped__(analyzer, category)
+
+
+def _analyze_chunk(categories: List[str]) -> list:
+    return [analyze(_SHARED, cat) for cat in categories]
+
+
+def fan_out(analyzer: ProductAnalyzer, categories: List[str], workers: int) -> list:
+    """Category analyses of `categories` computed in `workers` forked processes, in input order."""
+    global _SHARED
+    analyzer.snapshot  # built once here; the workers inherit it
+    size = -(-len(categories) // workers)
+    chunks = [categories[i:i + size] for i in range(0, len(categories), size)]
+    _SHARED = analyzer
+    try:
+        with ProcessPoolExecutor(len(chunks), mp_context=multiprocessing.get_context("fork")) as pool:
+            return [item for chunk in pool.map(_analyze_chunk, chunks) for item in chunk]
+    finally:
+        _SHARED = None
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    options = {"--categories": "10,100,1000", "--workers": "1,2,4", "--repeat": "3"}
+    for name in options:
+        if name in args:
+            idx = args.index(name)
+            options[name] = args[idx + 1]
+            del args[idx:idx + 2]
+    category_counts = [int(n) for n in options["--categories"].split(",")]
+    worker_counts = [int(n) for n in options["--workers"].split(",")]
+    repeat = int(options["--repeat"])
+    can_fork = "fork" in multiprocessing.get_all_start_methods()
+
+    products = list(create_repository(args[0] if args else default_csv_path()).load_catalog().products)
+    print(f"Ürün: {len(products)}, çekirdek: {os.cpu_count()} (en iyi {repeat} deneme)")
+
+    for count in category_counts:
+        catalog = regrouped(products, count)
+        engine = AggregationEngine(catalog)
+        if per_category_stats(catalog) != dict(engine.build().categories):
+            print("Hata: gruplu ve döngü yolları farklı kategori istatistikleri üretti.")
+            sys.exit(1)
+
+        loop = best_of(lambda: per_category_stats(catalog), repeat)
+        grouped = best_of(engine.build, repeat)
+        full = best_of(lambda: AnalysisService.build_insights(ProductAnalyzer(catalog), catalog), repeat)
+        print(
+            f"{count} kategori: döngü {loop * 1000:.1f} ms, gruplu {grouped * 1000:.1f} ms "
+            f"({loop / grouped:.1f}x), tam analiz {full * 1000:.1f} ms"
+        )
+        if not can_fork:
+            continue
+
+        categories = catalog.categories
+        analyzer = ProductAnalyzer(catalog)
+        serial_results = [analyzer.category_analysis(cat) for cat in categories]
+        serial = best_of(lambda: [analyze(analyzer, cat) for cat in categories], repeat)
+        timings = [f"seri {serial * 1000:.1f} ms"]
+        for workers in worker_counts:
+            if fan_out(analyzer, categories, workers) != serial_results:
+                print("Hata: paralel sonuçlar seri sıra ile eşleşmedi.")
+                sys.exit(1)
+            elapsed = best_of(lambda: fan_out(analyzer, categories, workers), repeat)
+            timings.append(f"{workers} işçi {elapsed * 1000:.1f} ms ({serial / elapsed:.2f}x)")
+        print(f"  Paralel kategori analizi: {', '.join(timings)}")
+
+
+if __name__ == "__main__":
+    main()
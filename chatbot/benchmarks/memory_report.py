@@ -0,0 +1,170 @@
+"""Memory report - bytes per product of the catalog representation, before and after compaction.
+
+Usage: python -m chatbot.benchmarks.memory_report [CSV_PATH] [--sample N]
+
+"Before" rebuilds the sampled products with the original layout: plain frozen
+dataclasses with a per-instance `__dict__`, fully decoded comment lists and
+no string interning. "After" measures the products exactly as the repository
+loads them today, with comments still encoded and once more fully decoded.
+"""
+
+from __future__ import annotations
+import sys
+from dataclasses import dataclass, field, fields
+from typing import List, Optional
+
+from chatbot.domain.entities.product import Product
+from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+from chatbot.infrastructure.data.csv_sources import default_csv_path
+
+
+@dataclass(frozen=True)
+class _PlainComment:
+    user_name: str
+    rate: int
+    text: str
+    date: str
+    is_trusted: bool
+    likes: int
+
+
+@dataclass(frozen=True)
+class _PlainPrice:
+    raw: str
+    amount: float
+
+
+@dataclass(frozen=True)
+class _PlainRating:
+    score: float
+    count: int
+    average: float
+
+
+@dataclass(frozen=True)
+class _PlainStarDistribution:
+    star_0: int
+    star_1: int
+    star_2: int
+    star_3: int
+    star_4: int
+    star_5: int
+
+
+@dataclass
+class _PlainProduct:
+    product_id: str
+    name: str
+    url: str
+    subcategory: str
+    description: str
+    price: _PlainPrice
+    rating: _PlainRating
+    star_distribution: _PlainStarDistribution
+    comments: List[_PlainComment] = field(default_factory=list)
+    social_proofs: List[str] = field(default_factory=list)
+    color: Optional[str] = None
+    origin: Optional[str] = None
+    total_comment_count: int = 0
+    total_questions: int = 0
+    favorite_count: int = 0
+
+
+def deep_sizeof(obj, seen: set | None = None) -> int:
+    """Recursive `sys.getsizeof` that counts each shared object (e.g. interned strings) once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+
+def to_plain(product: Product) -> _PlainProduct:
+    """Rebuild a product in the original, uncompacted layout."""
+    comments = [
+        _PlainComment(
+            user_name=_copy(c.user_name),
+            rate=c.rate,
+            text=c.text,
+            date=_copy(c.date),
+            is_trusted=c.is_trusted,
+            likes=c.likes,
+        )
+        for c in product.comments
+    ]
+    values = {f.name: getattr(product, f.name) for f in fields(product)}
+    values.update(
+        price=_PlainPrice(raw=_copy(product.price.raw), amount=product.price.amount),
+        rating=_PlainRating(*(getattr(product.rating, f.name) for f in fields(product.rating))),
+        star_distribution=_PlainStarDistribution(
+            *(getattr(product.star_distribution, f.name) for f in fields(product.star_distribution))
+        ),
+        comments=comments,
+        subcategory=_copy(product.subcategory),
+        color=_copy(product.color),
+        origin=_copy(product.origin),
+    )
+    return _PlainProduct(**values)
+
+
+def _copy(value):
+    # Fresh string object, as produced by the CSV reader before interning
+    return "".join(list(value)) if isinstance(value, str) and len(value) > 1 else value
+
+
+def memory_report(products: List[Product]) -> dict:
+    """Bytes per product for the original layout and the current one (encoded and decoded)."""
+    n = max(len(products), 1)
+    after_encoded = deep_sizeof(products)
+    # Converting decodes every product's comments, so measure the encoded form first
+    before = deep_sizeof([to_plain(p) for p in products])
+    after_decoded = deep_sizeof(products)
+    return {
+        "products": len(products),
+        "before_bytes_per_product": before / n,
+        "after_encoded_bytes_per_product": after_encoded / n,
+        "after_decoded_bytes_per_product": after_decoded / n,
+    }
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    sample = 5000
+    if "--sample" in args:
+        idx = args.index("--sample")
+        sample = int(args[idx + 1])
+        del args[idx:idx + 2]
+    csv_path = args[0] if args else default_csv_path()
+
+    catalog = CsvProductRepository(csv_path, use_snapshot=False).load_catalog()
+    report = memory_report(catalog.products[:sample])
+
+    before = report["before_bytes_per_product"]
+    print(f"Ürün örneği: {report['products']}")
+    print(f"Önce (dict tabanlı, tüm yorumlar çözülmüş): {before:,.0f} bayt/ürün")
+    for key, label in (
+        ("after_encoded_bytes_per_product", "Sonra (slot'lu, yorumlar kodlu)"),
+        ("after_decoded_bytes_per_product", "Sonra (slot'lu, yorumlar çözülmüş)"),
+    ):
+        value = report[key]
+        print(f"{label}: {value:,.0f} bayt/ürün ({value / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
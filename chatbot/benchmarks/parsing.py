@@ -0,0 +1,130 @@
+"""Parsing benchmark - column-at-a-time field parsing against the row-at-a-time path.
+
+Usage: python -m chatbot.benchmarks.parsing [CSV_PATH] [--rows N] [--repeat R]
+
+Both paths map the same CSV rows; the products they build are compared
+before timing. "Alanlar" times only the numeric field stage (prices,
+ratings, star counts, totals, favorite counts), "Satır eşleme" the whole
+row-to-product mapping including comments and the favorite count that
+`ProductCatalog.load` fills in.
+"""
+
+from __future__ import annotations
+import csv
+import gc
+import sys
+import time
+from itertools import islice
+from typing import Callable, List
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.value_objects.price import Price
+from chatbot.domain.value_objects.rating import Rating
+from chatbot.domain.value_objects.star_distribution import StarDistribution
+from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+from chatbot.infrastructure.data.csv_sources import default_csv_path, resolve_csv_sources
+
+Repo = CsvProductRepository
+
+
+def per_row_fields(rows: List[dict]) -> list:
+    """The numeric field stage as the row-at-a-time path runs it."""
+    fields = []
+    for row in rows:
+        social_proofs = [
+            row.get(f"social_proof_{i}", "").strip()
+            for i in range(1, 5)
+            if row.get(f"social_proof_{i}", "").strip()
+        ]
+        favorites = next(
+            (c for c in map(Product.favorite_count_from, social_proofs) if c is not None), 0
+        )
+        fields.append((
+            Price.from_turkish_format(row.get("price", "")),
+            Rating.create(
+                score=Repo._safe_float(row.get("rating_score", row.get("rating", ""))),
+                count=Repo._safe_int(row.get("total_rating_count", row.get("rating_count", ""))),
+                average=Repo._safe_float(row.get("average_rating", "")),
+            ),
+            StarDistribution.create(*(Repo._safe_int(row.get(f"star_{i}_count", "")) for i in range(6))),
+            Repo._safe_int(row.get("total_comment_count", "")),
+            Repo._safe_int(row.get("total_questions", "")),
+            favorites,
+        ))
+    return fields
+
+
+def per_row_products(rows: List[dict]) -> List[Product]:
+    products = []
+    for row in rows:
+        product = Repo._map_row_to_product(row)
+        if product:
+            ProductCatalog._prepare(product)
+            products.append(product)
+    return products
+
+
+def bulk_products(rows: List[dict]) -> List[Product]:
+    products = []
+    for i in range(0, len(rows), Repo.CHUNK_ROWS):
+        products.extend(Repo._map_rows(rows[i:i + Repo.CHUNK_ROWS])[0])
+    for product in products:
+        ProductCatalog._prepare(product)
+    return products
+
+
+def bulk_fields(rows: List[dict]) -> list:
+    fields = []
+    for i in range(0, len(rows), Repo.CHUNK_ROWS):
+        fields.extend(Repo._parse_columns(rows[i:i + Repo.CHUNK_ROWS]))
+    return fields
+
+
+def best_of(fn: Callable, rows: List[dict], repeat: int) -> float:
+    # Like timeit: collect up front and keep the cyclic GC out of the timed runs
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn(rows)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return best
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    options = {"--rows": 20000, "--repeat": 5}
+    for name in options:
+        if name in args:
+            idx = args.index(name)
+            options[name] = int(args[idx + 1])
+            del args[idx:idx + 2]
+    source = args[0] if args else default_csv_path()
+
+    with open(resolve_csv_sources(source)[0], encoding="utf-8") as f:
+        rows = list(islice(csv.DictReader(f), options["--rows"]))
+
+    if per_row_fields(rows) != bulk_fields(rows) or per_row_products(rows) != bulk_products(rows):
+        print("Hata: sütun ve satır yolları farklı ürünler üretti.")
+        sys.exit(1)
+
+    print(f"Satır: {len(rows)} (en iyi {options['--repeat']} deneme)")
+    for label, per_row, bulk in (
+        ("Alanlar", per_row_fields, bulk_fields),
+        ("Satır eşleme", per_row_products, bulk_products),
+    ):
+        slow = best_of(per_row, rows, options["--repeat"])
+        fast = best_of(bulk, rows, options["--repeat"])
+        print(
+            f"{label}: satır bazlı {slow * 1000:.1f} ms, sütun bazlı {fast * 1000:.1f} ms "
+            f"({slow / fast:.1f}x, {len(rows) / fast:,.0f} satır/sn)"
+        )
+
+
+if __name__ == "__main__":
+    main()
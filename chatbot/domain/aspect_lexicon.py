@@ -0,0 +1,230 @@
+"""Aspect lexicon - Turkish product aspects and sentiment cues, and their batch extraction."""
+
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.text_normalizer import fold
+
+# Aspect key -> (label, folded terms). A term matches itself followed by Turkish inflections
+# ("kutu" -> "kutusunda", "kapak" -> "kapagi", see `_SUFFIXES`), but not longer words
+# ("kutuphane"); a term ending in "-" is a stem and matches every word starting with it
+# ("kurut-" -> "kurutuyor"). In two-word terms the first word must match exactly
+# ("yagli cilt", "tavsiye etmem").
+ASPECTS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "kalicilik": ("Kalıcılık", (
+        "kalici", "dayanikli", "dayaniyor", "dayanmiyor", "gun boyu", "butun gun", "uzun sure",
+        "silin-", "bulas-", "akmiyor", "akiyor", "soldu", "soluyor", "ucuyor", "uctu",
+    )),
+    "pigment": ("Pigment / renk yoğunluğu", (
+        "pigment", "renk vermiyor", "renk veriyor", "yogun renk", "soluk", "tek kat",
+    )),
+    "renk": ("Renk / ton", (
+        "renk", "rengi", "ton", "fotograftaki", "gorseldeki", "resimdeki",
+    )),
+    "koku": ("Koku", ("koku", "kokm-", "kokuy-", "esans")),
+    "fiyat": ("Fiyat / performans", (
+        "fiyat", "ucuz", "pahali", "performans", "indirim", "parasina", "paraya", "param",
+    )),
+    "cilt": ("Cilt tipi / cilde etkisi", (
+        "yagli cilt", "kuru cilt", "karma cilt", "hassas cilt", "cilt tipi", "cilt", "cildi",
+        "kurut-", "sivilce", "alerj-", "tahris", "kasinti", "kasindir-", "yakti", "nemlendir-",
+    )),
+    "doku": ("Doku / kıvam", (
+        "doku", "kivam", "kremsi", "yapiskan", "akiskan", "topak-", "pullan-", "hafif",
+    )),
+    "kapaticilik": ("Kapatıcılık", ("kapatici", "kapatiyor", "kapatmiyor", "gozenek", "morluk", "leke")),
+    "uygulama": ("Uygulama / kullanım", (
+        "uygulama", "surmesi", "surulu", "surumu", "firca", "aplikator", "kullanimi", "dagil-",
+    )),
+    "ambalaj": ("Ambalaj / kargo", (
+        "ambalaj", "paket-", "kutu", "kargo", "kapak", "sise", "orijinal", "sahte",
+    )),
+}
+ASPECT_KEYS: Tuple[str, ...] = tuple(ASPECTS)
+
+POSITIVE_CUES = (
+    "iyi", "harika", "guzel", "mukemmel", "super", "begendim", "bayil-", "tavsiye ederim", "tavsiye",
+    "memnun", "basarili", "kaliteli", "efsane", "muhtesem", "sahane", "hizli", "uygun", "kalici",
+    "dayanikli", "ideal", "tam kararinda",
+)
+NEGATIVE_CUES = (
+    "kotu", "berbat", "rezalet", "begenmedim", "begenmedi", "tavsiye etmem", "tavsiye etmiyorum",
+    "pisman", "iade", "sahte", "kurut-", "yakti", "tahris", "kasinti", "sivilce", "alerj-", "agir",
+    "bulasti", "silindi", "soldu", "dayanmiyor", "kalmiyor", "vermiyor", "kapatmiyor",
+    "yapiskan", "topak-", "pullan-", "soluk", "gec geldi", "kirik", "eksik", "pahali",
+)
+# Words that flip the clause's verdict: "uygun değil", "kalıcılığı yok"
+NEGATORS = ("degil", "yok")
+# Clause boundaries inside a comment; cues only speak for aspects in their own clause
+BOUNDARY_WORDS = frozenset({"ama", "fakat", "ancak", "ragmen", "ve"})
+# Ends every comment in the joined text, as a chunk of its own
+COMMENT_SEPARATOR = "\x00"
+_JOINER = f" {COMMENT_SEPARATOR} "
+_TOKEN = re.compile(r"[^\W_]+|[.,;:!?\x00]")
+# What may follow a (non-stem) term, folded: derivation ("-li", "-lik", "-siz", "-ci"),
+# plural, possessive, case, then copula / "-ki"; "[iu]" and "[ae]" cover the vowel harmony
+_SUFFIXES = re.compile(
+    r"(?:l[iu][kg]?|s[iu]z|c[iu][kg]?)?"
+    r"(?:l[ae]r)?"
+    r"(?:[iu]?m|[iu]?n|s?[iu]|[iu]?m[iu]z|[iu]?n[iu]z|l[ae]r[iu])?"
+    r"(?:y?[iu]|y?[ae]|n?[dt][ae]n?|n?[iu]n|y?l[ae]|n[iu]n|n[ae]|n?c[ae])?"
+    r"(?:k[iu]|[dt][iu]r|y?[dt][iu]|y?m[iu]s|y?ken|y?s[ae])?"
+)
+
+# Token kinds; terms carry an aspect (-1 for a pure cue) and a polarity
+_NONE, _SEPARATOR, _CLAUSE, _NEGATOR, _TERM = 0, 1, 2, 3, 4
+
+
+class _Lexicon:
+    """Terms as lookup tables: single words by prefix, two-word terms by exact head word.
+
+    Term `t` has token class `_TERM + t`; `kind`, `aspect` and `polarity`
+    are indexed by token class. `single` and the pair tails map a term's
+    text to (token class, whether it is a stem).
+    """
+
+    def __init__(self) -> None:
+        aspect_of: Dict[str, int] = {}
+        for code, (_, terms) in enumerate(ASPECTS.values()):
+            for term in terms:
+                aspect_of.setdefault(term, code)
+        polarity_of = {term: 1 for term in POSITIVE_CUES}
+        polarity_of.update((term, -1) for term in NEGATIVE_CUES)
+        terms = sorted(set(aspect_of) | set(polarity_of))
+
+        self.single: Dict[str, Tuple[int, bool]] = {}
+        self.pairs: Dict[str, List[Tuple[str, int, bool]]] = {}
+        for t, term in enumerate(terms):
+            stem = term.endswith("-")
+            words = term.rstrip("-").split()
+            if len(words) == 1:
+                self.single[words[0]] = (_TERM + t, stem)
+                if words[0].endswith("k") and not stem:
+                    # Softened before a vowel: "kapak" -> "kapagi", "eksik" -> "eksigi"
+                    self.single.setdefault(words[0][:-1] + "g", (_TERM + t, stem))
+            else:
+                self.pairs.setdefault(words[0], []).append((words[1], _TERM + t, stem))
+        for tails in self.pairs.values():
+            tails.sort(key=lambda tail: -len(tail[0]))
+        self.longest = max(map(len, self.single))
+        self.kind = np.array([_NONE, _SEPARATOR, _CLAUSE, _NEGATOR] + [_TERM] * len(terms), dtype=np.int8)
+        self.aspect = np.array([-1] * _TERM + [aspect_of.get(t, -1) for t in terms], dtype=np.int8)
+        self.polarity = np.array([0] * _TERM + [polarity_of.get(t, 0) for t in terms], dtype=np.int8)
+
+    def classify(self, word: str) -> int:
+        """Token class of one folded word: punctuation, negator, the longest term it inflects, or none."""
+        if word == COMMENT_SEPARATOR:
+            return _SEPARATOR
+        if not word.isalnum() or word in BOUNDARY_WORDS:
+            return _CLAUSE
+        if word.startswith(NEGATORS[0]) or word == NEGATORS[1]:
+            return _NEGATOR
+        single = self.single
+        for end in range(min(len(word), self.longest), 2, -1):
+            entry = single.get(word[:end])
+            if entry is not None and _inflects(word, end, entry[1]):
+                return entry[0]
+        return _NONE
+
+    def pair(self, head: str, tail: str) -> int:
+        for prefix, token, stem in self.pairs[head]:
+            if tail.startswith(prefix) and _inflects(tail, len(prefix), stem):
+                return token
+        return _NONE
+
+
+def _inflects(word: str, end: int, stem: bool) -> bool:
+    # Whether `word` is the term `word[:end]` plus what the term allows after it
+    return stem or end == len(word) or _SUFFIXES.fullmatch(word, end) is not None
+
+
+_LEXICON = _Lexicon()
+
+
+def extract_aspects(texts: Sequence[str], rates: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aspect mentions of comment `texts`: (comment index, aspect code, sentiment) arrays.
+
+    One entry per comment and aspect it mentions. Sentiment is +1, -1 or 0:
+    the sign of the cues in the clauses that mention the aspect, a negator
+    in a clause flipping it ("uygun değil"); without cues, the comment's
+    star rating decides (4-5 positive, 1-2 negative, 3 neutral).
+
+    All comments are split as one string; each distinct chunk is tokenized
+    and each distinct word folded and classified once, so the per-token work
+    is dictionary lookups and array operations.
+    """
+    lexicon = _LEXICON
+    if not len(texts):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.astype(np.int8), empty.astype(np.int8)
+    joined = _JOINER.join(texts)
+    if joined.count(COMMENT_SEPARATOR) != len(texts) - 1:
+        # A comment containing the separator would shift every later comment
+        joined = _JOINER.join(text.replace(COMMENT_SEPARATOR, " ") for text in texts)
+    # Whitespace chunks ("kurutdu,") are split into words and punctuation once per distinct chunk
+    chunks = joined.split()
+    chunks.append(COMMENT_SEPARATOR)
+    chunk_ids = {chunk: i for i, chunk in enumerate(dict.fromkeys(chunks))}
+    words: Dict[str, int] = {}
+    layout = [[words.setdefault(fold(w), len(words)) for w in _TOKEN.findall(chunk)] for chunk in chunk_ids]
+    lengths = np.fromiter(map(len, layout), dtype=np.int64, count=len(layout))
+    flat = np.fromiter((w for chunk in layout for w in chunk), dtype=np.int64, count=int(lengths.sum()))
+    starts = np.cumsum(lengths) - lengths
+
+    per_chunk = np.fromiter(map(chunk_ids.__getitem__, chunks), dtype=np.int64, count=len(chunks))
+    counts = lengths[per_chunk]
+    # Position k of the token stream is word (k - first position of its chunk) of that chunk
+    offset = np.repeat(starts[per_chunk] - (np.cumsum(counts) - counts), counts)
+    ids = flat[offset + np.arange(len(offset))]
+
+    vocabulary = list(words)
+    classes = np.fromiter(map(lexicon.classify, vocabulary), dtype=np.int16, count=len(vocabulary))[ids]
+    # Two-word terms ("yağlı cilt", "tavsiye etmem") replace their head and consume the tail
+    heads = np.fromiter((w in lexicon.pairs for w in vocabulary), dtype=bool, count=len(vocabulary))
+    at = np.flatnonzero(heads[ids[:-1]])
+    size = len(vocabulary)
+    bigrams, where = np.unique(ids[at] * size + ids[at + 1], return_inverse=True)
+    found = np.array(
+        [lexicon.pair(vocabulary[b // size], vocabulary[b % size]) for b in bigrams.tolist()], dtype=np.int16
+    )[where]
+    hit = found != _NONE
+    classes[at[hit]] = found[hit]
+    classes[at[hit] + 1] = _NONE
+
+    kinds = lexicon.kind[classes]
+    # Comment and clause of every token: separators and boundaries close them
+    is_separator = kinds == _SEPARATOR
+    comment = np.cumsum(is_separator) - is_separator
+    is_break = is_separator | (kinds == _CLAUSE)
+    clause = np.cumsum(is_break) - is_break
+    n_clauses = int(clause[-1]) + 1
+
+    score = np.bincount(clause, weights=lexicon.polarity[classes], minlength=n_clauses)
+    negated = np.bincount(clause, weights=kinds == _NEGATOR, minlength=n_clauses) > 0
+    # A negator flips the clause ("kötü değil") and makes a cue-less one negative ("kalıcı değil")
+    verdict = np.sign(score)
+    verdict[negated] = np.where(verdict[negated] != 0, -verdict[negated], -1)
+
+    aspect = lexicon.aspect[classes]
+    mentions = np.flatnonzero(aspect >= 0)
+    keys = comment[mentions] * len(ASPECT_KEYS) + aspect[mentions]
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    pair_verdict = np.sign(np.bincount(inverse, weights=verdict[clause[mentions]], minlength=len(pairs)))
+
+    comments = pairs // len(ASPECT_KEYS)
+    star = np.sign(np.asarray(rates, dtype=np.int64)[comments] - 3)
+    sentiment = np.where(pair_verdict != 0, pair_verdict, star).astype(np.int8)
+    return comments, (pairs % len(ASPECT_KEYS)).astype(np.int8), sentiment
+
+
+def match_aspect(word: str) -> Optional[str]:
+    """Aspect a folded word refers to ("kaliciligi" -> "kalicilik"), or None."""
+    code = int(_LEXICON.aspect[_LEXICON.classify(word)])
+    return ASPECT_KEYS[code] if code >= 0 else None
+
+
+def aspect_label(key: str) -> str:
+    return ASPECTS[key][0]
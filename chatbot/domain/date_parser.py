@@ -0,0 +1,63 @@
+"""Date parser - comment date strings of the export as day numbers."""
+
+from __future__ import annotations
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+
+from chatbot.domain.text_normalizer import fold
+
+# Day number of comments whose date could not be read
+NO_DATE = -1
+_EPOCH = date(1970, 1, 1)
+# Folded month names by their first three letters, which are unique ("eyl" -> 9)
+_MONTHS = {
+    name[:3]: number
+    for number, name in enumerate(
+        ("ocak", "subat", "mart", "nisan", "mayis", "haziran", "temmuz", "agustos", "eylul", "ekim", "kasim", "aralik"),
+        start=1,
+    )
+}
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_DOTTED = re.compile(r"(\d{1,2})[./-](\d{1,2})[./-](\d{4})")
+_NAMED = re.compile(r"(\d{1,2})\s+([a-z]+)\s+(\d{4})")
+
+
+@lru_cache(maxsize=8192)
+def parse_day(text: str) -> int:
+    """Days since 1970-01-01 of a comment date, or NO_DATE.
+
+    Reads "18 Eylül 2024" (month names or their first three letters),
+    "2024-09-18", "18.09.2024" / "18/09/2024" (anything after the date,
+    such as a time, is ignored) and Unix timestamps in seconds or
+    milliseconds. Dates repeat heavily across comments, so results are cached.
+    """
+    text = text.strip()
+    if text.isdigit() and len(text) in (10, 13):
+        return int(text[:10]) // 86400
+    match = _ISO.match(text)
+    if match:
+        year, month, day = match.groups()
+    else:
+        match = _DOTTED.match(text)
+        if match:
+            day, month, year = match.groups()
+        else:
+            match = _NAMED.match(fold(text))
+            if match is None or match.group(2)[:3] not in _MONTHS:
+                return NO_DATE
+            day, month, year = match.group(1), _MONTHS[match.group(2)[:3]], match.group(3)
+    try:
+        days = (date(int(year), int(month), int(day)) - _EPOCH).days
+    except ValueError:
+        return NO_DATE
+    return days if days >= 0 else NO_DATE
+
+
+def parse_date_value(value) -> int:
+    """`parse_day` for a raw JSON value; numbers are read as timestamps."""
+    return parse_day(value if isinstance(value, str) else str(value))
+
+
+def day_to_date(day: int) -> date:
+    return _EPOCH + timedelta(days=int(day))
@@ -1,4 +1,5 @@
 from .product import Product
-from .product_catalog import ProductCatalog
+from .product_catalog import CatalogDelta, ProductCatalog
+from .catalog_query import CatalogQuery, QueryPage
 
-__all__ = ["Product", "ProductCatalog"]
+__all__ = ["Product", "CatalogDelta", "ProductCatalog", "CatalogQuery", "QueryPage"]
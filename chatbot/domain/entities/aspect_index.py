@@ -0,0 +1,112 @@
+"""AspectIndex - per-product counts of the aspects its comments talk about, by sentiment."""
+
+from __future__ import annotations
+from typing import List, Sequence
+
+import numpy as np
+
+from chatbot.domain.aspect_lexicon import ASPECT_KEYS, extract_aspects
+from chatbot.domain.entities.product import Product
+
+# Sentiment (-1, 0, +1) + 1 -> slot in the counts' last axis
+_SLOT = np.array([1, 2, 0], dtype=np.int64)
+
+
+class AspectIndex:
+    """Aspect mentions in the catalog's comments, where row `i` is `products[i]`.
+
+    `counts[row, aspect]` holds the (positive, negative, neutral) mentions of
+    an aspect of `ASPECT_KEYS` in that product's comments, a comment counting
+    once per aspect it mentions. Built in one batch over every comment; on a
+    catalog change only the changed products' comments are read again.
+    """
+
+    ASPECTS = ASPECT_KEYS
+    POSITIVE, NEGATIVE, NEUTRAL = 0, 1, 2
+    # Mentions a product needs before its aspect sentiment is ranked
+    MIN_MENTIONS = 3
+    ORDERS = ("best", "worst", "most")
+
+    def __init__(self, products: Sequence[Product]) -> None:
+        self.counts = self._extract(products)
+
+    @property
+    def size(self) -> int:
+        return len(self.counts)
+
+    def apply(
+        self,
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows."""
+        counts = self.counts
+        if len(updated):
+            counts[np.asarray(updated_rows, dtype=np.intp)] = self._extract(updated)
+        if len(appended):
+            counts = np.concatenate([counts, self._extract(appended)])
+        if len(deleted_rows):
+            keep = np.ones(len(counts), dtype=bool)
+            keep[np.asarray(deleted_rows, dtype=np.intp)] = False
+            counts = counts[keep]
+        self.counts = counts
+
+    def code(self, aspect: str) -> int:
+        if aspect not in self.ASPECTS:
+            raise ValueError(f"Bilinmeyen ürün özelliği: {aspect}")
+        return self.ASPECTS.index(aspect)
+
+    def mentions(self, aspect: str) -> np.ndarray:
+        return self.counts[:, self.code(aspect)].sum(axis=1)
+
+    def net_sentiment(self, aspect: str) -> np.ndarray:
+        """(positive - negative) / mentions per row, in [-1, 1]; 0 for rows without mentions."""
+        counts = self.counts[:, self.code(aspect)]
+        mentions = counts.sum(axis=1)
+        return (counts[:, self.POSITIVE] - counts[:, self.NEGATIVE]) / np.maximum(mentions, 1)
+
+    def totals(self, rows: np.ndarray | None = None) -> np.ndarray:
+        """(aspect, sentiment) mention counts summed over `rows` (default: every product)."""
+        counts = self.counts if rows is None else self.counts[rows]
+        return counts.sum(axis=0, dtype=np.int64)
+
+    def top(
+        self, aspect: str, limit: int | None = None, rows: np.ndarray | None = None, order: str = "best"
+    ) -> np.ndarray:
+        """Rows (of `rows`, or all) ranked on one aspect.
+
+        "best" and "worst" rank by net sentiment among rows with at least
+        `MIN_MENTIONS` mentions, "most" by mention count among rows with any;
+        ties go to the more mentioned row, then to catalog order.
+        """
+        if order not in self.ORDERS:
+            raise ValueError(f"Bilinmeyen sıralama yönü: {order}")
+        mentions = self.mentions(aspect)
+        if rows is None:
+            rows = np.arange(self.size)
+        rows = rows[mentions[rows] >= (1 if order == "most" else self.MIN_MENTIONS)]
+        if order == "most":
+            ranked = rows[np.lexsort((rows, -mentions[rows]))]
+        else:
+            score = self.net_sentiment(aspect)[rows]
+            ranked = rows[np.lexsort((rows, -mentions[rows], -score if order == "best" else score))]
+        return ranked if limit is None else ranked[:limit]
+
+    @classmethod
+    def _extract(cls, products: Sequence[Product]) -> np.ndarray:
+        texts: List[str] = []
+        rates: List[int] = []
+        lengths = np.zeros(len(products), dtype=np.int64)
+        for row, p in enumerate(products):
+            if p.comments:
+                product_texts, product_rates = p.comments.texts_and_rates()
+                texts += product_texts
+                rates += product_rates
+                lengths[row] = len(product_texts)
+        owner = np.repeat(np.arange(len(products)), lengths)
+        comment, aspect, sentiment = extract_aspects(texts, rates)
+        cell = (owner[comment] * len(cls.ASPECTS) + aspect) * 3 + _SLOT[sentiment + 1]
+        size = len(products) * len(cls.ASPECTS) * 3
+        return np.bincount(cell, minlength=size).astype(np.int32).reshape(len(products), len(cls.ASPECTS), 3)
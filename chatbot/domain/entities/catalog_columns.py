@@ -0,0 +1,260 @@
+"""CatalogColumns - columnar NumPy side-store that mirrors the numeric fields of a ProductCatalog."""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.product import Product
+
+
+class CatalogColumns:
+    """Contiguous arrays over the catalog's products, where row `i` is `products[i]`.
+
+    Built once in `ProductCatalog.load` so rankings and aggregates can run as
+    vectorized operations instead of walking Product objects. Values mirror the
+    product properties at build time (e.g. `engagement_score` keeps its Python
+    rounding), which keeps query results identical to the object-based code.
+    """
+
+    # Column name -> (dtype, trailing shape)
+    _SCHEMA = {
+        "price": (np.float64, ()),
+        "rating_score": (np.float64, ()),
+        "rating_count": (np.int64, ()),
+        "stars": (np.int64, (6,)),
+        "comment_count": (np.int64, ()),
+        "loaded_comments": (np.int64, ()),
+        "sentiment": (np.int64, (3,)),
+        "favorites": (np.int64, ()),
+        "engagement": (np.float64, ()),
+        "category": (np.int32, ()),
+    }
+
+    # Rating keys: the raw score and the two confidence-aware scores of the star distribution
+    RATING_KEYS = ("rating", "bayesian", "wilson")
+    # Bayesian average: the star mean is shrunk toward the category's by this many ratings
+    PRIOR_WEIGHT = 20
+    # Wilson lower bound at 95% confidence
+    WILSON_Z = 1.96
+
+    def __init__(self, products: List[Product], categories: List[str]) -> None:
+        self.category_names = list(categories)
+        for name, values in self._extract(products, self._codes()).items():
+            setattr(self, name, values)
+        self.size = len(products)
+        self._index_categories()
+        self._score_ratings()
+
+    def apply(
+        self,
+        categories: List[str],
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows.
+
+        Only the changed products are read back from Python objects; the rest
+        is vectorized array work over the whole catalog: column copies, the
+        category grouping (an argsort) and the rating scores are redone on
+        every change, which stays far below a rebuild from the products.
+        """
+        if list(categories) != self.category_names:
+            self._recode(list(categories))
+        codes = self._codes()
+
+        columns = {name: getattr(self, name) for name in self._SCHEMA}
+        if len(updated):
+            rows = np.asarray(updated_rows, dtype=np.intp)
+            for name, values in self._extract(updated, codes).items():
+                columns[name][rows] = values
+        if len(appended):
+            for name, values in self._extract(appended, codes).items():
+                columns[name] = np.concatenate([columns[name], values])
+        if len(deleted_rows):
+            keep = np.ones(len(columns["category"]), dtype=bool)
+            keep[np.asarray(deleted_rows, dtype=np.intp)] = False
+            columns = {name: values[keep] for name, values in columns.items()}
+
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self.size = len(columns["category"])
+        self._index_categories()
+        self._score_ratings()
+
+    def _codes(self) -> Dict[str, int]:
+        return {cat: i for i, cat in enumerate(self.category_names)}
+
+    @classmethod
+    def _extract(cls, products: Sequence[Product], codes: Dict[str, int]) -> Dict[str, np.ndarray]:
+        n = len(products)
+        columns = {name: np.empty((n, *shape), dtype=dtype) for name, (dtype, shape) in cls._SCHEMA.items()}
+        price = columns["price"]
+        score = columns["rating_score"]
+        rating_count = columns["rating_count"]
+        stars = columns["stars"]
+        comment_count = columns["comment_count"]
+        loaded_comments = columns["loaded_comments"]
+        sentiment = columns["sentiment"]
+        favorites = columns["favorites"]
+        engagement = columns["engagement"]
+        category = columns["category"]
+
+        for i, p in enumerate(products):
+            sd = p.star_distribution
+            comments = p.comments
+            price[i] = p.price.amount
+            score[i] = p.rating.score
+            rating_count[i] = p.rating.count
+            stars[i] = (sd.star_0, sd.star_1, sd.star_2, sd.star_3, sd.star_4, sd.star_5)
+            comment_count[i] = p.comment_count
+            loaded_comments[i] = len(comments)
+            sentiment[i] = (comments.positive_count, comments.negative_count, comments.neutral_count)
+            favorites[i] = p.favorite_count
+            engagement[i] = p.engagement_score
+            category[i] = codes.get(p.subcategory, -1) if p.subcategory else -1
+        return columns
+
+    def _recode(self, categories: List[str]) -> None:
+        # Map old category codes onto the new sorted category list; the extra
+        # trailing slot maps "no category" (-1) onto itself
+        new_codes = {cat: i for i, cat in enumerate(categories)}
+        remap = np.array([new_codes.get(cat, -1) for cat in self.category_names] + [-1], dtype=np.int32)
+        self.category = remap[self.category]
+        self.category_names = categories
+
+    def _index_categories(self) -> None:
+        # Per-category row indexes (ascending, i.e. catalog order)
+        order = np.argsort(self.category, kind="stable")
+        sorted_codes = self.category[order]
+        bounds = np.searchsorted(sorted_codes, np.arange(len(self.category_names) + 1))
+        self._category_order, self._category_bounds = order, bounds
+        self._category_rows: Dict[str, np.ndarray] = {
+            cat: order[bounds[code]:bounds[code + 1]] for code, cat in enumerate(self.category_names)
+        }
+
+    def _score_ratings(self) -> None:
+        """Bayesian average and Wilson lower bound of every row's star distribution, in one pass.
+
+        A k-star rating counts k (0-5). The Bayesian average adds
+        `PRIOR_WEIGHT` ratings at the category's mean star (the catalog's for
+        rows without a category), so few ratings stay near the category and
+        many ratings speak for themselves. The Wilson score is the lower
+        bound of the 4-5 star share. Rows without star data score the prior
+        and 0; rankings leave them out (`has_stars`). The priors depend on
+        the whole category, so both are recomputed on every change.
+        """
+        stars = self.stars
+        total = stars.sum(axis=1)
+        star_sum = stars @ np.arange(6)
+        bins = self.category.astype(np.intp) + 1  # bin 0: rows without a category
+        n_bins = len(self.category_names) + 1
+        bin_total = np.bincount(bins, weights=total, minlength=n_bins)
+        bin_sum = np.bincount(bins, weights=star_sum, minlength=n_bins)
+        overall = float(star_sum.sum()) / max(int(total.sum()), 1)
+        prior = np.where(bin_total > 0, bin_sum / np.maximum(bin_total, 1), overall)
+        prior[0] = overall
+        self.category_prior = prior[1:]
+        self.bayesian_rating = (self.PRIOR_WEIGHT * prior[bins] + star_sum) / (self.PRIOR_WEIGHT + total)
+
+        z2 = self.WILSON_Z ** 2
+        n = np.maximum(total, 1)
+        share = (stars[:, 4] + stars[:, 5]) / n
+        spread = self.WILSON_Z * np.sqrt(share * (1 - share) / n + z2 / (4 * n * n))
+        wilson = (share + z2 / (2 * n) - spread) / (1 + z2 / n)
+        self.wilson_score = np.where(total > 0, np.maximum(wilson, 0.0), 0.0)
+
+    def rating_scale(self, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(score on the 0-5 scale, rows it applies to) of a rating key; Wilson scores are scaled by 5."""
+        if key == "rating":
+            return self.rating_score, self.has_rating
+        if key == "bayesian":
+            return self.bayesian_rating, self.has_stars
+        if key == "wilson":
+            return self.wilson_score * 5, self.has_stars
+        raise ValueError(f"Bilinmeyen puan anahtarı: {key} (geçerli: {', '.join(self.RATING_KEYS)})")
+
+    # --- Derived masks ---
+
+    @property
+    def has_rating(self) -> np.ndarray:
+        return (self.rating_score > 0) | (self.rating_count > 0)
+
+    @property
+    def has_stars(self) -> np.ndarray:
+        return self.star_total > 0
+
+    @property
+    def has_comments(self) -> np.ndarray:
+        return self.loaded_comments > 0
+
+    @property
+    def valid_price(self) -> np.ndarray:
+        return np.isfinite(self.price) & (self.price > 0)
+
+    @property
+    def star_total(self) -> np.ndarray:
+        return self.stars.sum(axis=1)
+
+    @property
+    def trending(self) -> np.ndarray:
+        return (self.engagement >= 5.0) & (self.rating_score >= 4.0)
+
+    @property
+    def polarizing(self) -> np.ndarray:
+        total = self.star_total
+        positive_ratio, negative_ratio = self._star_ratios(total)
+        return (total >= 5) & (positive_ratio > 0.3) & (negative_ratio > 0.2)
+
+    @property
+    def polarization(self) -> np.ndarray:
+        """`StarDistribution.polarization_score` per row."""
+        positive_ratio, negative_ratio = self._star_ratios(self.star_total)
+        return 4 * positive_ratio * negative_ratio
+
+    def _star_ratios(self, total: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        safe_total = np.maximum(total, 1)
+        positive_ratio = (self.stars[:, 4] + self.stars[:, 5]) / safe_total
+        negative_ratio = (self.stars[:, 0] + self.stars[:, 1] + self.stars[:, 2]) / safe_total
+        return positive_ratio, negative_ratio
+
+    def category_rows(self, category: str) -> np.ndarray:
+        rows = self._category_rows.get(category)
+        return rows if rows is not None else np.empty(0, dtype=np.intp)
+
+    def category_groups(self, mask: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows (of `mask`, or all) grouped by category, in catalog order within each group.
+
+        Category code `c` owns `rows[bounds[c]:bounds[c + 1]]`; rows without
+        a category come first. Reuses the category index, so no sort is needed.
+        """
+        order, bounds = self._category_order, self._category_bounds
+        if mask is None:
+            return order, bounds
+        selected = mask[order]
+        kept_before = np.concatenate(([0], np.cumsum(selected)))
+        return order[selected], kept_before[bounds]
+
+
+def top_k(values: np.ndarray, limit: int, rows: np.ndarray | None = None) -> np.ndarray:
+    """Rows with the largest `values`, ties broken by row order.
+
+    Matches `sorted(rows, key=values, reverse=True)[:limit]`: `argpartition`
+    narrows the candidates to everything at or above the k-th value, and only
+    those are sorted.
+    """
+    if rows is None:
+        rows = np.arange(len(values))
+    candidate_values = values[rows]
+    n = len(rows)
+
+    if 0 < limit < n:
+        part = np.argpartition(-candidate_values, limit - 1)[:limit]
+        threshold = candidate_values[part].min()
+        keep = np.flatnonzero(candidate_values >= threshold)
+        rows, candidate_values = rows[keep], candidate_values[keep]
+
+    order = np.argsort(-candidate_values, kind="stable")
+    return rows[order][:limit]
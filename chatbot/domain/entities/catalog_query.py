@@ -0,0 +1,75 @@
+"""CatalogQuery - composable filter, sort and pagination request over the product catalog."""
+
+from __future__ import annotations
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.leaderboards import Leaderboards
+
+PRICE_SORTS = ("price", "price_desc")
+SORT_KEYS = Leaderboards.METRICS + PRICE_SORTS
+
+
+@dataclass(frozen=True)
+class CatalogQuery:
+    """Filters, sort order and page of a catalog query; every filter left as None is off.
+
+    Queries are immutable and compose by copying:
+
+        CatalogQuery().where(max_price=100, min_rating=4).sorted_by("comments").page(0, 10)
+
+    Price bounds are inclusive and only match products with a known price.
+    `color` and `origin` match case- and accent-insensitively. `sort` is a
+    `Leaderboards` metric (best first) or "price" / "price_desc"; products
+    the metric does not rank (e.g. unrated ones under "rating") come last,
+    in catalog order.
+    """
+
+    category: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_rating: Optional[float] = None
+    min_comments: Optional[int] = None
+    color: Optional[str] = None
+    origin: Optional[str] = None
+    sort: str = "rating"
+    offset: int = 0
+    limit: int = 20
+
+    def __post_init__(self) -> None:
+        if self.sort not in SORT_KEYS:
+            raise ValueError(f"Bilinmeyen sıralama ölçütü: {self.sort} (geçerli: {', '.join(SORT_KEYS)})")
+        if self.offset < 0 or self.limit < 0:
+            raise ValueError("Sayfa başlangıcı ve boyutu negatif olamaz.")
+        if any(bound != bound for bound in (self.min_price, self.max_price, self.min_rating, self.min_comments)):
+            raise ValueError("Filtre sınırları sayı olmalı.")
+
+    def where(self, **filters) -> CatalogQuery:
+        """A copy with the given filters set (None clears one)."""
+        return replace(self, **filters)
+
+    def sorted_by(self, sort: str) -> CatalogQuery:
+        return replace(self, sort=sort)
+
+    def page(self, offset: int, limit: int) -> CatalogQuery:
+        return replace(self, offset=offset, limit=limit)
+
+
+@dataclass
+class QueryPage:
+    """One page of query results, the total number of matching products and their facet counts.
+
+    `facets` maps "category", "color" and "origin" to the number of matching
+    products (all pages) per value, most common first.
+    """
+
+    products: List[Product] = field(default_factory=list)
+    total: int = 0
+    offset: int = 0
+    limit: int = 0
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.products) < self.total
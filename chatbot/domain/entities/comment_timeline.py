@@ -0,0 +1,183 @@
+"""CommentTimeline - dated comments of the catalog, bucketed into histograms and trend windows."""
+
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.date_parser import NO_DATE, day_to_date
+from chatbot.domain.entities.product import Product
+
+
+class CommentTimeline:
+    """Every dated comment as two flat arrays: `days[k]` of a comment on row `owner[k]`.
+
+    Row `i` is `products[i]`. Histograms bucket the days by Monday-based week
+    or calendar month. Trends compare two windows ending at the newest
+    comment of the catalog (the export has no clock of its own): the last
+    `WINDOW_DAYS` ("recent") and the ones before ("previous"). Velocity is
+    recent comments per week, acceleration its change against the previous
+    window. Per-row window counts are kept up to date on a catalog change;
+    only when the newest comment date moves are they recounted for all rows.
+    """
+
+    PERIODS = ("week", "month")
+    WINDOW_DAYS = 28
+    # Recent comments a product needs before it can count as rising
+    MIN_RECENT = 3
+
+    def __init__(self, products: Sequence[Product]) -> None:
+        self.days, self.owner = self._extract(products)
+        self.size = len(products)
+        self.reference = self._latest(self.days)
+        self.recent, self.previous = self._window_counts(self.days, self.owner, self.size, self.reference)
+
+    def apply(
+        self,
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows.
+
+        Only the changed products' comments are read; the rest is array
+        filtering. Window counts are patched for the changed rows unless
+        the change moves the newest comment date.
+        """
+        days, owner = self.days, self.owner
+        changed: List[int] = list(updated_rows) + list(range(self.size, self.size + len(appended)))
+        replaced = np.zeros(self.size, dtype=bool)
+        replaced[np.asarray(updated_rows, dtype=np.intp)] = True
+        keep = ~replaced[owner]
+        # Comments of the changed products; `new_owner` indexes `changed`
+        new_days, new_owner = self._extract(list(updated) + list(appended))
+        days = np.concatenate([days[keep], new_days])
+        owner = np.concatenate([owner[keep], np.asarray(changed, dtype=np.int32)[new_owner]])
+        size = self.size + len(appended)
+
+        if len(deleted_rows):
+            deleted = np.zeros(size, dtype=bool)
+            deleted[np.asarray(deleted_rows, dtype=np.intp)] = True
+            # Old row -> row after the deletions
+            renumber = (np.cumsum(~deleted) - 1).astype(np.int32)
+            keep = ~deleted[owner]
+            days, owner = days[keep], renumber[owner[keep]]
+        else:
+            deleted = np.zeros(size, dtype=bool)
+
+        reference = self._latest(days)
+        if reference == self.reference:
+            recent = np.concatenate([self.recent, np.zeros(len(appended), dtype=np.int32)])
+            previous = np.concatenate([self.previous, np.zeros(len(appended), dtype=np.int32)])
+            rows = np.asarray(changed, dtype=np.intp)
+            recent[rows], previous[rows] = self._window_counts(new_days, new_owner, len(changed), reference)
+            recent, previous = recent[~deleted], previous[~deleted]
+        else:
+            recent, previous = self._window_counts(days, owner, size - len(deleted_rows), reference)
+
+        self.days, self.owner = days, owner
+        self.size = size - len(deleted_rows)
+        self.reference = reference
+        self.recent, self.previous = recent, previous
+
+    # --- Histograms ---
+
+    def buckets(self, period: str, days: np.ndarray | None = None) -> np.ndarray:
+        """Bucket of each day (default: every comment): weeks or months since 1970."""
+        days = self.days if days is None else days
+        if period == "week":
+            # 1970-01-01 was a Thursday; weeks start on Monday
+            return (days.astype(np.int64) + 3) // 7
+        if period == "month":
+            return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        raise ValueError(f"Bilinmeyen zaman aralığı: {period}")
+
+    def histogram(self, period: str = "month", rows: np.ndarray | None = None) -> Tuple[int, np.ndarray]:
+        """(first bucket, comment counts per bucket from it) of `rows`' comments, or of all.
+
+        Buckets without comments inside the range count 0; no comments give (0, empty).
+        """
+        days = self.days
+        if rows is not None:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[rows] = True
+            days = days[selected[self.owner]]
+        if not len(days):
+            return 0, np.zeros(0, dtype=np.int64)
+        buckets = self.buckets(period, days)
+        first = int(buckets.min())
+        return first, np.bincount(buckets - first)
+
+    def grouped_histograms(
+        self, groups: np.ndarray, group_count: int, period: str = "month"
+    ) -> Tuple[int, np.ndarray]:
+        """(first bucket, counts matrix) with one histogram row per group, in one pass.
+
+        `groups[row]` is the group of each catalog row, -1 for none (e.g. the
+        category codes of `CatalogColumns`). All rows share the bucket range.
+        """
+        group = groups[self.owner]
+        grouped = group >= 0
+        if not grouped.any():
+            return 0, np.zeros((group_count, 0), dtype=np.int64)
+        buckets = self.buckets(period, self.days[grouped])
+        first = int(buckets.min())
+        width = int(buckets.max()) - first + 1
+        cells = group[grouped].astype(np.int64) * width + (buckets - first)
+        return first, np.bincount(cells, minlength=group_count * width).reshape(group_count, width)
+
+    def bucket_start(self, bucket: int, period: str) -> str:
+        """ISO date of a week's Monday, or "YYYY-MM" of a month."""
+        if period == "week":
+            return day_to_date(bucket * 7 - 3).isoformat()
+        return str(np.datetime64(int(bucket), "M"))
+
+    # --- Trends ---
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """Recent comments per week, per row."""
+        return self.recent * (7 / self.WINDOW_DAYS)
+
+    @property
+    def acceleration(self) -> np.ndarray:
+        """Change of the weekly comment rate against the previous window, per row."""
+        return (self.recent - self.previous) * (7 / self.WINDOW_DAYS)
+
+    def rising(self, limit: int | None = None, rows: np.ndarray | None = None) -> np.ndarray:
+        """Rows (of `rows`, or all) whose comment rate grows, fastest growing first.
+
+        A row needs `MIN_RECENT` recent comments and more than in the
+        previous window; ties go to the higher rate, then to catalog order.
+        """
+        if rows is None:
+            rows = np.arange(self.size)
+        recent, previous = self.recent[rows], self.previous[rows]
+        rows = rows[(recent >= self.MIN_RECENT) & (recent > previous)]
+        recent = self.recent[rows]
+        ranked = rows[np.lexsort((rows, -recent, -(recent - self.previous[rows])))]
+        return ranked if limit is None else ranked[:limit]
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _extract(products: Sequence[Product]) -> Tuple[np.ndarray, np.ndarray]:
+        per_product = [p.comments.days if p.comments else np.empty(0, dtype=np.int32) for p in products]
+        lengths = np.fromiter(map(len, per_product), dtype=np.int64, count=len(per_product))
+        days = np.concatenate(per_product) if per_product else np.empty(0, dtype=np.int32)
+        owner = np.repeat(np.arange(len(products), dtype=np.int32), lengths)
+        dated = days != NO_DATE
+        return days[dated], owner[dated]
+
+    @staticmethod
+    def _latest(days: np.ndarray) -> int:
+        return int(days.max()) if len(days) else NO_DATE
+
+    def _window_counts(
+        self, days: np.ndarray, owner: np.ndarray, size: int, reference: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        age = reference - days.astype(np.int64)
+        recent = np.bincount(owner[age < self.WINDOW_DAYS], minlength=size)
+        previous = np.bincount(owner[(age >= self.WINDOW_DAYS) & (age < 2 * self.WINDOW_DAYS)], minlength=size)
+        return recent.astype(np.int32), previous.astype(np.int32)
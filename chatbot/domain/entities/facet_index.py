@@ -0,0 +1,209 @@
+"""FacetIndex - sorted value indexes and attribute codes that answer catalog filters."""
+
+from __future__ import annotations
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.catalog_query import CatalogQuery, PRICE_SORTS
+from chatbot.domain.entities.leaderboards import Leaderboards
+from chatbot.domain.text_normalizer import fold
+
+_SMALLEST_PRICE = float(np.nextafter(0.0, 1.0))
+_LARGEST_PRICE = float(np.finfo(np.float64).max)
+# A filter's matching-row estimate, its rows, and a vectorized test of candidate rows
+_Filter = Tuple[int, Callable[[], np.ndarray], Callable[[np.ndarray], np.ndarray]]
+
+
+class FacetIndex:
+    """Filter indexes over the catalog, where row `i` is `products[i]`.
+
+    Numeric facets (price, rating, comment count) keep every row sorted by
+    value, so a range is two `searchsorted` calls and its size is known
+    before any row is touched. Color and origin are coded per row, one code
+    per distinct folded value. A query starts from its most selective filter
+    and checks the remaining ones against that candidate set only, so a
+    narrow filter keeps a combined query cheap however broad the others are.
+    """
+
+    # Facet -> CatalogColumns column
+    RANGE_FACETS = {"price": "price", "rating": "rating_score", "comments": "comment_count"}
+    VALUE_FACETS = ("color", "origin")
+
+    def __init__(self, columns: CatalogColumns, products: Sequence[Product]) -> None:
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for facet, column in self.RANGE_FACETS.items():
+            values = getattr(columns, column)
+            rows = np.argsort(values, kind="stable")
+            self._sorted[facet] = (values[rows], rows)
+        # Folded value -> code, and the first spelling seen of each code for display
+        self._value_ids: Dict[str, Dict[str, int]] = {name: {} for name in self.VALUE_FACETS}
+        self._labels: Dict[str, List[str]] = {name: [] for name in self.VALUE_FACETS}
+        self._codes = {name: self._encode(name, products) for name in self.VALUE_FACETS}
+        self.size = columns.size
+
+    def apply(
+        self,
+        columns: CatalogColumns,
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows.
+
+        Mirrors `CatalogColumns.apply`; `columns` already reflects the change.
+        Changed rows are merged into the sorted facets without re-sorting them.
+        """
+        total = self.size + len(appended)
+        stale = np.zeros(total, dtype=bool)
+        stale[np.asarray(updated_rows, dtype=np.intp)] = True
+        stale[np.asarray(deleted_rows, dtype=np.intp)] = True
+        live = np.ones(total, dtype=bool)
+        live[np.asarray(deleted_rows, dtype=np.intp)] = False
+        new_row = np.cumsum(live, dtype=np.int64) - 1
+        changed = np.array([*updated_rows, *range(self.size, total)], dtype=np.int64)
+        changed = new_row[changed[live[changed]]]
+
+        for facet, column in self.RANGE_FACETS.items():
+            values, rows = self._sorted[facet]
+            keep = np.flatnonzero(~stale[rows])
+            values, rows = values[keep], new_row[rows[keep]]
+            new_values = getattr(columns, column)[changed]
+            order = np.argsort(new_values, kind="stable")
+            at = np.searchsorted(values, new_values[order], side="right")
+            self._sorted[facet] = (np.insert(values, at, new_values[order]), np.insert(rows, at, changed[order]))
+
+        for name in self.VALUE_FACETS:
+            codes = np.concatenate([self._codes[name], self._encode(name, appended)])
+            if len(updated):
+                codes[np.asarray(updated_rows, dtype=np.intp)] = self._encode(name, updated)
+            self._codes[name] = codes[live]
+        self.size = total - len(deleted_rows)
+
+    # --- Queries ---
+
+    def range_rows(self, facet: str, low: float | None = None, high: float | None = None) -> np.ndarray:
+        """Rows with `low <= value <= high` (either bound optional), in value order."""
+        values, rows = self._sorted[facet]
+        lo, hi = self._bounds(values, low, high)
+        return rows[lo:hi]
+
+    def value_rows(self, name: str, value: str) -> np.ndarray:
+        """Rows whose `name` attribute folds to the same text as `value`, in catalog order."""
+        code = self._value_ids[name].get(fold(value.strip()))
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._codes[name] == code)
+
+    def values(self, name: str) -> List[str]:
+        """Distinct values of a value facet, as first spelled in the catalog."""
+        return list(self._labels[name])
+
+    def select(
+        self, query: CatalogQuery, columns: CatalogColumns, leaderboards: Leaderboards
+    ) -> Tuple[np.ndarray, int, Dict[str, Dict[str, int]]]:
+        """The page of rows matching `query`, the total match count and per-facet value counts."""
+        filters = self._filters(query, columns)
+        if filters:
+            filters.sort(key=lambda f: f[0])
+            rows = filters[0][1]()
+            for _, _, test in filters[1:]:
+                if not len(rows):
+                    break
+                rows = rows[np.flatnonzero(test(rows))]
+        else:
+            rows = np.arange(self.size)
+
+        if query.sort in PRICE_SORTS:
+            rows = np.sort(rows)
+            price = columns.price[rows]
+            # Products without a (finite, positive) price go last either way; ties stay in catalog order
+            keys = np.where(columns.valid_price[rows], price if query.sort == "price" else -price, np.inf)
+            ordered = rows[np.argsort(keys, kind="stable")]
+        else:
+            ordered = leaderboards.order(query.sort, rows, query.category)
+        page = ordered[query.offset:query.offset + query.limit]
+        return page, len(ordered), self._counts(rows, columns)
+
+    # --- Helpers ---
+
+    def _filters(self, query: CatalogQuery, columns: CatalogColumns) -> List[_Filter]:
+        filters: List[_Filter] = []
+        if query.category is not None:
+            category_rows = columns.category_rows(query.category)
+            names = columns.category_names
+            code = names.index(query.category) if query.category in names else -2
+            filters.append((len(category_rows), lambda: category_rows, lambda r, k=code: columns.category[r] == k))
+
+        # Price filters only ever match valid prices, positive and finite: the bounds keep inf
+        # and NaN (sorted after every finite price) out of the candidate rows, valid_price out of the test
+        price_low = price_high = None
+        if query.min_price is not None or query.max_price is not None:
+            price_low = max(query.min_price or 0.0, _SMALLEST_PRICE)
+            price_high = _LARGEST_PRICE if query.max_price is None else min(query.max_price, _LARGEST_PRICE)
+        for facet, low, high in (
+            ("price", price_low, price_high),
+            ("rating", query.min_rating, None),
+            ("comments", query.min_comments, None),
+        ):
+            if low is None and high is None:
+                continue
+            estimate, candidates, test = self._range_filter(facet, getattr(columns, self.RANGE_FACETS[facet]), low, high)
+            if facet == "price":
+                test = lambda r, inner=test: columns.valid_price[r] & inner(r)
+            filters.append((estimate, candidates, test))
+
+        for name in self.VALUE_FACETS:
+            value = getattr(query, name)
+            if value is not None:
+                value_rows = self.value_rows(name, value)
+                code = self._value_ids[name].get(fold(value.strip()), -2)
+                codes = self._codes[name]
+                filters.append((len(value_rows), lambda rows=value_rows: rows, lambda r, c=codes, k=code: c[r] == k))
+        return filters
+
+    def _range_filter(self, facet: str, column: np.ndarray, low: float | None, high: float | None) -> _Filter:
+        values, rows = self._sorted[facet]
+        lo, hi = self._bounds(values, low, high)
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        return hi - lo, lambda: rows[lo:hi], lambda r: (column[r] >= low) & (column[r] <= high)
+
+    @staticmethod
+    def _bounds(values: np.ndarray, low: float | None, high: float | None) -> Tuple[int, int]:
+        lo = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        hi = len(values) if high is None else int(np.searchsorted(values, high, side="right"))
+        return lo, max(lo, hi)
+
+    def _counts(self, rows: np.ndarray, columns: CatalogColumns) -> Dict[str, Dict[str, int]]:
+        """Matching products per category, color and origin value, most common first."""
+        counts = {"category": self._count(columns.category[rows], columns.category_names)}
+        for name in self.VALUE_FACETS:
+            counts[name] = self._count(self._codes[name][rows], self._labels[name])
+        return counts
+
+    @staticmethod
+    def _count(codes: np.ndarray, labels: List[str]) -> Dict[str, int]:
+        # Code -1 (no value) is shifted into bin 0 and left out
+        per_code = np.bincount(codes + 1, minlength=len(labels) + 1)[1:]
+        present = np.flatnonzero(per_code)
+        present = present[np.argsort(-per_code[present], kind="stable")]
+        return {labels[code]: int(per_code[code]) for code in present.tolist()}
+
+    def _encode(self, name: str, products: Sequence[Product]) -> np.ndarray:
+        value_ids, labels = self._value_ids[name], self._labels[name]
+        codes = np.full(len(products), -1, dtype=np.int32)
+        for i, p in enumerate(products):
+            value = (getattr(p, name) or "").strip()
+            if not value:
+                continue
+            key = fold(value)
+            code = value_ids.get(key)
+            if code is None:
+                code = value_ids[key] = len(labels)
+                labels.append(value)
+            codes[i] = code
+        return codes
@@ -0,0 +1,140 @@
+"""Leaderboards - pre-sorted product rankings, globally and per category."""
+
+from __future__ import annotations
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+
+# Metric -> (value column, eligibility mask or None for every row)
+_METRICS: Dict[str, Tuple[Callable[[CatalogColumns], np.ndarray], Callable[[CatalogColumns], np.ndarray] | None]] = {
+    "rating": (lambda c: c.rating_score, lambda c: c.has_rating),
+    "comments": (lambda c: c.comment_count, None),
+    "favorites": (lambda c: c.favorites, None),
+    "engagement": (lambda c: c.engagement, None),
+    "polarization": (lambda c: c.polarization, lambda c: c.polarizing),
+    "bayesian": (lambda c: c.bayesian_rating, lambda c: c.has_stars),
+    "wilson": (lambda c: c.wilson_score, lambda c: c.has_stars),
+}
+# Metrics whose values can change for rows a catalog change did not touch (category priors)
+_RERANKED = frozenset({"bayesian"})
+
+
+class Leaderboards:
+    """Row rankings for every metric: value descending, ties in catalog order.
+
+    Built once from the catalog's columns; any top-N query is then a slice.
+    Each ranking also has a per-category view, the same order grouped by
+    category. On a catalog change only the changed rows are re-ranked and
+    merged into the existing orders; the Bayesian rating, whose category
+    priors move with any change, is re-ranked in full.
+    """
+
+    METRICS = tuple(_METRICS)
+
+    def __init__(self, columns: CatalogColumns) -> None:
+        self._orders: Dict[str, np.ndarray] = {}
+        for metric in self.METRICS:
+            values, eligible = self._metric(columns, metric)
+            rows = np.arange(columns.size) if eligible is None else np.flatnonzero(eligible)
+            self._orders[metric] = self._rank(values, rows)
+        self._index_categories(columns)
+
+    def top(self, metric: str, limit: int | None = None, category: str | None = None) -> np.ndarray:
+        """Rows ranked by `metric` (optionally within one category), best first."""
+        if metric not in self._orders:
+            raise ValueError(f"Bilinmeyen sıralama ölçütü: {metric}")
+        if category is None:
+            order = self._orders[metric]
+        else:
+            code = self._category_codes.get(category)
+            if code is None:
+                return np.empty(0, dtype=np.intp)
+            grouped, bounds = self._by_category[metric]
+            order = grouped[bounds[code]:bounds[code + 1]]
+        return order if limit is None else order[:limit]
+
+    def order(self, metric: str, rows: np.ndarray, category: str | None = None) -> np.ndarray:
+        """Distinct `rows` in `metric` order; rows the metric does not rank follow in catalog order.
+
+        Pass `category` when every row belongs to it, so only that category's
+        view is scanned.
+        """
+        selected = np.zeros(self._size, dtype=bool)
+        selected[rows] = True
+        ranked = self.top(metric, category=category)
+        ranked = ranked[selected[ranked]]
+        if len(ranked) < len(rows):
+            selected[ranked] = False
+            ranked = np.concatenate([ranked, np.flatnonzero(selected)])
+        return ranked
+
+    def apply(
+        self,
+        columns: CatalogColumns,
+        changed_rows: Sequence[int] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Re-rank `changed_rows` (updated or appended) after `columns` took the same change.
+
+        Row numbers are the catalog's before the deletions, as in
+        `CatalogColumns.apply`; `columns` already reflects the whole change.
+        """
+        total = columns.size + len(deleted_rows)
+        stale = np.zeros(total, dtype=bool)
+        stale[np.asarray(changed_rows, dtype=np.intp)] = True
+        stale[np.asarray(deleted_rows, dtype=np.intp)] = True
+        new_row = np.cumsum(~np.isin(np.arange(total), deleted_rows), dtype=np.int64) - 1
+        changed = np.asarray(changed_rows, dtype=np.int64)
+        changed = new_row[changed[~np.isin(changed, deleted_rows)]]
+
+        for metric in self.METRICS:
+            values, eligible = self._metric(columns, metric)
+            if metric in _RERANKED:
+                rows = np.arange(columns.size) if eligible is None else np.flatnonzero(eligible)
+                self._orders[metric] = self._rank(values, rows)
+                continue
+            order = self._orders[metric]
+            kept = new_row[order[np.flatnonzero(~stale[order])]]
+            added = changed if eligible is None else changed[eligible[changed]]
+            self._orders[metric] = self._merge(values, kept, added)
+        self._index_categories(columns)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _metric(columns: CatalogColumns, metric: str) -> Tuple[np.ndarray, np.ndarray | None]:
+        values, eligible = _METRICS[metric]
+        return values(columns), None if eligible is None else eligible(columns)
+
+    @staticmethod
+    def _rank(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        # `rows` ascending + stable sort = ties stay in catalog order
+        return rows[np.argsort(-values[rows], kind="stable")]
+
+    @classmethod
+    def _merge(cls, values: np.ndarray, ranked: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Insert `rows` into the already ranked `ranked` without re-sorting it."""
+        if not len(rows):
+            return ranked
+        rows = cls._rank(values, np.sort(rows))
+        ranked_keys = -values[ranked]
+        row_keys = -values[rows]
+        lo = np.searchsorted(ranked_keys, row_keys, side="left")
+        hi = np.searchsorted(ranked_keys, row_keys, side="right")
+        # Among equal values, position by row number
+        at = [l + int(np.searchsorted(ranked[l:h], r)) for l, h, r in zip(lo.tolist(), hi.tolist(), rows.tolist())]
+        return np.insert(ranked, at, rows)
+
+    def _index_categories(self, columns: CatalogColumns) -> None:
+        self._size = columns.size
+        self._category_codes = {cat: code for code, cat in enumerate(columns.category_names)}
+        self._by_category: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        categories = np.arange(len(columns.category_names) + 1)
+        for metric, order in self._orders.items():
+            codes = columns.category[order]
+            by_code = np.argsort(codes, kind="stable")
+            self._by_category[metric] = (order[by_code], np.searchsorted(codes[by_code], categories))
@@ -0,0 +1,112 @@
+"""PriceSketch - per-category price histograms for quantiles and percentile ranks."""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.product import Product
+
+
+class PriceSketch:
+    """Known prices (finite, > 0) of every category, counted on log-spaced buckets.
+
+    Bucket `b` holds prices in [MIN_PRICE * GROWTH**b, MIN_PRICE * GROWTH**(b + 1));
+    prices outside [MIN_PRICE, MAX_PRICE] go to the first or last bucket.
+    A bucket is read as its geometric middle, so quantiles are within 1% of
+    the real price whatever the price scale. Memory is `BUCKETS` counters per
+    category, independent of the number of products, and a catalog change
+    only moves the changed products' counts. Products without a category
+    are counted under "".
+    """
+
+    MIN_PRICE = 1.0
+    MAX_PRICE = 1_000_000.0
+    GROWTH = 1.02
+    BUCKETS = int(np.ceil(np.log(MAX_PRICE / MIN_PRICE) / np.log(GROWTH))) + 1
+
+    def __init__(self, columns: CatalogColumns) -> None:
+        names = columns.category_names + [""]
+        self._slots: Dict[str, int] = {name: slot for slot, name in enumerate(names)}
+        priced = columns.valid_price
+        # Code -1 (no category) -> the last slot
+        slots = np.where(columns.category < 0, len(names) - 1, columns.category)[priced].astype(np.intp)
+        cells = slots * self.BUCKETS + self._buckets(columns.price[priced])
+        self.counts = np.bincount(cells, minlength=len(names) * self.BUCKETS).astype(np.int32).reshape(
+            len(names), self.BUCKETS
+        )
+        self.size = columns.size
+
+    def apply(self, removed: Sequence[Product] = (), added: Sequence[Product] = ()) -> None:
+        """Move the counts of a catalog change: `removed` are the replaced and deleted products."""
+        for sign, products in ((-1, removed), (1, added)):
+            priced = [p for p in products if p.price.is_valid]
+            if not priced:
+                continue
+            slots = np.fromiter((self._slot(p.subcategory) for p in priced), dtype=np.intp, count=len(priced))
+            prices = np.fromiter((p.price.amount for p in priced), dtype=np.float64, count=len(priced))
+            np.add.at(self.counts, (slots, self._buckets(prices)), sign)
+        self.size += len(added) - len(removed)
+
+    def count(self, category: str | None = None) -> int:
+        """Priced products of a category, or of the catalog."""
+        histogram = self._histogram(category)
+        return 0 if histogram is None else int(histogram.sum())
+
+    def quantiles(self, qs: Sequence[float], category: str | None = None) -> List[float] | None:
+        """Price at each quantile (0-1) of a category, or of the catalog; None without prices."""
+        histogram = self._histogram(category)
+        if histogram is None or not histogram.any():
+            return None
+        cumulative = np.cumsum(histogram)
+        # Nearest rank: the smallest price with at least q of the prices at or below it
+        ranks = np.maximum(np.ceil(np.asarray(qs, dtype=np.float64) * cumulative[-1]), 1)
+        return self._price(np.searchsorted(cumulative, ranks)).tolist()
+
+    def category_quantiles(self, qs: Sequence[float]) -> Dict[str, List[float]]:
+        """`quantiles` of every category with prices, in one pass over the counts."""
+        cumulative = np.cumsum(self.counts, axis=1)
+        totals = cumulative[:, -1]
+        ranks = np.maximum(np.ceil(np.outer(totals, np.asarray(qs, dtype=np.float64))), 1)
+        # Per (category, quantile): buckets whose running count is still below the rank
+        buckets = (cumulative[:, None, :] < ranks[:, :, None]).sum(axis=2)
+        prices = self._price(buckets)
+        return {name: prices[slot].tolist() for name, slot in self._slots.items() if totals[slot]}
+
+    def percentile_rank(self, price: float, category: str | None = None) -> float | None:
+        """Share (0-1) of a category's priced products that cost less than `price`; None without prices.
+
+        Within the bucket of `price` its products are taken as spread evenly on the log scale.
+        """
+        histogram = self._histogram(category)
+        if histogram is None or not histogram.any():
+            return None
+        position = np.log(min(max(price, self.MIN_PRICE), self.MAX_PRICE) / self.MIN_PRICE) / np.log(self.GROWTH)
+        bucket = min(int(position), self.BUCKETS - 1)
+        below = histogram[:bucket].sum() + histogram[bucket] * min(position - bucket, 1.0)
+        return float(below / histogram.sum())
+
+    # --- Helpers ---
+
+    @classmethod
+    def _buckets(cls, prices: np.ndarray) -> np.ndarray:
+        position = np.log(np.maximum(prices, cls.MIN_PRICE) / cls.MIN_PRICE) / np.log(cls.GROWTH)
+        return np.minimum(position.astype(np.intp), cls.BUCKETS - 1)
+
+    @classmethod
+    def _price(cls, buckets: np.ndarray) -> np.ndarray:
+        return cls.MIN_PRICE * cls.GROWTH ** (buckets + 0.5)
+
+    def _slot(self, category: str) -> int:
+        slot = self._slots.get(category)
+        if slot is None:
+            slot = self._slots[category] = len(self.counts)
+            self.counts = np.concatenate([self.counts, np.zeros((1, self.BUCKETS), dtype=np.int32)])
+        return slot
+
+    def _histogram(self, category: str | None) -> np.ndarray | None:
+        if category is None:
+            return self.counts.sum(axis=0)
+        slot = self._slots.get(category)
+        return None if slot is None else self.counts[slot]
@@ -1,14 +1,19 @@
 """Product entity - the core aggregate root of the domain."""
 
 from __future__ import annotations
+import re
 from dataclasses import dataclass, field
 from typing import List, Optional
 
 from chatbot.domain.value_objects.price import Price
 from chatbot.domain.value_objects.rating import Rating
 from chatbot.domain.value_objects.comment import Comment
+from chatbot.domain.value_objects.comment_stats import CommentStats
+from chatbot.domain.value_objects.lazy_comments import LazyComments
 from chatbot.domain.value_objects.star_distribution import StarDistribution
 
+_FAVORITE_PATTERN = re.compile(r"(\d+[\d.]*)\s*kişi\s*favoriledi")
+
 
 @dataclass
 class Product:
@@ -22,7 +27,7 @@ class Product:
     price: Price
     rating: Rating
     star_distribution: StarDistribution
-    comments: List[Comment] = field(default_factory=list)
+    comments: LazyComments = field(default_factory=LazyComments)
     social_proofs: List[str] = field(default_factory=list)
     color: Optional[str] = None
     origin: Optional[str] = None
@@ -30,6 +35,12 @@ class Product:
     total_questions: int = 0
     favorite_count: int = 0
 
+    def __setattr__(self, name: str, value) -> None:
+        # Plain comment lists are wrapped so sentiment counts are always available
+        if name == "comments" and not isinstance(value, LazyComments):
+            value = LazyComments.from_comments(value)
+        super().__setattr__(name, value)
+
     # --- Derived insight properties ---
 
     @property
@@ -40,17 +51,22 @@ class Product:
     def has_comments(self) -> bool:
         return len(self.comments) > 0
 
+    @property
+    def comment_stats(self) -> CommentStats:
+        """Sentiment counts, like totals and notable comments, computed once per comment set."""
+        return self.comments.stats
+
     @property
     def positive_comments(self) -> List[Comment]:
-        return [c for c in self.comments if c.is_positive]
+        return list(self.comments.positive)
 
     @property
     def negative_comments(self) -> List[Comment]:
-        return [c for c in self.comments if c.is_negative]
+        return list(self.comments.negative)
 
     @property
     def neutral_comments(self) -> List[Comment]:
-        return [c for c in self.comments if c.is_neutral]
+        return list(self.comments.neutral)
 
     @property
     def comment_sentiment_ratio(self) -> dict:
@@ -59,16 +75,26 @@ class Product:
         if total == 0:
             return {"positive": 0, "negative": 0, "neutral": 0}
         return {
-            "positive": len(self.positive_comments) / total,
-            "negative": len(self.negative_comments) / total,
-            "neutral": len(self.neutral_comments) / total,
+            "positive": self.comments.positive_count / total,
+            "negative": self.comments.negative_count / total,
+            "neutral": self.comments.neutral_count / total,
         }
 
     @property
     def most_liked_comment(self) -> Optional[Comment]:
-        if not self.comments:
-            return None
-        return max(self.comments, key=lambda c: c.likes)
+        return self.comments.at(self.comment_stats.most_liked)
+
+    @property
+    def longest_positive_comment(self) -> Optional[Comment]:
+        return self.comments.at(self.comment_stats.longest_positive)
+
+    @property
+    def longest_negative_comment(self) -> Optional[Comment]:
+        return self.comments.at(self.comment_stats.longest_negative)
+
+    @property
+    def total_comment_likes(self) -> int:
+        return self.comment_stats.total_likes
 
     @property
     def engagement_score(self) -> float:
@@ -86,15 +112,22 @@ class Product:
 
     def parse_favorite_count(self) -> int:
         """Extract favorite count from social proof texts."""
-        import re
         for sp in self.social_proofs:
             if not sp:
                 continue
-            match = re.search(r"(\d+[\d.]*)\s*kişi\s*favoriledi", sp)
-            if match:
-                return int(match.group(1).replace(".", ""))
+            count = self.favorite_count_from(sp)
+            if count is not None:
+                return count
         return 0
 
+    @staticmethod
+    def favorite_count_from(text: str) -> Optional[int]:
+        """Favorite count in a single social proof text ('1.234 kişi favoriledi'), if it has one."""
+        match = _FAVORITE_PATTERN.search(text)
+        if match:
+            return int(match.group(1).replace(".", ""))
+        return None
+
     def to_summary(self) -> str:
         """Generate a concise summary of the product for LLM context."""
         parts = [
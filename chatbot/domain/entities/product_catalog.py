@@ -1,11 +1,40 @@
 """ProductCatalog entity - aggregate that holds the full product collection and enables queries."""
 
 from __future__ import annotations
+import copy
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from collections import defaultdict
+from itertools import compress
+
+import numpy as np
 
 from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.aspect_index import AspectIndex
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.leaderboards import Leaderboards
+from chatbot.domain.entities.comment_timeline import CommentTimeline
+from chatbot.domain.entities.catalog_query import CatalogQuery, QueryPage
+from chatbot.domain.entities.facet_index import FacetIndex
+from chatbot.domain.entities.price_sketch import PriceSketch
+from chatbot.domain.entities.search_index import SearchIndex
+from chatbot.domain.entities.trigram_index import TrigramIndex
+
+
+# Price quantiles reported per category: p10, median, p90
+PRICE_QUANTILES = (0.1, 0.5, 0.9)
+
+
+@dataclass
+class CatalogDelta:
+    """A partial export: products to insert or replace, and product ids to remove."""
+
+    upserts: List[Product] = field(default_factory=list)
+    deletions: List[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.upserts) + len(self.deletions)
 
 
 @dataclass
@@ -15,24 +44,236 @@ class ProductCatalog:
     products: List[Product] = field(default_factory=list)
     _by_category: Dict[str, List[Product]] = field(default_factory=lambda: defaultdict(list), repr=False)
     _by_id: Dict[str, Product] = field(default_factory=dict, repr=False)
+    _columns: Optional[CatalogColumns] = field(default=None, repr=False)
+    _row_by_id: Dict[str, int] = field(default_factory=dict, repr=False)
+    _search_index: Optional[SearchIndex] = field(default=None, repr=False)
+    _trigram_index: Optional[TrigramIndex] = field(default=None, repr=False)
+    _leaderboards: Optional[Leaderboards] = field(default=None, repr=False)
+    _facets: Optional[FacetIndex] = field(default=None, repr=False)
+    _price_sketch: Optional[PriceSketch] = field(default=None, repr=False)
+    _timeline: Optional[CommentTimeline] = field(default=None, repr=False)
+    # Built on first use: it reads every comment
+    _aspects: Optional[AspectIndex] = field(default=None, repr=False)
+    # Incremented on every load or mutation; lets caches detect stale results
+    version: int = 0
 
     def load(self, products: List[Product]) -> None:
-        """Load products and build indexes."""
+        """Load products and build indexes: the columnar store, rankings, filters, price sketch, text and comment timeline."""
         self.products = products
         self._by_category = defaultdict(list)
         self._by_id = {}
-        for p in products:
+        self._row_by_id = {}
+        for row, p in enumerate(products):
             if p.subcategory:
                 self._by_category[p.subcategory].append(p)
             self._by_id[p.product_id] = p
-            # Parse and set favorite count from social proofs
-            if p.favorite_count == 0:
-                p.favorite_count = p.parse_favorite_count()
+            self._row_by_id[p.product_id] = row
+            self._prepare(p)
+        self._columns = CatalogColumns(products, self.categories)
+        self._leaderboards = Leaderboards(self._columns)
+        self._facets = FacetIndex(self._columns, products)
+        self._price_sketch = PriceSketch(self._columns)
+        self._search_index = SearchIndex(products)
+        self._trigram_index = TrigramIndex(products)
+        self._timeline = CommentTimeline(products)
+        self._aspects = None
+        self.version += 1
+
+    def copy(self) -> ProductCatalog:
+        """Independent catalog over the same Product objects, to be changed while this one keeps serving."""
+        indexes = (
+            self._columns, self._search_index, self._trigram_index, self._leaderboards,
+            self._facets, self._price_sketch, self._timeline, self._aspects,
+        )
+        # Products are shared, not copied: a delta replaces them rather than changing them
+        memo = {id(p): p for p in self.products}
+        columns, search_index, trigram_index, leaderboards, facets, price_sketch, timeline, aspects = copy.deepcopy(
+            indexes, memo
+        )
+        return ProductCatalog(
+            products=list(self.products),
+            _by_category=defaultdict(list, {cat: list(prods) for cat, prods in self._by_category.items()}),
+            _by_id=dict(self._by_id),
+            _columns=columns,
+            _row_by_id=dict(self._row_by_id),
+            _search_index=search_index,
+            _trigram_index=trigram_index,
+            _leaderboards=leaderboards,
+            _facets=facets,
+            _price_sketch=price_sketch,
+            _timeline=timeline,
+            _aspects=aspects,
+            version=self.version,
+        )
+
+    def apply_delta(self, delta: CatalogDelta) -> Dict[str, int]:
+        """Upsert and delete products by `product_id` without rebuilding the catalog.
+
+        Known products are replaced in place (keeping their position), new
+        products are appended in delta order and deleted products are removed.
+        Indexes and the columnar store are patched for the changed rows only;
+        rankings and aggregates read from them, so they follow automatically.
+        Deletions win over upserts of the same id, and an id listed more than
+        once takes its last row. The catalog is changed in place: apply to a
+        `copy()` when others may be reading it.
+        """
+        columns = self.columns
+        leaderboards = self.leaderboards
+        facets = self.facets
+        price_sketch = self.price_sketch
+        row_indexes = (self.search_index, self.trigram_index, self.timeline)
+        # The aspect index is patched with the text indexes, but only once it exists
+        if self._aspects is not None and self._aspects.size == len(self.products):
+            row_indexes += (self._aspects,)
+        else:
+            self._aspects = None
+        deletion_ids = set(delta.deletions)
+        deleted_ids = {pid for pid in deletion_ids if pid in self._by_id}
+
+        updated_rows: List[int] = []
+        updated: List[Product] = []
+        appended_rows: List[int] = []
+        appended: List[Product] = []
+        # Replaced and deleted products, for the price sketch
+        removed: List[Product] = []
+        affected_categories = set()
+        # The last row of an id wins, at the position of its first
+        upserts = {p.product_id: p for p in delta.upserts}
+        for p in upserts.values():
+            if p.product_id in deletion_ids:
+                continue
+            self._prepare(p)
+            affected_categories.add(p.subcategory)
+            row = self._row_by_id.get(p.product_id)
+            if row is None:
+                row = len(self.products)
+                self.products.append(p)
+                self._row_by_id[p.product_id] = row
+                appended_rows.append(row)
+                appended.append(p)
+            else:
+                affected_categories.add(self.products[row].subcategory)
+                removed.append(self.products[row])
+                self.products[row] = p
+                updated_rows.append(row)
+                updated.append(p)
+            self._by_id[p.product_id] = p
+
+        # Rows are appended to the products list above, so the columns apply
+        # appends after in-place updates, matching the list layout
+        deleted_rows = sorted(self._row_by_id[pid] for pid in deleted_ids)
+        for pid in deleted_ids:
+            gone = self._by_id.pop(pid)
+            affected_categories.add(gone.subcategory)
+            removed.append(gone)
+            del self._row_by_id[pid]
+        if deleted_rows:
+            keep = [True] * len(self.products)
+            for row in deleted_rows:
+                keep[row] = False
+            self.products = list(compress(self.products, keep))
+            for row in range(deleted_rows[0], len(self.products)):
+                self._row_by_id[self.products[row].product_id] = row
+
+        # Category membership: recount the touched categories from the columns
+        affected_categories.discard("")
+        names = set(self._by_category) | affected_categories
+        columns.apply(
+            sorted(names),
+            updated_rows=updated_rows,
+            updated=updated,
+            appended=appended,
+            deleted_rows=deleted_rows,
+        )
+        facets.apply(
+            columns,
+            updated_rows=updated_rows,
+            updated=updated,
+            appended=appended,
+            deleted_rows=deleted_rows,
+        )
+        price_sketch.apply(removed, updated + appended)
+        for index in row_indexes:
+            index.apply(
+                updated_rows=updated_rows,
+                updated=updated,
+                appended=appended,
+                deleted_rows=deleted_rows,
+            )
+        for cat in affected_categories:
+            rows = columns.category_rows(cat)
+            if len(rows):
+                self._by_category[cat] = self._rows(rows)
+            else:
+                self._by_category.pop(cat, None)
+        if len(self.categories) != len(columns.category_names):
+            # A category lost its last product; drop its code
+            columns.apply(self.categories)
+        leaderboards.apply(columns, changed_rows=updated_rows + appended_rows, deleted_rows=deleted_rows)
+
+        self.version += 1
+        return {"updated": len(updated), "added": len(appended), "deleted": len(deleted_rows)}
 
     @property
     def total_products(self) -> int:
         return len(self.products)
 
+    @property
+    def columns(self) -> CatalogColumns:
+        """Columnar view of the products, row `i` being `products[i]`."""
+        if self._columns is None or self._columns.size != len(self.products):
+            self._columns = CatalogColumns(self.products, self.categories)
+        return self._columns
+
+    @property
+    def leaderboards(self) -> Leaderboards:
+        """Pre-sorted rankings over the columnar store."""
+        if self._leaderboards is None or self._leaderboards.size != len(self.products):
+            self._leaderboards = Leaderboards(self.columns)
+        return self._leaderboards
+
+    @property
+    def facets(self) -> FacetIndex:
+        """Filter indexes behind `query`."""
+        if self._facets is None or self._facets.size != len(self.products):
+            self._facets = FacetIndex(self.columns, self.products)
+        return self._facets
+
+    @property
+    def price_sketch(self) -> PriceSketch:
+        """Per-category price histograms behind price quantiles and percentile ranks."""
+        if self._price_sketch is None or self._price_sketch.size != len(self.products):
+            self._price_sketch = PriceSketch(self.columns)
+        return self._price_sketch
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Inverted text index over the products, row `i` being `products[i]`."""
+        if self._search_index is None or self._search_index.size != len(self.products):
+            self._search_index = SearchIndex(self.products)
+        return self._search_index
+
+    @property
+    def trigram_index(self) -> TrigramIndex:
+        """Fuzzy word index over product names and categories, row `i` being `products[i]`."""
+        if self._trigram_index is None or self._trigram_index.size != len(self.products):
+            self._trigram_index = TrigramIndex(self.products)
+        return self._trigram_index
+
+    @property
+    def timeline(self) -> CommentTimeline:
+        """Dated comments with per-product trend windows, row `i` being `products[i]`."""
+        if self._timeline is None or self._timeline.size != len(self.products):
+            self._timeline = CommentTimeline(self.products)
+        return self._timeline
+
+    @property
+    def aspects(self) -> AspectIndex:
+        """Per-product aspect mentions of the comments, row `i` being `products[i]`; built on first use."""
+        if self._aspects is None or self._aspects.size != len(self.products):
+            self._aspects = AspectIndex(self.products)
+        return self._aspects
+
     @property
     def categories(self) -> List[str]:
         return sorted(self._by_category.keys())
@@ -44,61 +285,104 @@ class ProductCatalog:
     def get_by_id(self, product_id: str) -> Optional[Product]:
         return self._by_id.get(product_id)
 
+    def row_of(self, product_id: str) -> Optional[int]:
+        """Position of a product in `products` (its row in the indexes), or None."""
+        return self._row_by_id.get(product_id)
+
     def get_by_category(self, category: str) -> List[Product]:
         return self._by_category.get(category, [])
 
-    def top_rated(self, limit: int = 10) -> List[Product]:
-        """Products with highest rating scores."""
-        rated = [p for p in self.products if p.rating.has_data]
-        return sorted(rated, key=lambda p: p.rating.score, reverse=True)[:limit]
+    def ranking(self, metric: str, limit: int = 10, category: str | None = None) -> List[Product]:
+        """Top products by one of `Leaderboards.METRICS`, optionally within a category."""
+        return self._rows(self.leaderboards.top(metric, limit, category))
+
+    def top_rated(self, limit: int = 10, key: str = "rating") -> List[Product]:
+        """Products with the highest rating by one of `CatalogColumns.RATING_KEYS`."""
+        return self.ranking(self._rating_key(key), limit)
 
     def most_commented(self, limit: int = 10) -> List[Product]:
         """Products with the most comments."""
-        return sorted(self.products, key=lambda p: p.comment_count, reverse=True)[:limit]
+        return self.ranking("comments", limit)
 
     def most_favorited(self, limit: int = 10) -> List[Product]:
         """Products with the most favorites."""
-        return sorted(self.products, key=lambda p: p.favorite_count, reverse=True)[:limit]
+        return self.ranking("favorites", limit)
 
     def most_engaging(self, limit: int = 10) -> List[Product]:
         """Products with the highest engagement score."""
-        return sorted(self.products, key=lambda p: p.engagement_score, reverse=True)[:limit]
+        return self.ranking("engagement", limit)
 
     def trending(self) -> List[Product]:
         """Products that are currently trending."""
-        return [p for p in self.products if p.is_trending]
+        return self._rows(np.flatnonzero(self.columns.trending))
 
     def polarizing(self, limit: int = 10) -> List[Product]:
-        """Products with mixed/polarizing reviews."""
-        return [p for p in self.products if p.star_distribution.is_polarizing][:limit]
+        """Products with mixed/polarizing reviews, the most evenly split first."""
+        return self.ranking("polarization", limit)
 
-    def top_rated_by_category(self, category: str, limit: int = 5) -> List[Product]:
-        prods = self.get_by_category(category)
-        rated = [p for p in prods if p.rating.has_data]
-        return sorted(rated, key=lambda p: p.rating.score, reverse=True)[:limit]
+    def top_rated_by_category(self, category: str, limit: int = 5, key: str = "rating") -> List[Product]:
+        return self.ranking(self._rating_key(key), limit, category)
 
     def price_range_by_category(self, category: str) -> Dict[str, float]:
-        prods = [p for p in self.get_by_category(category) if p.price.is_valid]
-        if not prods:
-            return {"min": 0, "max": 0, "avg": 0}
-        prices = [p.price.amount for p in prods]
+        """Exact min / max / average and sketched p10 / p50 / p90 of a category's known prices."""
+        cols = self.columns
+        rows = cols.category_rows(category)
+        prices = cols.price[rows[cols.valid_price[rows]]]
+        if not len(prices):
+            return {"min": 0, "max": 0, "avg": 0, "p10": 0, "p50": 0, "p90": 0}
+        p10, p50, p90 = (round(q, 2) for q in self.price_sketch.quantiles(PRICE_QUANTILES, category))
         return {
-            "min": min(prices),
-            "max": max(prices),
-            "avg": sum(prices) / len(prices),
+            "min": float(prices.min()),
+            "max": float(prices.max()),
+            # cumsum adds left to right, keeping the float result identical to the per-object code
+            "avg": float(np.cumsum(prices)[-1]) / len(prices),
+            "p10": p10,
+            "p50": p50,
+            "p90": p90,
         }
 
-    def search(self, keyword: str, limit: int = 10) -> List[Product]:
-        """Simple keyword search across name, description, and category."""
-        keyword_lower = keyword.lower()
-        results = []
-        for p in self.products:
-            if (
-                keyword_lower in p.name.lower()
-                or keyword_lower in p.description.lower()
-                or keyword_lower in p.subcategory.lower()
-            ):
-                results.append(p)
-            if len(results) >= limit:
-                break
-        return results
+    def price_percentile(self, price: float, category: str | None = None) -> Optional[float]:
+        """Share (0-1) of a category's (or the catalog's) priced products that cost less than `price`."""
+        return self.price_sketch.percentile_rank(price, category)
+
+    def query(self, query: CatalogQuery | None = None, **filters) -> QueryPage:
+        """Filter, sort and paginate the catalog.
+
+        Pass a `CatalogQuery`, keyword filters (`catalog.query(max_price=100,
+        min_rating=4)`), or both; keywords override fields of the query.
+        """
+        query = (query or CatalogQuery()).where(**filters)
+        rows, total, counts = self.facets.select(query, self.columns, self.leaderboards)
+        return QueryPage(products=self._rows(rows), total=total, offset=query.offset, limit=query.limit, facets=counts)
+
+    def search(self, keyword: str, limit: int = 10, mode: str = "and") -> List[Product]:
+        """Ranked keyword search across name, description, and category.
+
+        Matching is Turkish case- and accent-insensitive; see `SearchIndex`
+        for the query syntax (AND by default, `OR` groups, prefix matches).
+        """
+        return self._rows(self.search_index.search(keyword, limit, mode))
+
+    def fuzzy_search(self, query: str, limit: int = 10, threshold: float | None = None) -> List[Product]:
+        """Typo-tolerant search over product names and categories ("maskra", "ruj matt").
+
+        `threshold` is the minimum similarity in [0, 1]; see `TrigramIndex`.
+        """
+        rows, _ = self.trigram_index.search(query, limit, threshold)
+        return self._rows(rows)
+
+    @staticmethod
+    def _prepare(product: Product) -> None:
+        # Parse and set favorite count from social proofs
+        if product.favorite_count == 0:
+            product.favorite_count = product.parse_favorite_count()
+
+    def _rows(self, rows: np.ndarray) -> List[Product]:
+        products = self.products
+        return [products[i] for i in rows.tolist()]
+
+    @staticmethod
+    def _rating_key(key: str) -> str:
+        if key not in CatalogColumns.RATING_KEYS:
+            raise ValueError(f"Bilinmeyen puan anahtarı: {key} (geçerli: {', '.join(CatalogColumns.RATING_KEYS)})")
+        return key
@@ -0,0 +1,252 @@
+"""SearchIndex - inverted index with BM25 ranking over the catalog's product texts."""
+
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.catalog_columns import top_k
+from chatbot.domain.text_normalizer import tokenize
+
+# Postings are stored as one sorted int64 array of (term id << 32 | row) keys
+_ROW_BITS = np.int64(32)
+_ROW_MASK = np.int64((1 << 32) - 1)
+
+
+class SearchIndex:
+    """Inverted index over product name, category and description, where row `i` is `products[i]`.
+
+    Texts are tokenized with Turkish case and accent folding, so "KALICI",
+    "kalıcı" and "kalici" are the same term. Queries are ranked with BM25
+    (a term in the name weighs three times a term in the description).
+    Terms are AND-ed by default; `OR`/`veya` between terms starts an
+    alternative group, and `mode="or"` ORs every term. A term of three or
+    more characters also matches longer words it is a prefix of, at a lower
+    weight than an exact word match.
+
+    Postings live in a single sorted key array, so a term's postings are one
+    `searchsorted` away and incremental updates are array merges.
+    """
+
+    # Field -> term frequency weight
+    FIELD_WEIGHTS = (("name", 3), ("subcategory", 2), ("description", 1))
+    K1 = 1.2
+    B = 0.75
+    MIN_PREFIX = 3
+    MAX_EXPANSIONS = 32
+    PREFIX_WEIGHT = 0.5
+    OR_OPERATORS = {"or", "veya", "|"}
+
+    def __init__(self, products: Sequence[Product]) -> None:
+        tokens, rows, tf, lengths = self._documents(products, range(len(products)))
+        self._vocab: List[str] = sorted(set(tokens))
+        self._term_ids: Dict[str, int] = {t: i for i, t in enumerate(self._vocab)}
+        keys = self._keys(tokens, rows)
+        order = np.argsort(keys, kind="stable")
+        self._postings = keys[order]
+        self._tf = tf[order]
+        self._doc_len = lengths
+        self._refresh_stats()
+
+    @property
+    def size(self) -> int:
+        return len(self._doc_len)
+
+    def apply(
+        self,
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows.
+
+        Mirrors `CatalogColumns.apply`; only the changed products are tokenized.
+        """
+        size = self.size
+        total = size + len(appended)
+
+        # Drop the postings of rewritten and deleted rows
+        stale = np.zeros(total, dtype=bool)
+        stale[np.asarray(updated_rows, dtype=np.intp)] = True
+        stale[np.asarray(deleted_rows, dtype=np.intp)] = True
+        keep = ~stale[self._postings & _ROW_MASK]
+        postings, tf = self._postings[keep], self._tf[keep]
+
+        doc_rows = list(updated_rows) + list(range(size, total))
+        tokens, rows, new_tf, lengths = self._documents([*updated, *appended], doc_rows)
+        doc_len = np.concatenate([self._doc_len, np.zeros(len(appended), dtype=np.float32)])
+        doc_len[np.asarray(doc_rows, dtype=np.intp)] = lengths
+
+        new_terms = set(tokens).difference(self._term_ids)
+        if new_terms:
+            # Merge the vocabulary; old term ids move monotonically, so key order holds
+            vocab = sorted(self._vocab + list(new_terms))
+            term_ids = {t: i for i, t in enumerate(vocab)}
+            remap = np.array([term_ids[t] for t in self._vocab], dtype=np.int64)
+            postings = (remap[postings >> _ROW_BITS] << _ROW_BITS) | (postings & _ROW_MASK)
+            self._vocab, self._term_ids = vocab, term_ids
+
+        new_keys = self._keys(tokens, rows)
+        order = np.argsort(new_keys, kind="stable")
+        new_keys, new_tf = new_keys[order], new_tf[order]
+        at = np.searchsorted(postings, new_keys)
+        postings = np.insert(postings, at, new_keys)
+        tf = np.insert(tf, at, new_tf)
+
+        if len(deleted_rows):
+            # Renumber rows past the deleted ones; monotonic, so key order holds
+            live = np.ones(total, dtype=bool)
+            live[np.asarray(deleted_rows, dtype=np.intp)] = False
+            new_row = np.cumsum(live, dtype=np.int64) - 1
+            postings = (postings & ~_ROW_MASK) | new_row[postings & _ROW_MASK]
+            doc_len = doc_len[live]
+
+        self._postings, self._tf, self._doc_len = postings, tf, doc_len
+        self._refresh_stats()
+
+    # --- Queries ---
+
+    def search(self, query: str, limit: int = 10, mode: str = "and") -> np.ndarray:
+        """Rows matching `query`, best BM25 score first (ties in catalog order)."""
+        groups = self._parse(query)
+        if mode == "or":
+            groups = [[term for group in groups for term in group]]
+        if not groups:
+            return np.empty(0, dtype=np.int64)
+
+        results = [self._evaluate(group, mode != "or") for group in groups]
+        if len(results) == 1:
+            rows, scores = results[0]
+        else:
+            rows, scores = self._union(results)
+        return rows[top_k(scores, limit)]
+
+    def _parse(self, query: str) -> List[List[str]]:
+        groups: List[List[str]] = [[]]
+        for part in query.split():
+            if part.lower() in self.OR_OPERATORS:
+                groups.append([])
+            else:
+                groups[-1].extend(tokenize(part))
+        return [group for group in groups if group]
+
+    def _evaluate(self, terms: List[str], require_all: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows matching all (or any) of `terms`, with summed scores."""
+        matches = [self._match(term) for term in dict.fromkeys(terms)]
+        if not require_all:
+            return self._union(matches)
+
+        # Intersect starting from the rarest term, so each step probes fewer rows
+        matches.sort(key=lambda match: len(match[0]))
+        rows, scores = matches[0]
+        for term_rows, term_scores in matches[1:]:
+            if not len(rows):
+                break
+            if len(term_rows) > 16 * len(rows):
+                # Few candidates left: binary-search them in the longer posting list
+                at = np.minimum(np.searchsorted(term_rows, rows), len(term_rows) - 1)
+                found = np.flatnonzero(term_rows[at] == rows)
+                rows, scores = rows[found], scores[found] + term_scores[at[found]]
+            else:
+                dense = np.zeros(self.size, dtype=np.float32)
+                dense[term_rows] = term_scores
+                hit = dense[rows]
+                # Index arrays: much cheaper than boolean masks at ~50% density
+                found = np.flatnonzero(hit > 0)
+                rows, scores = rows[found], scores[found] + hit[found]
+        return rows, scores
+
+    def _match(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows containing `term` (or, for longer terms, a word starting with it) and their BM25 scores."""
+        vocab = self._vocab
+        lo = bisect_left(vocab, term)
+        if len(term) >= self.MIN_PREFIX:
+            hi = bisect_left(vocab, term[:-1] + chr(ord(term[-1]) + 1), lo)
+        else:
+            hi = lo + 1 if lo < len(vocab) and vocab[lo] == term else lo
+
+        ids = np.arange(lo, hi, dtype=np.int64)
+        starts = np.searchsorted(self._postings, ids << _ROW_BITS)
+        ends = np.searchsorted(self._postings, (ids + 1) << _ROW_BITS)
+        df = ends - starts
+        live = np.flatnonzero(df)
+        if len(live) > self.MAX_EXPANSIONS:
+            # Keep the exact word plus the most common longer words
+            exact = live[ids[live] == lo] if lo < len(vocab) and vocab[lo] == term else live[:0]
+            others = live[ids[live] != lo] if len(exact) else live
+            others = others[np.argsort(-df[others], kind="stable")[:self.MAX_EXPANSIONS - len(exact)]]
+            live = np.concatenate([exact, others])
+
+        parts_rows, parts_scores = [], []
+        for i in live.tolist():
+            s, e = int(starts[i]), int(ends[i])
+            scores = self._scores[s:e]
+            parts_rows.append(self._postings[s:e] & _ROW_MASK)
+            parts_scores.append(scores if vocab[lo + i] == term else scores * self.PREFIX_WEIGHT)
+
+        if not parts_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if len(parts_rows) == 1:
+            return parts_rows[0], parts_scores[0]
+        # A row matching several expansions counts its best one
+        best = np.zeros(self.size, dtype=np.float32)
+        for rows, scores in zip(parts_rows, parts_scores):
+            best[rows] = np.maximum(best[rows], scores)
+        rows = np.flatnonzero(best)
+        return rows, best[rows]
+
+    def _union(self, matches: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows in any of `matches`, scores summed, using dense per-row buffers."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=bool)
+        for rows, match_scores in matches:
+            scores[rows] += match_scores
+            matched[rows] = True
+        rows = np.flatnonzero(matched)
+        return rows, scores[rows]
+
+    # --- Build helpers ---
+
+    @classmethod
+    def _documents(
+        cls, products: Sequence[Product], rows: Iterable[int]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Flat (token, row, weighted tf) postings and the weighted length of each document."""
+        tokens: List[str] = []
+        posting_rows: List[int] = []
+        tfs: List[int] = []
+        lengths: List[int] = []
+        for row, p in zip(rows, products):
+            counts: Dict[str, int] = {}
+            for name, weight in cls.FIELD_WEIGHTS:
+                for token in tokenize(getattr(p, name)):
+                    counts[token] = counts.get(token, 0) + weight
+            tokens.extend(counts)
+            tfs.extend(counts.values())
+            posting_rows.extend([row] * len(counts))
+            lengths.append(sum(counts.values()))
+        return (
+            tokens,
+            np.array(posting_rows, dtype=np.int64),
+            np.array(tfs, dtype=np.float32),
+            np.array(lengths, dtype=np.float32),
+        )
+
+    def _keys(self, tokens: List[str], rows: np.ndarray) -> np.ndarray:
+        term_ids = self._term_ids
+        ids = np.fromiter((term_ids[t] for t in tokens), dtype=np.int64, count=len(tokens))
+        return (ids << _ROW_BITS) | rows
+
+    def _refresh_stats(self) -> None:
+        """Precompute every posting's BM25 score; document frequencies and lengths only change on load or apply."""
+        n = self.size
+        avg_len = float(self._doc_len.mean()) if n else 0.0
+        terms = self._postings >> _ROW_BITS
+        df = np.bincount(terms, minlength=len(self._vocab))[terms]
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        tf = self._tf
+        norm = self.K1 * (1 - self.B + self.B * self._doc_len[self._postings & _ROW_MASK] / (avg_len or 1.0))
+        self._scores = (idf * tf * (self.K1 + 1) / (tf + norm)).astype(np.float32)
@@ -0,0 +1,193 @@
+"""TrigramIndex - pg_trgm-style fuzzy matching of product names and categories."""
+
+from __future__ import annotations
+from typing import Dict, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.catalog_columns import top_k
+from chatbot.domain.text_normalizer import tokenize
+
+_HIGH_BITS = np.int64(32)
+_LOW_MASK = np.int64((1 << 32) - 1)
+
+
+def trigrams(word: str) -> Set[str]:
+    """pg_trgm trigrams of a folded word: padded with two spaces in front and one behind."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Fuzzy word index over product names and categories, where row `i` is `products[i]`.
+
+    Matching works on words, like pg_trgm: each distinct (Turkish-folded)
+    word of the names and categories is indexed by its trigrams. A query word
+    scores a vocabulary word by the mean of their trigram similarity
+    (shared / all trigrams, pg_trgm's `similarity`) and the share of the
+    query's trigrams the word contains, so typos ("maskra") and truncated
+    names ("mayb") both find their word. A product's score is the mean over
+    the query words of its best-matching word.
+
+    Memory grows with the vocabulary and the name/category word count, not
+    with description or comment text. Query work is bounded by the
+    vocabulary: at most `MAX_QUERY_WORDS` query words, each expanded to at
+    most `MAX_CANDIDATES` similar words.
+    """
+
+    DEFAULT_THRESHOLD = 0.4
+    MAX_QUERY_WORDS = 8
+    MAX_CANDIDATES = 64
+    FIELDS = ("name", "subcategory")
+
+    def __init__(self, products: Sequence[Product]) -> None:
+        self._words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        self._trigram_ids: Dict[str, int] = {}
+        # Sorted (trigram id << 32 | word id) keys, and the trigram count of each word
+        self._word_trigrams = np.empty(0, dtype=np.int64)
+        self._trigram_counts = np.empty(0, dtype=np.int32)
+        # Sorted (word id << 32 | row) keys
+        self._postings = np.empty(0, dtype=np.int64)
+        self._live_words = 0
+        self.size = 0
+        self.apply(appended=products)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._words)
+
+    def apply(
+        self,
+        updated_rows: Sequence[int] = (),
+        updated: Sequence[Product] = (),
+        appended: Sequence[Product] = (),
+        deleted_rows: Sequence[int] = (),
+    ) -> None:
+        """Apply an incremental change in catalog order: overwrite, then append, then delete rows.
+
+        Mirrors `CatalogColumns.apply`. Words only used by removed products
+        stay in the vocabulary until they make up half of it, then the
+        vocabulary is compacted.
+        """
+        size = self.size
+        total = size + len(appended)
+
+        stale = np.zeros(total, dtype=bool)
+        stale[np.asarray(updated_rows, dtype=np.intp)] = True
+        stale[np.asarray(deleted_rows, dtype=np.intp)] = True
+        postings = self._postings[np.flatnonzero(~stale[self._postings & _LOW_MASK])]
+
+        new_keys = []
+        for row, p in zip([*updated_rows, *range(size, total)], [*updated, *appended]):
+            words = {word for name in self.FIELDS for word in tokenize(getattr(p, name))}
+            new_keys.extend((self._word_id(word) << 32) | row for word in words)
+        new_keys = np.sort(np.array(new_keys, dtype=np.int64))
+        postings = np.insert(postings, np.searchsorted(postings, new_keys), new_keys)
+
+        if len(deleted_rows):
+            # Renumber rows past the deleted ones; monotonic, so key order holds
+            live = np.ones(total, dtype=bool)
+            live[np.asarray(deleted_rows, dtype=np.intp)] = False
+            new_row = np.cumsum(live, dtype=np.int64) - 1
+            postings = (postings & ~_LOW_MASK) | new_row[postings & _LOW_MASK]
+
+        self._postings = postings
+        self.size = total - len(deleted_rows)
+        self._index_new_words()
+        word_of = postings >> _HIGH_BITS
+        self._live_words = int(np.count_nonzero(np.diff(word_of))) + 1 if len(word_of) else 0
+        if self._live_words * 2 < len(self._words):
+            self._compact()
+
+    # --- Queries ---
+
+    def search(self, query: str, limit: int = 10, threshold: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows whose name/category words are similar to `query`, best first, with their scores."""
+        threshold = self.DEFAULT_THRESHOLD if threshold is None else threshold
+        words = list(dict.fromkeys(tokenize(query)))[:self.MAX_QUERY_WORDS]
+        if not words or not self.size:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        total = np.zeros(self.size, dtype=np.float32)
+        for word in words:
+            word_ids, word_scores = self.similar_words(word, threshold)
+            best = np.zeros(self.size, dtype=np.float32)
+            for word_id, score in zip(word_ids.tolist(), word_scores.tolist()):
+                rows = self._rows_of(word_id)
+                best[rows] = np.maximum(best[rows], score)
+            total += best
+        total /= len(words)
+
+        rows = top_k(total, limit, np.flatnonzero(total >= threshold))
+        return rows, total[rows]
+
+    def similar_words(self, word: str, threshold: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Vocabulary word ids similar to one folded query word, best first, with their scores."""
+        threshold = self.DEFAULT_THRESHOLD if threshold is None else threshold
+        query_trigrams = trigrams(word)
+        ids = [self._trigram_ids[t] for t in query_trigrams if t in self._trigram_ids]
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        ids = np.array(ids, dtype=np.int64)
+        starts = np.searchsorted(self._word_trigrams, ids << _HIGH_BITS)
+        ends = np.searchsorted(self._word_trigrams, (ids + 1) << _HIGH_BITS)
+        candidates = np.concatenate([self._word_trigrams[s:e] for s, e in zip(starts.tolist(), ends.tolist())])
+        word_ids, shared = np.unique(candidates & _LOW_MASK, return_counts=True)
+
+        n = len(query_trigrams)
+        similarity = shared / (n + self._trigram_counts[word_ids] - shared)
+        coverage = shared / n
+        scores = (similarity + coverage) / 2
+        keep = np.flatnonzero(scores >= threshold)
+        keep = keep[top_k(scores[keep], self.MAX_CANDIDATES)]
+        return word_ids[keep], scores[keep]
+
+    def word(self, word_id: int) -> str:
+        return self._words[word_id]
+
+    # --- Helpers ---
+
+    def _rows_of(self, word_id: int) -> np.ndarray:
+        lo = np.searchsorted(self._postings, np.int64(word_id) << _HIGH_BITS)
+        hi = np.searchsorted(self._postings, np.int64(word_id + 1) << _HIGH_BITS)
+        return self._postings[lo:hi] & _LOW_MASK
+
+    def _word_id(self, word: str) -> int:
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = self._word_ids[word] = len(self._words)
+            self._words.append(word)
+        return word_id
+
+    def _index_new_words(self) -> None:
+        """Add the trigram keys of words registered since the last call."""
+        first = len(self._trigram_counts)
+        if first == len(self._words):
+            return
+        keys, counts = [], []
+        for word_id in range(first, len(self._words)):
+            word_trigrams = trigrams(self._words[word_id])
+            counts.append(len(word_trigrams))
+            for t in word_trigrams:
+                trigram_id = self._trigram_ids.setdefault(t, len(self._trigram_ids))
+                keys.append((trigram_id << 32) | word_id)
+        keys = np.sort(np.array(keys, dtype=np.int64))
+        self._word_trigrams = np.insert(self._word_trigrams, np.searchsorted(self._word_trigrams, keys), keys)
+        self._trigram_counts = np.concatenate([self._trigram_counts, np.array(counts, dtype=np.int32)])
+
+    def _compact(self) -> None:
+        """Drop words no product uses any more and renumber the rest."""
+        word_of = self._postings >> _HIGH_BITS
+        live = np.unique(word_of)
+        remap = np.full(len(self._words), -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+        self._postings = (remap[word_of] << _HIGH_BITS) | (self._postings & _LOW_MASK)
+        self._words = [self._words[i] for i in live.tolist()]
+        self._word_ids = {word: i for i, word in enumerate(self._words)}
+        self._trigram_ids = {}
+        self._word_trigrams = np.empty(0, dtype=np.int64)
+        self._trigram_counts = np.empty(0, dtype=np.int32)
+        self._index_new_words()
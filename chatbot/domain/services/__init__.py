@@ -1,3 +1,9 @@
+from .aggregation_engine import AggregationEngine, AnalysisSnapshot, CategoryStats
+from .analysis_cache import AnalysisCache
+from .context_builder import ContextReport, ContextSection, fit_sections
 from .product_analyzer import ProductAnalyzer
 
-__all__ = ["ProductAnalyzer"]
+__all__ = [
+    "AggregationEngine", "AnalysisSnapshot", "CategoryStats", "AnalysisCache",
+    "ContextReport", "ContextSection", "fit_sections", "ProductAnalyzer",
+]
@@ -0,0 +1,213 @@
+"""AggregationEngine domain service - computes every catalog aggregate into one immutable snapshot."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.product_catalog import PRICE_QUANTILES, ProductCatalog
+from chatbot.domain.entities.catalog_columns import CatalogColumns, top_k
+
+
+@dataclass(frozen=True)
+class CategoryStats:
+    """Aggregates of one category; `price_range` is (min, max, avg) over known prices, if any.
+
+    `price_quantiles` are the sketched (p10, p50, p90) of the same prices.
+    """
+
+    product_count: int
+    rated_count: int
+    commented_count: int
+    average_rating: float
+    total_comments: int
+    total_favorites: int
+    price_range: Optional[Tuple[float, float, float]]
+    price_quantiles: Optional[Tuple[float, float, float]]
+    top_rated: Tuple[Product, ...]
+
+
+@dataclass(frozen=True)
+class AnalysisSnapshot:
+    """Every aggregate `ProductAnalyzer` reports, for one catalog version.
+
+    Rankings hold the first `depth` products (`CATEGORY_DEPTH` for the
+    per-category top rated); longer lists are read from the catalog.
+    """
+
+    version: int
+    depth: int
+    total_products: int
+    products_with_ratings: int
+    products_with_comments: int
+    average_rating: float
+    trending_count: int
+    # Loaded comments: total and (positive, negative, neutral)
+    total_comments: int
+    sentiment_counts: Tuple[int, int, int]
+    categories: Mapping[str, CategoryStats]
+    most_commented: Tuple[Product, ...]
+    most_engaging: Tuple[Product, ...]
+    polarizing: Tuple[Product, ...]
+    best_value: Tuple[Product, ...]
+
+    @property
+    def category_counts(self) -> Mapping[str, int]:
+        return {cat: stats.product_count for cat, stats in self.categories.items()}
+
+
+class AggregationEngine:
+    """Builds an `AnalysisSnapshot` in a fixed number of vectorized passes over the columns.
+
+    Each derived mask is evaluated once, per-category counts and sums come
+    from one `bincount` per column, and the rating and price averages and
+    price ranges are group reductions over the columns' category grouping,
+    and price quantiles come from the catalog's price sketch in one pass,
+    so the per-category work is building the result. Rankings are slices of the
+    catalog's leaderboards. Float averages are summed left to right in
+    catalog order, so they match a per-product loop exactly.
+    """
+
+    DEPTH = 10
+    CATEGORY_DEPTH = 3
+
+    def __init__(self, catalog: ProductCatalog) -> None:
+        self._catalog = catalog
+
+    def build(self, depth: int = DEPTH) -> AnalysisSnapshot:
+        catalog = self._catalog
+        cols = catalog.columns
+        has_rating = cols.has_rating
+        has_comments = cols.has_comments
+        valid_price = cols.valid_price
+
+        rated_scores = cols.rating_score[np.flatnonzero(has_rating)]
+        total_comments = int(cols.loaded_comments.sum())
+        # Column by column: much cheaper than a strided sum(axis=0)
+        positive, negative, neutral = (int(cols.sentiment[:, k].sum()) for k in range(3))
+
+        return AnalysisSnapshot(
+            version=catalog.version,
+            depth=depth,
+            total_products=catalog.total_products,
+            products_with_ratings=len(rated_scores),
+            products_with_comments=int(np.count_nonzero(has_comments)),
+            average_rating=_mean(rated_scores),
+            trending_count=int(np.count_nonzero(cols.trending)),
+            total_comments=total_comments,
+            sentiment_counts=(positive, negative, neutral),
+            categories=MappingProxyType(self._category_stats(cols, has_rating, has_comments, valid_price)),
+            most_commented=tuple(catalog.most_commented(depth)),
+            most_engaging=tuple(catalog.most_engaging(depth)),
+            polarizing=tuple(catalog.polarizing(depth)),
+            best_value=tuple(self.best_value(depth)),
+        )
+
+    def best_value(self, limit: int, key: str = "rating") -> List[Product]:
+        """Well-rated (>= 3.5) products with a known price, by rating per lira.
+
+        `key` picks the rating of `CatalogColumns.RATING_KEYS`; the confidence
+        weighted ones keep products with a handful of ratings from winning
+        on a lucky score alone.
+        """
+        cols = self._catalog.columns
+        score, rated = cols.rating_scale(key)
+        rows = np.flatnonzero(rated & cols.valid_price & (score >= 3.5))
+        value = np.zeros(cols.size, dtype=np.float64)
+        value[rows] = score[rows] / cols.price[rows]
+        products = self._catalog.products
+        return [products[i] for i in top_k(value, limit, rows).tolist()]
+
+    def _category_stats(
+        self, cols: CatalogColumns, has_rating: np.ndarray, has_comments: np.ndarray, valid_price: np.ndarray
+    ) -> dict:
+        names = cols.category_names
+        bins = cols.category.astype(np.intp) + 1  # bin 0 collects products without a category
+        n_bins = len(names) + 1
+
+        def per_category(weights: np.ndarray | None = None) -> List[int]:
+            counts = np.bincount(bins, weights=weights, minlength=n_bins)[1:]
+            return counts.astype(np.int64).tolist()
+
+        product_counts = per_category()
+        rated_counts = per_category(has_rating)
+        commented_counts = per_category(has_comments)
+        comment_totals = per_category(cols.comment_count)
+        favorite_totals = per_category(cols.favorites)
+
+        # Known ratings and prices grouped by category: averages and ranges are per-group reductions
+        rating_rows, rating_bounds = cols.category_groups(has_rating)
+        average_ratings = _group_means(cols.rating_score[rating_rows], rating_bounds).tolist()
+        price_rows, price_bounds = cols.category_groups(valid_price)
+        prices = cols.price[price_rows]
+        average_prices = _group_means(prices, price_bounds).tolist()
+        priced = np.flatnonzero(price_bounds[1:] > price_bounds[:-1])
+        starts = price_bounds[priced]
+        low = dict(zip(priced.tolist(), np.minimum.reduceat(prices, starts).tolist() if len(starts) else ()))
+        high = dict(zip(priced.tolist(), np.maximum.reduceat(prices, starts).tolist() if len(starts) else ()))
+
+        quantiles = self._catalog.price_sketch.category_quantiles(PRICE_QUANTILES)
+
+        leaderboards = self._catalog.leaderboards
+        products = self._catalog.products
+        stats = {}
+        for code, name in enumerate(names):
+            if not product_counts[code]:
+                continue
+            stats[name] = CategoryStats(
+                product_count=product_counts[code],
+                rated_count=rated_counts[code],
+                commented_count=commented_counts[code],
+                average_rating=average_ratings[code],
+                total_comments=comment_totals[code],
+                total_favorites=favorite_totals[code],
+                price_range=(low[code], high[code], average_prices[code]) if code in low else None,
+                price_quantiles=tuple(quantiles[name]) if name in quantiles else None,
+                top_rated=tuple(
+                    products[i] for i in leaderboards.top("rating", self.CATEGORY_DEPTH, name).tolist()
+                ),
+            )
+        return stats
+
+
+def _mean(values: np.ndarray) -> float:
+    # cumsum adds left to right like a Python loop; np.sum's pairwise order can differ in the last bits
+    return float(np.cumsum(values)[-1]) / len(values) if len(values) else 0.0
+
+
+# Groups up to this long are summed together, one element position at a time
+_SHORT_GROUP = 64
+
+
+def _group_means(values: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """`_mean` of every `values[bounds[i]:bounds[i + 1]]`, bit for bit (0.0 for empty groups).
+
+    Short groups are summed side by side: step `j` adds the `j`-th value of
+    every group at least `j + 1` long, which is the same left-to-right order
+    as summing each group alone. Long groups are few and get their own cumsum.
+    """
+    starts = bounds[:-1]
+    sizes = bounds[1:] - starts
+    sums = np.zeros(len(sizes), dtype=np.float64)
+
+    short = np.flatnonzero((sizes > 0) & (sizes <= _SHORT_GROUP))
+    if len(short):
+        # Longest first, so the groups still being summed at step j are a prefix
+        short = short[np.argsort(-sizes[short], kind="stable")]
+        short_starts, short_sizes = starts[short], sizes[short]
+        active = np.searchsorted(-short_sizes, -np.arange(int(short_sizes[0])), side="left")
+        acc = np.zeros(len(short), dtype=np.float64)
+        for j, count in enumerate(active.tolist()):
+            acc[:count] += values[short_starts[:count] + j]
+        sums[short] = acc
+
+    for i in np.flatnonzero(sizes > _SHORT_GROUP).tolist():
+        sums[i] = np.cumsum(values[starts[i]:bounds[i + 1]])[-1]
+
+    means = np.zeros(len(sizes), dtype=np.float64)
+    filled = sizes > 0
+    means[filled] = sums[filled] / sizes[filled]
+    return means
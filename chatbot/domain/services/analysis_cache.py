@@ -0,0 +1,89 @@
+"""AnalysisCache - memoizes analyzer results for one catalog version at a time."""
+
+from __future__ import annotations
+import copy
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class AnalysisCache:
+    """Results keyed by call, valid for a single catalog version.
+
+    A lookup with a newer version drops every entry first, so results never
+    outlive the catalog state they were computed from. Keys include request
+    parameters (limits, categories, periods), so at most `max_entries`
+    results are kept, evicting the least recently used. Mutable results
+    (dicts and lists) are deep-copied for every caller; immutable ones
+    (strings, tuples, frozen reports) are shared. Values are computed
+    outside the lock; two threads missing the same key at once both compute
+    it, which is harmless for pure analyzer methods.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get_or_compute(self, version: int, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return _detached(self._entries[key])
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _detached(value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+def memoized(method: Callable[..., T]) -> Callable[..., T]:
+    """Cache a method of an object with `_cache` (AnalysisCache) and `_catalog` (ProductCatalog).
+
+    Dict and list results are copied per call, so callers may change what they get.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self._cache.get_or_compute(self._catalog.version, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def _detached(value: T) -> T:
+    return copy.deepcopy(value) if isinstance(value, (dict, list, set)) else value
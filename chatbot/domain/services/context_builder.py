@@ -0,0 +1,179 @@
+"""Context builder - fits LLM context sections into a size budget by priority."""
+
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Rough size of a token in Turkish catalog text; good enough for budgeting
+CHARS_PER_TOKEN = 4
+# Blank line between two sections
+SEPARATOR_COST = 2
+
+
+def estimate_tokens(chars: int) -> int:
+    return chars // CHARS_PER_TOKEN
+
+
+def char_budget(max_tokens: int | None = None, max_chars: int | None = None) -> Optional[int]:
+    """The tighter of a token and a character budget, in characters; None when neither is set."""
+    limits = [limit for limit in (max_chars, max_tokens * CHARS_PER_TOKEN if max_tokens else None) if limit]
+    return min(limits) if limits else None
+
+
+@dataclass(frozen=True)
+class ContextSection:
+    """One titled block of context, split into header lines and droppable items.
+
+    The header is every line before the first indented one. Each indented
+    line starts an item unless it is indented deeper than the first item,
+    in which case it continues the previous one ("  Ürün" + "    Yorum: ...").
+    Costs are precomputed in characters so fitting is a lookup.
+    """
+
+    name: str
+    header: Tuple[str, ...]
+    items: Tuple[Tuple[str, ...], ...]
+    header_cost: int
+    # cumulative[k]: characters of the first k items, each with its leading newline
+    cumulative: Tuple[int, ...]
+
+    @classmethod
+    def of(cls, name: str, lines: Sequence[str]) -> ContextSection:
+        header: List[str] = []
+        items: List[List[str]] = []
+        item_indent = None
+        for line in lines:
+            indent = len(line) - len(line.lstrip(" "))
+            if not items and indent == 0:
+                header.append(line)
+            elif items and indent > item_indent:
+                items[-1].append(line)
+            else:
+                if item_indent is None:
+                    item_indent = indent
+                items.append([line])
+        costs = (sum(len(line) + 1 for line in item) for item in items)
+        return cls(
+            name=name,
+            header=tuple(header),
+            items=tuple(tuple(item) for item in items),
+            header_cost=len("\n".join(header)),
+            cumulative=tuple(accumulate(costs, initial=0)),
+        )
+
+    @property
+    def cost(self) -> int:
+        return self.header_cost + self.cumulative[-1]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.header and not self.items
+
+    def render(self, keep: int | None = None) -> str:
+        lines = list(self.header)
+        items = self.items if keep is None else self.items[:keep]
+        for item in items:
+            lines.extend(item)
+        if keep is not None and keep < len(self.items):
+            lines.append(_omission(len(self.items) - keep))
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class ContextReport:
+    """A fitted context and what the budget left out of it."""
+
+    text: str
+    budget: Optional[int]
+    included: Tuple[str, ...]
+    # section -> number of items cut from it
+    truncated: Mapping[str, int]
+    dropped: Tuple[str, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.text)
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.size)
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.truncated and not self.dropped
+
+    def describe(self) -> str:
+        """Short Turkish note of the cuts, for logs."""
+        if self.is_complete:
+            return "kırpılmadı"
+        parts = [f"{name} -{count}" for name, count in self.truncated.items()]
+        parts.extend(f"{name} çıkarıldı" for name in self.dropped)
+        return ", ".join(parts)
+
+
+def fit_sections(
+    sections: Sequence[ContextSection],
+    budget: Optional[int] = None,
+    priority: Sequence[str] | None = None,
+) -> ContextReport:
+    """Join `sections` in their given order, keeping within `budget` characters.
+
+    Sections are admitted in `priority` order (default: their own order).
+    Whole sections go in while they fit. The first one that does not is cut
+    to the leading items that fit, with a note of how many were left out, and
+    every lower-priority section is dropped. A section without items is
+    dropped whole. The result depends only on the sections and the budget.
+    """
+    sections = [s for s in sections if not s.is_empty]
+    if priority is not None:
+        rank = {name: i for i, name in enumerate(priority)}
+        order = sorted(sections, key=lambda s: rank.get(s.name, len(rank)))
+    else:
+        order = sections
+
+    keep: Dict[str, Optional[int]] = {}
+    truncated: Dict[str, int] = {}
+    dropped: List[str] = []
+    remaining = budget if budget is not None else -1
+    exhausted = False
+    for section in order:
+        if budget is None:
+            keep[section.name] = None
+            continue
+        cost = section.cost + (SEPARATOR_COST if keep else 0)
+        if not exhausted and cost <= remaining:
+            keep[section.name] = None
+            remaining -= cost
+            continue
+        if not exhausted:
+            exhausted = True
+            room = remaining - (SEPARATOR_COST if keep else 0)
+            kept = _items_within(section, room)
+            if kept is not None:
+                keep[section.name] = kept
+                truncated[section.name] = len(section.items) - kept
+                continue
+        dropped.append(section.name)
+
+    return ContextReport(
+        text="\n\n".join(s.render(keep[s.name]) for s in sections if s.name in keep),
+        budget=budget,
+        included=tuple(s.name for s in sections if s.name in keep),
+        truncated=MappingProxyType(truncated),
+        dropped=tuple(dropped),
+    )
+
+
+def _items_within(section: ContextSection, room: int) -> Optional[int]:
+    """Most leading items of `section` that fit `room` with the omission note; None if not even one."""
+    # Reserve the longest note, so the count of cut items never changes the answer
+    room -= section.header_cost + len(_omission(len(section.items))) + 1
+    kept = min(bisect_right(section.cumulative, room) - 1, len(section.items) - 1)
+    return kept if kept >= 1 else None
+
+
+def _omission(count: int) -> str:
+    return f"  (+{count} kayıt bağlam sınırı nedeniyle çıkarıldı)"
@@ -1,10 +1,22 @@
 """ProductAnalyzer domain service - extracts meaningful insights from product data."""
 
 from __future__ import annotations
-from typing import Dict, List, Any
+import math
+from typing import Dict, List, Any, Sequence, Tuple
 
+from chatbot.domain.aspect_lexicon import aspect_label
+from chatbot.domain.date_parser import NO_DATE, day_to_date
+from chatbot.domain.entities.aspect_index import AspectIndex
 from chatbot.domain.entities.product_catalog import ProductCatalog
 from chatbot.domain.entities.product import Product
+from chatbot.domain.services.aggregation_engine import AggregationEngine, AnalysisSnapshot, CategoryStats
+from chatbot.domain.services.analysis_cache import AnalysisCache, memoized
+from chatbot.domain.services.context_builder import ContextReport, ContextSection, char_budget, fit_sections
+
+
+def join_sections(sections: Sequence[List[str]]) -> str:
+    """Context text of section line lists: empty sections dropped, a blank line between the rest."""
+    return "\n\n".join("\n".join(lines) for lines in sections if lines)
 
 
 class ProductAnalyzer:
@@ -12,87 +24,82 @@ class ProductAnalyzer:
 
     This service encapsulates the core business logic for deriving meaningful
     interpretations from product data - comments, ratings, favorites, prices, etc.
+    The aggregates come from one `AnalysisSnapshot` per catalog version,
+    built by the `AggregationEngine`; the methods below only format it.
+    Their results are memoized until the catalog version changes, so
+    repeated dashboard and context requests are dictionary lookups.
     """
 
     def __init__(self, catalog: ProductCatalog) -> None:
         self._catalog = catalog
+        self._engine = AggregationEngine(catalog)
+        self._snapshot: AnalysisSnapshot | None = None
+        self._cache = AnalysisCache()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counts of the memoized analyzer results."""
+        return self._cache.stats()
+
+    @property
+    def snapshot(self) -> AnalysisSnapshot:
+        """Aggregates of the current catalog version, rebuilt after the catalog changes."""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._catalog.version:
+            snapshot = self._snapshot = self._engine.build()
+        return snapshot
 
     # --- Catalog-level insights ---
 
+    @memoized
     def catalog_overview(self) -> Dict[str, Any]:
         """High-level overview of the entire catalog."""
-        products_with_ratings = [p for p in self._catalog.products if p.rating.has_data]
-        products_with_comments = [p for p in self._catalog.products if p.has_comments]
-
-        avg_rating = 0.0
-        if products_with_ratings:
-            avg_rating = sum(p.rating.score for p in products_with_ratings) / len(products_with_ratings)
-
+        snap = self.snapshot
         return {
-            "total_products": self._catalog.total_products,
-            "total_categories": len(self._catalog.categories),
-            "categories": self._catalog.category_counts,
-            "products_with_ratings": len(products_with_ratings),
-            "products_with_comments": len(products_with_comments),
-            "average_rating": round(avg_rating, 2),
-            "trending_count": len(self._catalog.trending()),
+            "total_products": snap.total_products,
+            "total_categories": len(snap.categories),
+            "categories": snap.category_counts,
+            "products_with_ratings": snap.products_with_ratings,
+            "products_with_comments": snap.products_with_comments,
+            "average_rating": round(snap.average_rating, 2),
+            "trending_count": snap.trending_count,
         }
 
+    @memoized
     def category_analysis(self, category: str) -> Dict[str, Any]:
         """Deep analysis of a specific category."""
-        products = self._catalog.get_by_category(category)
-        if not products:
+        stats = self.snapshot.categories.get(category)
+        if stats is None:
             return {"error": f"'{category}' kategorisinde ürün bulunamadı."}
 
-        rated = [p for p in products if p.rating.has_data]
-        commented = [p for p in products if p.has_comments]
-        price_range = self._catalog.price_range_by_category(category)
-
-        avg_rating = 0.0
-        if rated:
-            avg_rating = sum(p.rating.score for p in rated) / len(rated)
-
-        total_comments = sum(p.comment_count for p in products)
-        total_favorites = sum(p.favorite_count for p in products)
-
-        top_rated = self._catalog.top_rated_by_category(category, limit=3)
-
         return {
             "category": category,
-            "product_count": len(products),
-            "rated_count": len(rated),
-            "commented_count": len(commented),
-            "average_rating": round(avg_rating, 2),
-            "total_comments": total_comments,
-            "total_favorites": total_favorites,
-            "price_range": price_range,
-            "top_rated": [p.to_summary() for p in top_rated],
+            "product_count": stats.product_count,
+            "rated_count": stats.rated_count,
+            "commented_count": stats.commented_count,
+            "average_rating": round(stats.average_rating, 2),
+            "total_comments": stats.total_comments,
+            "total_favorites": stats.total_favorites,
+            "price_range": self._price_range(stats),
+            "top_rated": [p.to_summary() for p in stats.top_rated],
         }
 
     # --- Comment-based insights ---
 
+    @memoized
     def most_discussed_products(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Products generating the most discussion (comments)."""
-        products = self._catalog.most_commented(limit)
+        products = self._ranking("most_commented", limit)
         return [self._product_comment_insight(p) for p in products if p.has_comments]
 
+    @memoized
     def sentiment_analysis_summary(self) -> Dict[str, Any]:
         """Overall sentiment analysis across all products with comments."""
-        products_with_comments = [p for p in self._catalog.products if p.has_comments]
-
-        all_positive = 0
-        all_negative = 0
-        all_neutral = 0
-        total = 0
-
-        for p in products_with_comments:
-            all_positive += len(p.positive_comments)
-            all_negative += len(p.negative_comments)
-            all_neutral += len(p.neutral_comments)
-            total += len(p.comments)
+        snap = self.snapshot
+        all_positive, all_negative, all_neutral = snap.sentiment_counts
+        total = snap.total_comments
 
         return {
-            "products_analyzed": len(products_with_comments),
+            "products_analyzed": snap.products_with_comments,
             "total_comments": total,
             "positive_comments": all_positive,
             "negative_comments": all_negative,
@@ -101,11 +108,43 @@ class ProductAnalyzer:
             "negative_ratio": round(all_negative / total, 2) if total > 0 else 0,
         }
 
+    # --- Rating-based insights ---
+
+    @memoized
+    def top_rated_products(
+        self, limit: int = 10, category: str | None = None, key: str = "rating"
+    ) -> List[Dict[str, Any]]:
+        """Best rated products by one of `CatalogColumns.RATING_KEYS`, with both confidence scores.
+
+        "bayesian" ranks by the star mean shrunk toward the category's,
+        "wilson" by the lower bound of the 4-5 star share; see
+        `CatalogColumns._score_ratings`.
+        """
+        catalog = self._catalog
+        if category is None:
+            products = catalog.top_rated(limit, key)
+        else:
+            products = catalog.top_rated_by_category(category, limit, key)
+        cols = catalog.columns
+        items = []
+        for p in products:
+            row = catalog.row_of(p.product_id)
+            items.append({
+                "name": p.name,
+                "category": p.subcategory,
+                "rating": str(p.rating),
+                "star_ratings": p.star_distribution.total,
+                "bayesian_rating": round(float(cols.bayesian_rating[row]), 2),
+                "wilson_score": round(float(cols.wilson_score[row]), 3),
+            })
+        return items
+
     # --- Engagement-based insights ---
 
+    @memoized
     def engagement_leaders(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Products with the highest overall engagement."""
-        products = self._catalog.most_engaging(limit)
+        products = self._ranking("most_engaging", limit)
         return [
             {
                 "name": p.name,
@@ -118,9 +157,10 @@ class ProductAnalyzer:
             for p in products
         ]
 
+    @memoized
     def polarizing_products(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Products with the most polarizing (mixed) reviews."""
-        products = self._catalog.polarizing(limit)
+        products = self._ranking("polarizing", limit)
         return [
             {
                 "name": p.name,
@@ -135,143 +175,438 @@ class ProductAnalyzer:
 
     # --- Price insights ---
 
+    @memoized
     def price_comparison_by_category(self) -> Dict[str, Dict[str, float]]:
         """Price ranges for each category."""
-        result = {}
-        for cat in self._catalog.categories:
-            price_range = self._catalog.price_range_by_category(cat)
-            if price_range["max"] > 0:
-                result[cat] = price_range
-        return result
-
-    def best_value_products(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Products with the best rating-to-price ratio."""
-        candidates = [
-            p for p in self._catalog.products
-            if p.rating.has_data and p.price.is_valid and p.rating.score >= 3.5
-        ]
-        # Sort by rating/price ratio (higher is better value)
-        candidates.sort(key=lambda p: p.rating.score / p.price.amount, reverse=True)
+        return {
+            cat: self._price_range(stats)
+            for cat, stats in self.snapshot.categories.items()
+            if stats.price_range is not None
+        }
+
+    def price_position(self, price: float, category: str | None = None) -> Dict[str, Any] | None:
+        """Where a price falls in a category (or the catalog), from the price sketch; None without prices.
+
+        `cheaper_than` is the share of priced products that cost more, in
+        percent: "cheaper than X% of the category". Raises ValueError unless
+        `price` is a positive number.
+        """
+        if not (math.isfinite(price) and price > 0):
+            raise ValueError(f"Fiyat pozitif bir sayı olmalı: {price}")
+        share = self._catalog.price_percentile(price, category)
+        if share is None:
+            return None
+        return {
+            "category": category,
+            "price": price,
+            "percentile": round(share * 100, 1),
+            "cheaper_than": round((1 - share) * 100, 1),
+        }
+
+    @memoized
+    def product_price_position(self, product_id: str) -> Dict[str, Any]:
+        """`price_position` of a product's price within its own category."""
+        p = self._catalog.get_by_id(product_id)
+        if p is None:
+            raise ValueError(f"Ürün bulunamadı: {product_id}")
+        position = self.price_position(p.price.amount, p.subcategory or None) if p.price.is_valid else None
+        if position is None:
+            return {"category": p.subcategory, "price": str(p.price), "percentile": None, "cheaper_than": None, "name": p.name}
+        return {**position, "name": p.name, "category": p.subcategory, "price": str(p.price)}
+
+    @memoized
+    def best_value_products(self, limit: int = 10, key: str = "rating") -> List[Dict[str, Any]]:
+        """Products with the best rating-to-price ratio; `key` picks the rating (see `AggregationEngine.best_value`)."""
+        snap = self.snapshot
+        if key == "rating" and limit <= snap.depth:
+            candidates = snap.best_value[:limit]
+        else:
+            candidates = self._engine.best_value(limit, key)
+        if key == "rating":
+            scores = [p.rating.score for p in candidates]
+        else:
+            scale, _ = self._catalog.columns.rating_scale(key)
+            scores = [float(scale[self._catalog.row_of(p.product_id)]) for p in candidates]
         return [
             {
                 "name": p.name,
                 "category": p.subcategory,
                 "price": str(p.price),
                 "rating": str(p.rating),
-                "value_score": round(p.rating.score / p.price.amount * 100, 2),
+                "value_score": round(score / p.price.amount * 100, 2),
             }
-            for p in candidates[:limit]
+            for p, score in zip(candidates, scores)
         ]
 
-    # --- Comprehensive context for LLM ---
+    # --- Comment trend insights ---
+
+    @memoized
+    def comment_trends(self, limit: int = 10, category: str | None = None) -> List[Dict[str, Any]]:
+        """Products whose comment rate is accelerating, fastest first; see `CommentTimeline.rising`."""
+        timeline = self._catalog.timeline
+        rows = None if category is None else self._catalog.columns.category_rows(category)
+        velocity, acceleration = timeline.velocity, timeline.acceleration
+        products = self._catalog.products
+        trends = []
+        for row in timeline.rising(limit, rows).tolist():
+            p = products[row]
+            trends.append({
+                "name": p.name,
+                "category": p.subcategory,
+                "rating": str(p.rating),
+                "recent_comments": int(timeline.recent[row]),
+                "previous_comments": int(timeline.previous[row]),
+                "weekly_velocity": round(float(velocity[row]), 2),
+                "acceleration": round(float(acceleration[row]), 2),
+            })
+        return trends
+
+    @memoized
+    def comment_activity(
+        self, period: str = "month", category: str | None = None, product_id: str | None = None
+    ) -> Dict[str, Any]:
+        """Comment counts per week or month: catalog-wide, for one category or for one product."""
+        timeline = self._catalog.timeline
+        rows = None
+        if product_id is not None:
+            row = self._catalog.row_of(product_id)
+            rows = [] if row is None else [row]
+        elif category is not None:
+            rows = self._catalog.columns.category_rows(category)
+        first, counts = timeline.histogram(period, rows)
+        return {
+            "period": period,
+            "buckets": [
+                {"start": timeline.bucket_start(first + i, period), "comments": count}
+                for i, count in enumerate(counts.tolist())
+            ],
+        }
 
-    def generate_llm_context(self) -> str:
-        """Generate a comprehensive analytical context string for the LLM.
+    @memoized
+    def category_activity(self, period: str = "month", last: int = 6) -> Dict[str, Any]:
+        """The last `last` weeks or months of comment counts for every category, counted in one pass."""
+        timeline = self._catalog.timeline
+        cols = self._catalog.columns
+        first, counts = timeline.grouped_histograms(cols.category, len(cols.category_names), period)
+        skip = max(counts.shape[1] - last, 0)
+        return {
+            "period": period,
+            "buckets": [timeline.bucket_start(b, period) for b in range(first + skip, first + counts.shape[1])],
+            "categories": {
+                cat: counts[code, skip:].tolist() for code, cat in enumerate(cols.category_names) if counts[code].any()
+            },
+        }
 
-        This is the key method that compiles all insights into a structured
-        text block that the LLM can use to answer user questions intelligently.
-        """
+    @memoized
+    def trend_summary(self, limit: int = 5) -> Dict[str, Any]:
+        """Comment trend windows of the catalog and its rising products."""
+        timeline = self._catalog.timeline
+        return {
+            "window_days": timeline.WINDOW_DAYS,
+            "window_end": day_to_date(timeline.reference).isoformat() if timeline.reference != NO_DATE else None,
+            "recent_comments": int(timeline.recent.sum()),
+            "previous_comments": int(timeline.previous.sum()),
+            "rising": self.comment_trends(limit),
+        }
+
+    # --- Aspect insights ---
+
+    @memoized
+    def aspect_summary(self, category: str | None = None) -> List[Dict[str, Any]]:
+        """What the comments talk about (kalıcılık, pigment, koku...), most mentioned aspect first."""
+        rows = None if category is None else self._catalog.columns.category_rows(category)
+        totals = self._catalog.aspects.totals(rows)
+        summary = []
+        for code, aspect in enumerate(AspectIndex.ASPECTS):
+            positive, negative, neutral = totals[code].tolist()
+            mentions = positive + negative + neutral
+            if mentions:
+                summary.append({
+                    "aspect": aspect,
+                    "label": aspect_label(aspect),
+                    "mentions": mentions,
+                    "positive_ratio": round(positive / mentions, 2),
+                    "negative_ratio": round(negative / mentions, 2),
+                })
+        summary.sort(key=lambda item: -item["mentions"])
+        return summary
+
+    @memoized
+    def aspect_ranking(
+        self, aspect: str, limit: int = 10, category: str | None = None, order: str = "best"
+    ) -> List[Dict[str, Any]]:
+        """Products ranked on one aspect of their comments; see `AspectIndex.top` for the orders."""
+        aspects = self._catalog.aspects
+        rows = None if category is None else self._catalog.columns.category_rows(category)
+        code = aspects.code(aspect)
+        products = self._catalog.products
+        ranking = []
+        for row in aspects.top(aspect, limit, rows, order).tolist():
+            positive, negative, neutral = aspects.counts[row, code].tolist()
+            mentions = positive + negative + neutral
+            p = products[row]
+            ranking.append({
+                "name": p.name,
+                "category": p.subcategory,
+                "rating": str(p.rating),
+                "mentions": mentions,
+                "positive": positive,
+                "negative": negative,
+                "positive_ratio": f"{positive / mentions:.0%}",
+                "negative_ratio": f"{negative / mentions:.0%}",
+            })
+        return ranking
+
+    # --- Context sections ---
+    # Each renders one titled block of LLM context as lines; context strings
+    # join the non-empty ones with a blank line between them.
+
+    def overview_section(self) -> List[str]:
         overview = self.catalog_overview()
+        return [
+            "=== KATALOG GENEL BAKIŞ ===",
+            f"Toplam ürün: {overview['total_products']}",
+            f"Toplam kategori: {overview['total_categories']}",
+            f"Puanlı ürün sayısı: {overview['products_with_ratings']}",
+            f"Yorumlu ürün sayısı: {overview['products_with_comments']}",
+            f"Ortalama puan: {overview['average_rating']}",
+            f"Trend ürün sayısı: {overview['trending_count']}",
+        ]
+
+    def category_distribution_section(self) -> List[str]:
+        lines = ["=== KATEGORİ DAĞILIMI ==="]
+        for cat, count in self.catalog_overview()["categories"].items():
+            lines.append(f"  {cat}: {count} ürün")
+        return lines
+
+    def sentiment_section(self) -> List[str]:
         sentiment = self.sentiment_analysis_summary()
-        top_commented = self.most_discussed_products(5)
-        top_engaging = self.engagement_leaders(5)
-        polarizing = self.polarizing_products(5)
-        best_value = self.best_value_products(5)
-        price_by_cat = self.price_comparison_by_category()
-
-        sections = []
-
-        # Section 1: Overview
-        sections.append("=== KATALOG GENEL BAKIŞ ===")
-        sections.append(f"Toplam ürün: {overview['total_products']}")
-        sections.append(f"Toplam kategori: {overview['total_categories']}")
-        sections.append(f"Puanlı ürün sayısı: {overview['products_with_ratings']}")
-        sections.append(f"Yorumlu ürün sayısı: {overview['products_with_comments']}")
-        sections.append(f"Ortalama puan: {overview['average_rating']}")
-        sections.append(f"Trend ürün sayısı: {overview['trending_count']}")
-        sections.append("")
-
-        # Section 2: Categories
-        sections.append("=== KATEGORİ DAĞILIMI ===")
-        for cat, count in overview["categories"].items():
-            sections.append(f"  {cat}: {count} ürün")
-        sections.append("")
-
-        # Section 3: Sentiment
-        sections.append("=== GENEL DUYGU ANALİZİ ===")
-        sections.append(f"Analiz edilen ürün: {sentiment['products_analyzed']}")
-        sections.append(f"Toplam yorum: {sentiment['total_comments']}")
-        sections.append(f"Olumlu yorumlar: {sentiment['positive_comments']} ({sentiment['positive_ratio']:.0%})")
-        sections.append(f"Olumsuz yorumlar: {sentiment['negative_comments']} ({sentiment['negative_ratio']:.0%})")
-        sections.append(f"Nötr yorumlar: {sentiment['neutral_comments']}")
-        sections.append("")
-
-        # Section 4: Most discussed
-        sections.append("=== EN ÇOK YORUM ALAN ÜRÜNLER ===")
-        for item in top_commented:
-            sections.append(f"  {item['name']} ({item['category']})")
-            sections.append(f"    Yorum: {item['comment_count']} | Olumlu: {item['positive_pct']} | Olumsuz: {item['negative_pct']}")
+        return [
+            "=== GENEL DUYGU ANALİZİ ===",
+            f"Analiz edilen ürün: {sentiment['products_analyzed']}",
+            f"Toplam yorum: {sentiment['total_comments']}",
+            f"Olumlu yorumlar: {sentiment['positive_comments']} ({sentiment['positive_ratio']:.0%})",
+            f"Olumsuz yorumlar: {sentiment['negative_comments']} ({sentiment['negative_ratio']:.0%})",
+            f"Nötr yorumlar: {sentiment['neutral_comments']}",
+        ]
+
+    def most_discussed_section(self, limit: int = 5) -> List[str]:
+        lines = ["=== EN ÇOK YORUM ALAN ÜRÜNLER ==="]
+        for item in self.most_discussed_products(limit):
+            lines.append(f"  {item['name']} ({item['category']})")
+            lines.append(f"    Yorum: {item['comment_count']} | Olumlu: {item['positive_pct']} | Olumsuz: {item['negative_pct']}")
             if item.get("top_positive"):
-                sections.append(f"    En beğenilen olumlu yorum: \"{item['top_positive']}\"")
+                lines.append(f"    En beğenilen olumlu yorum: \"{item['top_positive']}\"")
             if item.get("top_negative"):
-                sections.append(f"    En dikkat çeken olumsuz yorum: \"{item['top_negative']}\"")
-        sections.append("")
+                lines.append(f"    En dikkat çeken olumsuz yorum: \"{item['top_negative']}\"")
+        return lines
 
-        # Section 5: Engagement leaders
-        sections.append("=== EN YÜKSEK ETKİLEŞİM ALAN ÜRÜNLER ===")
-        for item in top_engaging:
-            sections.append(
+    def engagement_section(self, limit: int = 5) -> List[str]:
+        lines = ["=== EN YÜKSEK ETKİLEŞİM ALAN ÜRÜNLER ==="]
+        for item in self.engagement_leaders(limit):
+            lines.append(
                 f"  {item['name']} | Etkileşim: {item['engagement_score']} | "
                 f"Yorum: {item['comment_count']} | Favori: {item['favorites']} | Puan: {item['rating']}"
             )
-        sections.append("")
-
-        # Section 6: Polarizing
-        if polarizing:
-            sections.append("=== TARTIŞMALI / KUTUPLAŞTIRICI ÜRÜNLER ===")
-            for item in polarizing:
-                sections.append(f"  {item['name']} ({item['category']})")
-                sections.append(f"    Duygu: {item['sentiment']} | Olumlu: {item['positive_ratio']} | Olumsuz: {item['negative_ratio']}")
-            sections.append("")
-
-        # Section 7: Best value
-        sections.append("=== EN İYİ FİYAT/PERFORMANS ÜRÜNLER ===")
-        for item in best_value:
-            sections.append(f"  {item['name']} | Fiyat: {item['price']} | Puan: {item['rating']} | Değer skoru: {item['value_score']}")
-        sections.append("")
-
-        # Section 8: Price by category
-        sections.append("=== KATEGORİ BAZINDA FİYAT ARALIKLARI ===")
-        for cat, pr in price_by_cat.items():
-            sections.append(f"  {cat}: Min {pr['min']:.0f} TL | Max {pr['max']:.0f} TL | Ort {pr['avg']:.0f} TL")
-
-        # Section 9: Top rated per category
-        sections.append("")
-        sections.append("=== KATEGORİ BAZINDA EN İYİ PUANLI ÜRÜNLER ===")
-        for cat in self._catalog.categories:
-            top = self._catalog.top_rated_by_category(cat, limit=3)
-            if top:
-                sections.append(f"  [{cat}]")
-                for p in top:
-                    sections.append(f"    {p.to_summary()}")
-
-        return "\n".join(sections)
+        return lines
+
+    def polarizing_section(self, limit: int = 5) -> List[str]:
+        polarizing = self.polarizing_products(limit)
+        if not polarizing:
+            return []
+        lines = ["=== TARTIŞMALI / KUTUPLAŞTIRICI ÜRÜNLER ==="]
+        for item in polarizing:
+            lines.append(f"  {item['name']} ({item['category']})")
+            lines.append(f"    Duygu: {item['sentiment']} | Olumlu: {item['positive_ratio']} | Olumsuz: {item['negative_ratio']}")
+        return lines
+
+    def best_value_section(self, limit: int = 5) -> List[str]:
+        lines = ["=== EN İYİ FİYAT/PERFORMANS ÜRÜNLER ==="]
+        for item in self.best_value_products(limit):
+            lines.append(f"  {item['name']} | Fiyat: {item['price']} | Puan: {item['rating']} | Değer skoru: {item['value_score']}")
+        return lines
+
+    def price_ranges_section(self, categories: Sequence[str] | None = None) -> List[str]:
+        lines = ["=== KATEGORİ BAZINDA FİYAT ARALIKLARI ==="]
+        for cat, pr in self.price_comparison_by_category().items():
+            if categories is None or cat in categories:
+                lines.append(f"  {cat}: {_price_line(pr)}")
+        return lines
+
+    def top_rated_section(self, categories: Sequence[str] | None = None) -> List[str]:
+        lines = ["=== KATEGORİ BAZINDA EN İYİ PUANLI ÜRÜNLER ==="]
+        for cat, stats in self.snapshot.categories.items():
+            if stats.top_rated and (categories is None or cat in categories):
+                lines.append(f"  [{cat}]")
+                # Summaries shared with the memoized category_analysis
+                for summary in self.category_analysis(cat)["top_rated"]:
+                    lines.append(f"    {summary}")
+        return lines
+
+    def category_section(self, category: str) -> List[str]:
+        """Everything known about one category, for questions that name it."""
+        analysis = self.category_analysis(category)
+        if "error" in analysis:
+            return []
+        pr = analysis["price_range"]
+        lines = [
+            f"=== KATEGORİ ANALİZİ: {category} ===",
+            f"Ürün sayısı: {analysis['product_count']} | Puanlı: {analysis['rated_count']} | "
+            f"Yorumlu: {analysis['commented_count']}",
+            f"Ortalama puan: {analysis['average_rating']}",
+            f"Toplam yorum: {analysis['total_comments']} | Toplam favori: {analysis['total_favorites']}",
+            f"Fiyat aralığı: {_price_line(pr)}",
+            "En iyi puanlı ürünler:",
+        ]
+        lines.extend(f"  {summary}" for summary in analysis["top_rated"])
+        return lines
+
+    def rising_section(self, limit: int = 5, category: str | None = None) -> List[str]:
+        trends = self.comment_trends(limit, category)
+        if not trends:
+            return []
+        summary = self.trend_summary()
+        scope = f" ({category})" if category else ""
+        lines = [
+            f"=== YORUMLARI HIZLA ARTAN ÜRÜNLER{scope} ===",
+            f"Son {summary['window_days']} gün ({summary['window_end']} itibarıyla) ile önceki "
+            f"{summary['window_days']} gün karşılaştırıldı.",
+        ]
+        for item in trends:
+            lines.append(
+                f"  {item['name']} ({item['category']}) | Son dönem: {item['recent_comments']} yorum | "
+                f"Önceki: {item['previous_comments']} | Haftalık hız: {item['weekly_velocity']} | Puan: {item['rating']}"
+            )
+        return lines
+
+    def aspect_summary_section(self, category: str | None = None) -> List[str]:
+        summary = self.aspect_summary(category)
+        if not summary:
+            return []
+        scope = f": {category}" if category else ""
+        lines = [f"=== YORUMLARDA ÖNE ÇIKAN ÖZELLİKLER{scope} ==="]
+        for item in summary:
+            lines.append(
+                f"  {item['label']}: {item['mentions']} yorum | "
+                f"Olumlu: {item['positive_ratio']:.0%} | Olumsuz: {item['negative_ratio']:.0%}"
+            )
+        return lines
+
+    def aspect_section(self, aspect: str, category: str | None = None, limit: int = 5) -> List[str]:
+        """Products whose comments praise and criticize one aspect the most."""
+        scope = f" ({category})" if category else ""
+        lines = [f"=== YORUMLARA GÖRE {aspect_label(aspect)}{scope} ==="]
+        for order, title in (("best", "En beğenilenler"), ("worst", "En çok şikayet alanlar")):
+            ranking = [
+                item for item in self.aspect_ranking(aspect, limit, category, order)
+                if item["positive" if order == "best" else "negative"]
+            ]
+            if ranking:
+                lines.append(f"  {title}:")
+                lines.extend(
+                    f"    {item['name']} | {item['mentions']} yorum | Olumlu: {item['positive_ratio']} | "
+                    f"Olumsuz: {item['negative_ratio']} | Puan: {item['rating']}"
+                    for item in ranking
+                )
+        return lines if len(lines) > 1 else []
+
+    def product_list_section(self, title: str, products: Sequence[Product]) -> List[str]:
+        """`products` under a section title, each with its most telling comments."""
+        if not products:
+            return []
+        lines = [f"=== {title} ==="]
+        for p in products:
+            lines.append(f"  {p.to_summary()}")
+            insight = self._product_comment_insight(p)
+            if insight["top_positive"]:
+                lines.append(f"    En beğenilen olumlu yorum: \"{insight['top_positive']}\"")
+            if insight["top_negative"]:
+                lines.append(f"    En dikkat çeken olumsuz yorum: \"{insight['top_negative']}\"")
+        return lines
+
+    # --- Comprehensive context for LLM ---
+
+    # Section renderers of the full context, in display order
+    CONTEXT_SECTIONS = (
+        ("overview", "overview_section", ()),
+        ("category_distribution", "category_distribution_section", ()),
+        ("sentiment", "sentiment_section", ()),
+        ("most_discussed", "most_discussed_section", (5,)),
+        ("engagement", "engagement_section", (5,)),
+        ("polarizing", "polarizing_section", (5,)),
+        ("best_value", "best_value_section", (5,)),
+        ("price_ranges", "price_ranges_section", ()),
+        ("top_rated", "top_rated_section", ()),
+    )
+    # The order sections are admitted in when the context has a budget
+    CONTEXT_PRIORITY = (
+        "overview", "sentiment", "category_distribution", "most_discussed", "best_value",
+        "engagement", "price_ranges", "polarizing", "top_rated",
+    )
+
+    @memoized
+    def context_sections(self) -> Tuple[ContextSection, ...]:
+        """The full context's sections with their character costs, rendered once per catalog version."""
+        return tuple(
+            ContextSection.of(name, getattr(self, renderer)(*args))
+            for name, renderer, args in self.CONTEXT_SECTIONS
+        )
+
+    @memoized
+    def build_context(self, max_tokens: int | None = None, max_chars: int | None = None) -> ContextReport:
+        """The full context fitted to a budget by `CONTEXT_PRIORITY`, with a report of what was cut."""
+        return fit_sections(self.context_sections(), char_budget(max_tokens, max_chars), self.CONTEXT_PRIORITY)
+
+    def generate_llm_context(self, max_tokens: int | None = None) -> str:
+        """Generate a comprehensive analytical context string for the LLM.
+
+        This is the key method that compiles all insights into a structured
+        text block that the LLM can use to answer user questions intelligently.
+        With `max_tokens`, lower-priority sections are cut to fit; see `build_context`.
+        """
+        return self.build_context(max_tokens).text
+
+    @memoized
+    def generate_summary_context(self) -> str:
+        """The compact catalog summary: overview, category distribution and overall sentiment.
+
+        Fixed conversation prefix; question-specific detail is retrieved per message.
+        """
+        return join_sections([
+            self.overview_section(),
+            self.category_distribution_section(),
+            self.sentiment_section(),
+        ])
 
     # --- Private helpers ---
 
+    def _ranking(self, name: str, limit: int) -> List[Product]:
+        snap = self.snapshot
+        if limit <= snap.depth:
+            return list(getattr(snap, name)[:limit])
+        return getattr(self._catalog, name)(limit)
+
+    @staticmethod
+    def _price_range(stats: CategoryStats) -> Dict[str, float]:
+        if stats.price_range is None:
+            return {"min": 0, "max": 0, "avg": 0, "p10": 0, "p50": 0, "p90": 0}
+        low, high, avg = stats.price_range
+        p10, p50, p90 = (round(q, 2) for q in stats.price_quantiles)
+        return {"min": low, "max": high, "avg": avg, "p10": p10, "p50": p50, "p90": p90}
+
     def _product_comment_insight(self, product: Product) -> Dict[str, Any]:
         """Generate comment-level insight for a single product."""
         sentiment = product.comment_sentiment_ratio
         top_positive = ""
         top_negative = ""
 
-        if product.positive_comments:
-            # Pick the longest positive comment as most informative
-            best = max(product.positive_comments, key=lambda c: len(c.text))
+        # The longest comments are the most informative
+        best = product.longest_positive_comment
+        if best is not None:
             top_positive = best.text[:150]
 
-        if product.negative_comments:
-            best = max(product.negative_comments, key=lambda c: len(c.text))
+        best = product.longest_negative_comment
+        if best is not None:
             top_negative = best.text[:150]
 
         return {
@@ -284,3 +619,10 @@ class ProductAnalyzer:
             "top_positive": top_positive,
             "top_negative": top_negative,
         }
+
+
+def _price_line(pr: Dict[str, float]) -> str:
+    return (
+        f"Min {pr['min']:.0f} TL | Max {pr['max']:.0f} TL | Ort {pr['avg']:.0f} TL | "
+        f"Medyan ~{pr['p50']:.0f} TL (%10: {pr['p10']:.0f} TL, %90: {pr['p90']:.0f} TL)"
+    )
@@ -0,0 +1,26 @@
+"""Text normalizer - Turkish-aware case and accent folding shared by the search indexes."""
+
+from __future__ import annotations
+import re
+import unicodedata
+from typing import List
+
+# str.lower() maps "I" to "i" and "İ" to "i̇" (i + combining dot); Turkish wants "ı" and "i"
+_TURKISH_CASE = str.maketrans({"I": "ı", "İ": "i"})
+# Turkish letters folded to their ASCII base so "kalıcı", "KALICI" and "kalici" meet
+_TURKISH_ACCENTS = str.maketrans("ıçğöşüâîû", "icgosuaiu")
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Turkish-casefold `text` and strip accents: 'IŞILTILI Ürün' -> 'isiltili urun'."""
+    text = text.translate(_TURKISH_CASE).lower().translate(_TURKISH_ACCENTS)
+    if not text.isascii():
+        # Remaining accented letters (é, ñ...): decompose and drop the combining marks
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text
+
+
+def tokenize(text: str) -> List[str]:
+    """Folded word tokens of `text`."""
+    return _TOKEN.findall(fold(text))
@@ -1,6 +1,8 @@
 from .rating import Rating
 from .price import Price
 from .comment import Comment
+from .comment_stats import CommentStats
+from .lazy_comments import LazyComments
 from .star_distribution import StarDistribution
 
-__all__ = ["Rating", "Price", "Comment", "StarDistribution"]
+__all__ = ["Rating", "Price", "Comment", "CommentStats", "LazyComments", "StarDistribution"]
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
+import sys
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Comment:
-    """Immutable value object representing a single user comment."""
+    """Immutable value object representing a single user comment.
+
+    Slotted, with `user_name` and `date` interned: both repeat heavily across
+    a catalog (masked names like "A** B**", shared dates).
+    """
 
     user_name: str
     rate: int
@@ -18,10 +23,10 @@ class Comment:
     @classmethod
     def from_dict(cls, data: dict) -> Comment:
         return cls(
-            user_name=data.get("userFullName", "Anonim"),
+            user_name=_intern(data.get("userFullName", "Anonim")),
             rate=int(data.get("rate", 0)),
             text=data.get("comment", ""),
-            date=data.get("date", ""),
+            date=_intern(data.get("date", "")),
             is_trusted=data.get("is_trusted", False),
             likes=int(data.get("likes", 0)),
         )
@@ -40,3 +45,7 @@ class Comment:
 
     def __str__(self) -> str:
         return f"[{self.rate}/5] {self.text[:80]}..." if len(self.text) > 80 else f"[{self.rate}/5] {self.text}"
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
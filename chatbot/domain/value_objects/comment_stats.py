@@ -0,0 +1,51 @@
+"""CommentStats value object - per-product comment aggregates computed in a single pass."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CommentStats:
+    """Sentiment counts, like totals and the positions of notable comments.
+
+    Positions index into the product's comment sequence (-1 when there is no
+    such comment). Ties go to the earliest comment, as with `max()`.
+    """
+
+    count: int = 0
+    positive: int = 0
+    negative: int = 0
+    neutral: int = 0
+    total_likes: int = 0
+    longest_positive: int = -1
+    longest_negative: int = -1
+    most_liked: int = -1
+
+    @classmethod
+    def collect(cls, comments: Iterable[Tuple[int, int, int]]) -> CommentStats:
+        """Stats of `(rate, likes, text length)` triples given in comment order."""
+        count = positive = negative = neutral = total_likes = 0
+        longest_positive = longest_negative = most_liked = -1
+        positive_length = negative_length = top_likes = -1
+        for i, (rate, likes, length) in enumerate(comments):
+            count += 1
+            total_likes += likes
+            if likes > top_likes:
+                top_likes, most_liked = likes, i
+            if rate >= 4:
+                positive += 1
+                if length > positive_length:
+                    positive_length, longest_positive = length, i
+            elif rate <= 2:
+                negative += 1
+                if length > negative_length:
+                    negative_length, longest_negative = length, i
+            elif rate == 3:
+                neutral += 1
+        if count == 0:
+            return EMPTY_STATS
+        return cls(count, positive, negative, neutral, total_likes, longest_positive, longest_negative, most_liked)
+
+
+EMPTY_STATS = CommentStats()
@@ -0,0 +1,236 @@
+"""LazyComments value object - comment sequence that defers building Comment objects."""
+
+from __future__ import annotations
+import json
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from chatbot.domain.date_parser import parse_date_value
+from chatbot.domain.value_objects.comment import Comment
+from chatbot.domain.value_objects.comment_stats import CommentStats, EMPTY_STATS
+
+
+class LazyComments(Sequence[Comment]):
+    """Immutable sequence of comments backed by the raw JSON export.
+
+    The JSON array is kept as UTF-8 bytes and only turned into `Comment`
+    objects the first time comment-level data is read. `from_json` parses
+    the export once and takes everything the catalog needs up front from
+    that pass: the sentiment counts (so `len()`, `has_comments` and the
+    sentiment ratios never trigger decoding), the rest of `stats` (likes,
+    longest and most-liked comments) and the comment dates, packed as int32
+    day numbers (see `days`). Afterwards only comment text is read from the
+    export again, on demand, and decoded comments are reused once built.
+    """
+
+    __slots__ = ("_raw", "_items", "_count", "_positive", "_negative", "_neutral", "_stats", "_groups", "_days")
+
+    def __init__(
+        self,
+        raw: bytes | None = None,
+        count: int = 0,
+        positive: int = 0,
+        negative: int = 0,
+        neutral: int = 0,
+        items: Tuple[Comment, ...] | None = None,
+        stats: CommentStats | None = None,
+        days: bytes | None = None,
+    ) -> None:
+        self._raw = raw
+        self._items = items
+        self._count = count
+        self._positive = positive
+        self._negative = negative
+        self._neutral = neutral
+        self._stats = stats
+        self._groups: Tuple[Tuple[Comment, ...], ...] | None = None
+        self._days = days
+
+    @classmethod
+    def from_json(cls, raw: str) -> LazyComments:
+        """Build from the CSV `comments` field, computing `stats` without creating Comment objects."""
+        if not raw or raw.strip() in ("", "[]"):
+            return cls()
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, list):
+                return cls()
+            data = [c for c in data if isinstance(c, dict)]
+            # Same conversions as Comment.from_dict, so a later decode cannot fail
+            stats = CommentStats.collect(
+                (int(c.get("rate", 0)), int(c.get("likes", 0)), _length(c.get("comment", ""))) for c in data
+            )
+        except (json.JSONDecodeError, TypeError):
+            return cls()
+        if stats.count == 0:
+            return cls()
+        days = _pack(c.get("date", "") for c in data)
+        return cls(
+            raw.encode("utf-8"), stats.count, stats.positive, stats.negative, stats.neutral, stats=stats, days=days
+        )
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Comment]) -> LazyComments:
+        """Wrap already-built Comment objects."""
+        items = tuple(comments)
+        stats = _collect(items)
+        days = _pack(c.date for c in items)
+        return cls(None, stats.count, stats.positive, stats.negative, stats.neutral, items, stats, days)
+
+    # --- Eager aggregates ---
+
+    @property
+    def positive_count(self) -> int:
+        return self._positive
+
+    @property
+    def negative_count(self) -> int:
+        return self._negative
+
+    @property
+    def neutral_count(self) -> int:
+        return self._neutral
+
+    @property
+    def stats(self) -> CommentStats:
+        """Comment aggregates; decodes the comments only if the container was built without them."""
+        stats = self._stats
+        if stats is None:
+            stats = self._stats = _collect(self._materialize())
+        return stats
+
+    @property
+    def positive(self) -> Tuple[Comment, ...]:
+        return self._sentiment_groups()[0]
+
+    @property
+    def negative(self) -> Tuple[Comment, ...]:
+        return self._sentiment_groups()[1]
+
+    @property
+    def neutral(self) -> Tuple[Comment, ...]:
+        return self._sentiment_groups()[2]
+
+    def at(self, index: int) -> Optional[Comment]:
+        """The comment at a `stats` position, or None for -1."""
+        return self._materialize()[index] if index >= 0 else None
+
+    @property
+    def days(self) -> np.ndarray:
+        """Day number (since 1970-01-01) of each comment's date, NO_DATE where unreadable; read-only."""
+        days = self._days
+        if days is None:
+            # Only containers stored without dates (older databases) get here
+            if self._items is not None or self._raw is None:
+                days = _pack(c.date for c in self._materialize())
+            else:
+                days = _pack(c.get("date", "") for c in self._records())
+            self._days = days
+        return np.frombuffer(days, dtype=np.int32)
+
+    def texts_and_rates(self) -> Tuple[List[str], List[int]]:
+        """Comment texts and star rates; reads the export without building Comment objects unless already decoded."""
+        if self._items is not None or self._raw is None:
+            items = self._materialize()
+            return [_text(c.text) for c in items], [c.rate for c in items]
+        records = self._records()
+        return [_text(c.get("comment", "")) for c in records], [int(c.get("rate", 0)) for c in records]
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._items is not None
+
+    def to_json(self) -> str:
+        """JSON array text of the comments, as read from the export when available."""
+        if self._raw is not None:
+            return self._raw.decode("utf-8")
+        return json.dumps(
+            [
+                {
+                    "userFullName": c.user_name,
+                    "rate": c.rate,
+                    "comment": c.text,
+                    "date": c.date,
+                    "is_trusted": c.is_trusted,
+                    "likes": c.likes,
+                }
+                for c in self._materialize()
+            ],
+            ensure_ascii=False,
+        )
+
+    # --- Sequence protocol ---
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator[Comment]:
+        return iter(self._materialize())
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyComments):
+            return self._materialize() == other._materialize()
+        if isinstance(other, (list, tuple)):
+            return list(self._materialize()) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        state = "decoded" if self.is_materialized else "encoded"
+        return f"LazyComments(count={self._count}, {state})"
+
+    def __reduce__(self):
+        # Pickle the compact raw form; decoded comments are rebuilt on demand
+        items = None if self._raw is not None else self._items
+        return (
+            LazyComments,
+            (self._raw, self._count, self._positive, self._negative, self._neutral, items, self._stats, self._days),
+        )
+
+    def _materialize(self) -> Tuple[Comment, ...]:
+        items = self._items
+        if items is None:
+            items = self._decode() if self._raw is not None else ()
+            self._items = items
+        return items
+
+    def _decode(self) -> Tuple[Comment, ...]:
+        return tuple(Comment.from_dict(c) for c in self._records())
+
+    def _records(self) -> List[dict]:
+        # The single place the stored export is parsed after loading
+        return [c for c in json.loads(self._raw) if isinstance(c, dict)]
+
+    def _sentiment_groups(self) -> Tuple[Tuple[Comment, ...], ...]:
+        groups = self._groups
+        if groups is None:
+            items = self._materialize()
+            groups = self._groups = (
+                tuple(c for c in items if c.is_positive),
+                tuple(c for c in items if c.is_negative),
+                tuple(c for c in items if c.is_neutral),
+            )
+        return groups
+
+
+def _length(text) -> int:
+    return len(text) if isinstance(text, str) else 0
+
+
+def _text(text) -> str:
+    return text if isinstance(text, str) else ""
+
+
+def _pack(dates: Iterable) -> bytes:
+    return array("i", map(parse_date_value, dates)).tobytes()
+
+
+def _collect(items: Tuple[Comment, ...]) -> CommentStats:
+    return CommentStats.collect((c.rate, c.likes, _length(c.text)) for c in items) if items else EMPTY_STATS
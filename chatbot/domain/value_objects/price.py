@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Dict, List, Sequence
+import math
 import re
+import sys
 
+_TL_SUFFIX = re.compile(r"\s*TL\s*$", re.IGNORECASE)
+# Same suffix rule applied to every line of a newline-joined column at once
+_TL_SUFFIX_LINES = re.compile(r"[^\S\n]*TL$", re.IGNORECASE | re.MULTILINE)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Price:
     """Immutable value object representing a Turkish Lira price."""
 
@@ -20,7 +27,7 @@ class Price:
 
         cleaned = raw.strip()
         # Remove 'TL' suffix and whitespace
-        cleaned = re.sub(r"\s*TL\s*$", "", cleaned, flags=re.IGNORECASE).strip()
+        cleaned = _TL_SUFFIX.sub("", cleaned).strip()
         # Turkish format: dots as thousands separator, comma as decimal
         cleaned = cleaned.replace(".", "").replace(",", ".")
 
@@ -29,11 +36,45 @@ class Price:
         except ValueError:
             amount = 0.0
 
-        return cls(raw=raw.strip(), amount=amount)
+        # Price strings repeat a lot across a catalog ("199,99 TL"), so share them
+        return cls(raw=sys.intern(raw.strip()), amount=amount)
+
+    @classmethod
+    def from_turkish_column(cls, raws: Sequence[str]) -> List[Price]:
+        """Parse a whole column of Turkish-format prices; same results as `from_turkish_format` per value.
+
+        Each distinct string is parsed once and rows sharing it share the Price
+        object. The distinct strings are cleaned as one newline-joined text, so
+        the suffix regex and the separator replacements run once per column.
+        """
+        distinct = list(dict.fromkeys(raws))
+        stripped = [(raw or "").strip() for raw in distinct]
+        text = "\n".join(stripped)
+        if text.count("\n") != len(stripped) - 1:
+            # A value with an embedded newline would break the line split
+            parsed = [cls.from_turkish_format(raw) for raw in distinct]
+        else:
+            cleaned = _TL_SUFFIX_LINES.sub("", text).replace(".", "").replace(",", ".").split("\n")
+            try:
+                amounts = list(map(float, [c or "0" for c in cleaned]))
+            except ValueError:
+                amounts = [cls._to_amount(c) for c in cleaned]
+            parsed = [cls(raw=sys.intern(raw), amount=amount) for raw, amount in zip(stripped, amounts)]
+
+        by_raw: Dict[str, Price] = dict(zip(distinct, parsed))
+        return [by_raw[raw] for raw in raws]
+
+    @staticmethod
+    def _to_amount(cleaned: str) -> float:
+        try:
+            return float(cleaned)
+        except ValueError:
+            return 0.0
 
     @property
     def is_valid(self) -> bool:
-        return self.amount > 0
+        # "inf" / "nan" in an export parse as floats but are no price
+        return math.isfinite(self.amount) and self.amount > 0
 
     def __str__(self) -> str:
         return self.raw if self.raw else "Fiyat belirtilmemiş"
@@ -4,7 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StarDistribution:
     """Immutable value object representing star rating distribution."""
 
@@ -52,6 +52,11 @@ class StarDistribution:
             return 0.0
         return (self.star_0 + self.star_1 + self.star_2) / self.total
 
+    @property
+    def polarization_score(self) -> float:
+        """How evenly ratings split between positive and negative: 1.0 at 50/50, 0.0 if one side is empty."""
+        return 4 * self.positive_ratio * self.negative_ratio
+
     @property
     def is_polarizing(self) -> bool:
         """Product is polarizing if both high and low ratings are significant."""
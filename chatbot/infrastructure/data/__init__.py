@@ -1,3 +1,14 @@
 from .csv_product_repository import CsvProductRepository
+from .sqlite_product_repository import SqliteProductRepository
+from .catalog_snapshot import CatalogSnapshotStore
+from .csv_sources import default_csv_path, resolve_csv_sources
+from .repository_factory import create_repository
 
-__all__ = ["CsvProductRepository"]
+__all__ = [
+    "CsvProductRepository",
+    "SqliteProductRepository",
+    "CatalogSnapshotStore",
+    "default_csv_path",
+    "resolve_csv_sources",
+    "create_repository",
+]
@@ -0,0 +1,165 @@
+"""Catalog Snapshot Store - persists a parsed ProductCatalog so startup can skip CSV parsing."""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Sequence
+
+from chatbot.domain.entities.product_catalog import ProductCatalog
+
+
+# Bump whenever the pickled domain layout changes so old snapshots are rebuilt.
+SNAPSHOT_FORMAT_VERSION = 17
+
+_MAGIC = b"BBSNAP"
+_HEADER_LEN = struct.Struct("<I")
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Identity of a CSV source file: path, size, modification time and content hash."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: Path) -> SourceFingerprint:
+        stat = path.stat()
+        return cls(
+            path=str(path.resolve()),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=_file_sha256(path),
+        )
+
+    def matches(self, path: Path) -> bool:
+        """Check whether the file at `path` still has this fingerprint.
+
+        Size and mtime are compared first; the content hash is only recomputed
+        when the mtime moved (e.g. the file was re-copied during a deploy).
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        if str(path.resolve()) != self.path or stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime_ns:
+            return True
+        return _file_sha256(path) == self.sha256
+
+
+class CatalogSnapshotStore:
+    """Reads and writes binary snapshots of an already-parsed ProductCatalog.
+
+    File layout: magic bytes, a length-prefixed JSON header (format version,
+    one fingerprint per source file and the SHA-256 of the payload) and the
+    pickled catalog. Snapshots are written atomically and are only unpickled
+    when the header matches the current source files, in the same order, and
+    the payload matches its digest, so a truncated or stale file is rebuilt
+    rather than loaded.
+
+    The digest guards against corruption, not tampering: unpickling runs
+    code from the file, so the snapshot path (next to the CSV or under
+    `BEAUTYBOT_SNAPSHOT_DIR`) must only be writable by the service itself.
+    """
+
+    def __init__(self, snapshot_path: Path) -> None:
+        self._snapshot_path = Path(snapshot_path)
+
+    @classmethod
+    def for_csv(cls, csv_path: Path) -> CatalogSnapshotStore:
+        """Default store for a CSV: `BEAUTYBOT_SNAPSHOT_DIR` if set, otherwise next to the CSV."""
+        csv_path = Path(csv_path)
+        snapshot_dir = os.environ.get("BEAUTYBOT_SNAPSHOT_DIR")
+        directory = Path(snapshot_dir) if snapshot_dir else csv_path.parent
+        return cls(directory / f"{csv_path.name}.snapshot")
+
+    @classmethod
+    def for_source(cls, source: str, paths: Sequence[Path]) -> CatalogSnapshotStore:
+        """Default store for a CSV source spec; directories and globs get one snapshot per spec."""
+        if len(paths) == 1 and Path(source) == paths[0]:
+            return cls.for_csv(paths[0])
+        snapshot_dir = os.environ.get("BEAUTYBOT_SNAPSHOT_DIR")
+        directory = Path(snapshot_dir) if snapshot_dir else Path(os.path.commonpath([p.parent for p in paths]))
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+        return cls(directory / f"catalog-{key}.snapshot")
+
+    @property
+    def path(self) -> Path:
+        return self._snapshot_path
+
+    def load(self, sources: Sequence[Path]) -> ProductCatalog | None:
+        """Return the stored catalog if the snapshot is valid for `sources`, else None."""
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                header = self._read_header(f)
+                if header is None or header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                    return None
+                fingerprints = [SourceFingerprint(**fp) for fp in header["sources"]]
+                if len(fingerprints) != len(sources) or not all(
+                    fp.matches(Path(path)) for fp, path in zip(fingerprints, sources)
+                ):
+                    return None
+                payload = f.read()
+                if hashlib.sha256(payload).hexdigest() != header["payload_sha256"]:
+                    return None
+                catalog = pickle.loads(payload)
+        except (OSError, EOFError, KeyError, TypeError, ValueError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return catalog if isinstance(catalog, ProductCatalog) else None
+
+    def save(self, catalog: ProductCatalog, sources: Sequence[Path]) -> None:
+        """Write a snapshot of `catalog` keyed by the current state of `sources`."""
+        payload = pickle.dumps(catalog, protocol=pickle.HIGHEST_PROTOCOL)
+        header = json.dumps({
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "sources": [asdict(SourceFingerprint.of(Path(path))) for path in sources],
+            "payload_sha256": hashlib.sha256(payload).hexdigest(),
+        }).encode("utf-8")
+
+        self._snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self._snapshot_path.parent, prefix=f".{self._snapshot_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_MAGIC)
+                f.write(_HEADER_LEN.pack(len(header)))
+                f.write(header)
+                f.write(payload)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self._snapshot_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _read_header(f) -> dict | None:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            return None
+        raw_len = f.read(_HEADER_LEN.size)
+        if len(raw_len) != _HEADER_LEN.size:
+            return None
+        (length,) = _HEADER_LEN.unpack(raw_len)
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,64 @@
+"""Column parsers - convert whole CSV columns to typed values in bulk.
+
+Each parser takes the raw cell values of one column for a chunk of rows and
+returns one parsed value per row. The common case runs through C-level
+`map(float, ...)` instead of a Python function call per cell; only columns
+containing a value the fast path rejects are re-parsed cell by cell with the
+scalar parsers, which define the exact semantics. Prices are parsed in bulk
+by `Price.from_turkish_column`.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence
+
+from chatbot.domain.entities.product import Product
+
+
+def parse_float(value: str) -> float:
+    """Scalar float parser: empty or malformed cells become 0.0."""
+    if not value or not str(value).strip():
+        return 0.0
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return 0.0
+
+
+def parse_int(value: str) -> int:
+    """Scalar int parser: accepts '12' and '12.0'; empty or malformed cells become 0."""
+    if not value or not str(value).strip():
+        return 0
+    try:
+        return int(float(str(value).strip()))
+    except ValueError:
+        return 0
+
+
+def parse_float_column(values: Sequence[Optional[str]]) -> List[float]:
+    # float() strips surrounding whitespace itself; empty cells are mapped to "0" up front
+    try:
+        return list(map(float, [v or "0" for v in values]))
+    except ValueError:
+        return [parse_float(v) for v in values]
+
+
+def parse_int_column(values: Sequence[Optional[str]]) -> List[int]:
+    try:
+        return list(map(int, map(float, [v or "0" for v in values])))
+    except ValueError:
+        return [parse_int(v) for v in values]
+
+
+def parse_favorite_columns(columns: Sequence[Sequence[Optional[str]]]) -> List[int]:
+    """Favorite count per row from its social proof columns (first match wins, else 0)."""
+    if not columns:
+        return []
+    counts: List[Optional[int]] = [None] * len(columns[0])
+    for values in columns:
+        # One substring scan over the whole column skips columns without favorite texts
+        if "favoriledi" not in "\n".join([v or "" for v in values]):
+            continue
+        for i, value in enumerate(values):
+            if counts[i] is None and value and "favoriledi" in value:
+                counts[i] = Product.favorite_count_from(value.strip())
+    return [c or 0 for c in counts]
@@ -2,52 +2,316 @@
 
 from __future__ import annotations
 import csv
-import json
+import logging
+import os
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
 
 # Increase CSV field size limit for large comment JSON fields
 csv.field_size_limit(sys.maxsize)
 
 from chatbot.domain.entities.product import Product
-from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.entities.product_catalog import CatalogDelta, ProductCatalog
 from chatbot.domain.value_objects.price import Price
 from chatbot.domain.value_objects.rating import Rating
-from chatbot.domain.value_objects.comment import Comment
+from chatbot.domain.value_objects.lazy_comments import LazyComments
 from chatbot.domain.value_objects.star_distribution import StarDistribution
+from chatbot.infrastructure.data.catalog_snapshot import CatalogSnapshotStore
+from chatbot.infrastructure.data.column_parsers import (
+    parse_favorite_columns,
+    parse_float,
+    parse_float_column,
+    parse_int,
+    parse_int_column,
+)
+from chatbot.infrastructure.data.csv_sources import resolve_csv_sources
+from chatbot.infrastructure.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoadStats:
+    """Timing report of the last CSV parse."""
+
+    rows: int
+    products: int
+    seconds: float
+    workers: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
 
 
 class CsvProductRepository:
-    """Infrastructure service that loads product data from CSV and maps to domain entities."""
+    """Infrastructure service that loads product data from CSV and maps to domain entities.
+
+    The source may be one CSV file, a directory of CSVs or a glob; multiple
+    shards are loaded concurrently in a process pool and merged in sorted path
+    order. With `workers > 1` a single large file is instead parsed in row
+    chunks across the pool, at most `2 * workers` chunks in flight. Sources
+    smaller than `PARALLEL_MIN_BYTES` always use the serial path. Either way
+    the first occurrence of a duplicate `product_id` wins.
+    """
+
+    PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+    CHUNK_ROWS = 2000
+    # Values of a delta CSV's `deleted` column that mark a row as a deletion
+    DELETE_MARKERS = frozenset({"1", "true", "yes", "evet", "delete"})
 
-    def __init__(self, csv_path: str) -> None:
-        self._csv_path = Path(csv_path)
-        if not self._csv_path.exists():
-            raise FileNotFoundError(f"CSV dosyası bulunamadı: {csv_path}")
+    def __init__(self, csv_path: str, use_snapshot: bool | None = None, workers: int | None = None) -> None:
+        self._source = str(csv_path)
+        # Fails early with FileNotFoundError when nothing matches
+        resolve_csv_sources(self._source)
+
+        if use_snapshot is None:
+            use_snapshot = os.environ.get("BEAUTYBOT_SNAPSHOT", "1") != "0"
+        self._use_snapshot = use_snapshot
+
+        if workers is None:
+            workers = env_int("BEAUTYBOT_LOAD_WORKERS", 1)
+        self._workers = max(1, workers)
+        self.last_load_stats: LoadStats | None = None
 
     def load_catalog(self) -> ProductCatalog:
-        """Load all products from CSV and return a populated ProductCatalog."""
-        products = self._load_products()
+        """Load all products and return a populated ProductCatalog.
+
+        A valid on-disk snapshot is used when available; otherwise the CSV
+        shards are parsed and the snapshot is (re)written for the next startup.
+        """
+        paths = resolve_csv_sources(self._source)
+        store = self._snapshot_store(paths) if self._use_snapshot else None
+        if store is not None:
+            catalog = store.load(paths)
+            if catalog is not None:
+                return catalog
+
+        catalog = self._parse_catalog(paths)
+        if store is not None:
+            try:
+                store.save(catalog, paths)
+            except OSError as e:
+                # A read-only deploy directory should not prevent startup
+                logger.warning("Uyarı: Katalog önbelleği yazılamadı: %s", e)
+        return catalog
+
+    @classmethod
+    def load_delta(cls, delta_path: str) -> CatalogDelta:
+        """Parse a partial export with the same columns as the full CSV.
+
+        Rows whose `deleted` column is set only need a `product_id`; every other
+        row is mapped like a full-export row and becomes an upsert.
+        """
+        path = Path(delta_path)
+        if not path.exists():
+            raise FileNotFoundError(f"CSV dosyası bulunamadı: {delta_path}")
+
+        delta = CatalogDelta()
+        with open(path, "r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                product_id = (row.get("product_id") or "").strip()
+                if not product_id:
+                    continue
+                if (row.get("deleted") or "").strip().lower() in cls.DELETE_MARKERS:
+                    delta.deletions.append(product_id)
+                    continue
+                product = cls._map_row_to_product(row)
+                if product:
+                    delta.upserts.append(product)
+        return delta
+
+    def source_signature(self) -> tuple:
+        """Paths, sizes and mtimes of the CSV shards; changes whenever an export is added or replaced."""
+        signature = []
+        for path in resolve_csv_sources(self._source):
+            stat = path.stat()
+            signature.append((str(path), stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def build_snapshot(self) -> Path:
+        """Parse the CSV shards and (re)write their snapshot unconditionally. Returns the snapshot path."""
+        paths = resolve_csv_sources(self._source)
+        store = self._snapshot_store(paths)
+        store.save(self._parse_catalog(paths), paths)
+        return store.path
+
+    def _snapshot_store(self, paths: List[Path]) -> CatalogSnapshotStore:
+        return CatalogSnapshotStore.for_source(self._source, paths)
+
+    def _parse_catalog(self, paths: List[Path]) -> ProductCatalog:
+        if len(paths) == 1:
+            products = self._load_file(paths[0])
+        else:
+            products = self._load_shards(paths)
         catalog = ProductCatalog()
         catalog.load(products)
         return catalog
 
-    def _load_products(self) -> List[Product]:
-        """Parse CSV rows into Product domain entities."""
-        products = []
+    def _load_file(self, path: Path) -> List[Product]:
+        """Parse one CSV into Product domain entities, preserving file order."""
+        workers = self._workers
+        if workers > 1 and path.stat().st_size < self.PARALLEL_MIN_BYTES:
+            workers = 1
 
-        with open(self._csv_path, "r", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                product = self._map_row_to_product(row)
-                if product:
-                    products.append(product)
+        started = time.perf_counter()
+        products, rows = self._parse_file(path, workers)
+        products, duplicates = self._dedupe(products)
 
+        stats = LoadStats(rows=rows, products=len(products), seconds=time.perf_counter() - started, workers=workers)
+        self.last_load_stats = stats
+        logger.info(
+            "%s: %d satır, %d ürün (%d yinelenen atlandı), %.2f sn (%.0f satır/sn, %d işçi)",
+            path.name, stats.rows, stats.products, duplicates, stats.seconds, stats.rows_per_second, stats.workers,
+        )
         return products
 
-    def _map_row_to_product(self, row: dict) -> Product | None:
-        """Map a single CSV row to a Product entity."""
+    def _load_shards(self, paths: List[Path]) -> List[Product]:
+        """Parse several CSV shards concurrently and merge them in path order."""
+        workers = min(len(paths), self._workers if self._workers > 1 else os.cpu_count() or 1)
+        if sum(path.stat().st_size for path in paths) < self.PARALLEL_MIN_BYTES:
+            workers = 1
+
+        started = time.perf_counter()
+        if workers == 1:
+            shards = list(map(self._load_shard, paths))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                shards = list(pool.map(self._load_shard, paths))
+
+        rows = 0
+        for path, (shard_products, shard_rows, shard_seconds) in zip(paths, shards):
+            logger.info(
+                "  %s: %d satır, %d ürün, %.2f sn", path.name, shard_rows, len(shard_products), shard_seconds
+            )
+            rows += shard_rows
+        products, duplicates = self._dedupe([p for shard_products, _, _ in shards for p in shard_products])
+
+        stats = LoadStats(rows=rows, products=len(products), seconds=time.perf_counter() - started, workers=workers)
+        self.last_load_stats = stats
+        logger.info(
+            "%d parça: %d satır, %d ürün (%d yinelenen atlandı), %.2f sn (%.0f satır/sn, %d işçi)",
+            len(paths), stats.rows, stats.products, duplicates, stats.seconds, stats.rows_per_second, stats.workers,
+        )
+        return products
+
+    @staticmethod
+    def _dedupe(products: List[Product]) -> tuple[List[Product], int]:
+        """Drop repeated `product_id`s, keeping the first occurrence; returns the products and the drop count."""
+        seen = set()
+        unique = []
+        for p in products:
+            if p.product_id not in seen:
+                seen.add(p.product_id)
+                unique.append(p)
+        return unique, len(products) - len(unique)
+
+    @classmethod
+    def _load_shard(cls, path: Path) -> tuple[List[Product], int, float]:
+        """Parse a whole shard serially. Runs in worker processes when shards load in parallel."""
+        started = time.perf_counter()
+        products, rows = cls._parse_file(path, workers=1)
+        return products, rows, time.perf_counter() - started
+
+    @classmethod
+    def _parse_file(cls, path: Path, workers: int) -> tuple[List[Product], int]:
+        products: List[Product] = []
+        rows = 0
+        with open(path, "r", encoding="utf-8-sig") as f:
+            chunks = cls._iter_chunks(csv.DictReader(f))
+            if workers == 1:
+                for chunk_products, chunk_rows in map(cls._map_rows, chunks):
+                    products.extend(chunk_products)
+                    rows += chunk_rows
+            else:
+                # A bounded window of chunks in flight, collected oldest first (file
+                # order), so only ~2 chunks per worker of raw rows are held at once
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    pending = deque()
+                    for chunk in chunks:
+                        pending.append(pool.submit(cls._map_rows, chunk))
+                        if len(pending) < 2 * workers:
+                            continue
+                        chunk_products, chunk_rows = pending.popleft().result()
+                        products.extend(chunk_products)
+                        rows += chunk_rows
+                    for future in pending:
+                        chunk_products, chunk_rows = future.result()
+                        products.extend(chunk_products)
+                        rows += chunk_rows
+        return products, rows
+
+    @classmethod
+    def _iter_chunks(cls, reader: csv.DictReader) -> Iterator[List[dict]]:
+        while True:
+            chunk = list(islice(reader, cls.CHUNK_ROWS))
+            if not chunk:
+                return
+            yield chunk
+
+    @classmethod
+    def _map_rows(cls, rows: List[dict]) -> tuple[List[Product], int]:
+        """Map a chunk of CSV rows to products. Runs in worker processes in parallel mode.
+
+        Numeric fields are parsed column by column first; if that stage hits
+        anything unexpected the chunk goes through the row-at-a-time path.
+        """
+        try:
+            parsed = cls._parse_columns(rows)
+        except Exception:
+            parsed = [None] * len(rows)
+
+        products = []
+        for row, fields in zip(rows, parsed):
+            product = cls._map_row_to_product(row, fields)
+            if product:
+                products.append(product)
+        return products, len(rows)
+
+    @classmethod
+    def _parse_columns(cls, rows: List[dict]) -> List[tuple]:
+        """Bulk-parse the numeric fields of a chunk into per-row (price, rating, stars, totals...) tuples."""
+        if not rows:
+            return []
+        header = rows[0]
+
+        def column(*keys: str) -> List[str]:
+            # Every row of a chunk shares the CSV header, so the key is resolved once
+            for key in keys:
+                if key in header:
+                    return list(map(itemgetter(key), rows))
+            return [""] * len(rows)
+
+        ratings = map(
+            Rating.create,
+            parse_float_column(column("rating_score", "rating")),
+            parse_int_column(column("total_rating_count", "rating_count")),
+            parse_float_column(column("average_rating")),
+        )
+        stars = map(StarDistribution.create, *(parse_int_column(column(f"star_{i}_count")) for i in range(6)))
+        return list(zip(
+            Price.from_turkish_column(column("price")),
+            ratings,
+            stars,
+            parse_int_column(column("total_comment_count")),
+            parse_int_column(column("total_questions")),
+            parse_favorite_columns([column(f"social_proof_{i}") for i in range(1, 5)]),
+        ))
+
+    @classmethod
+    def _map_row_to_product(cls, row: dict, fields: tuple | None = None) -> Product | None:
+        """Map a single CSV row to a Product entity.
+
+        `fields` carries the row's numeric fields when `_parse_columns` already
+        parsed them; without it every field is parsed from the row here.
+        """
         try:
             product_id = row.get("product_id", "").strip()
             name = row.get("name", "").strip()
@@ -55,28 +319,35 @@ class CsvProductRepository:
             if not product_id or not name:
                 return None
 
-            # Parse price
-            price = Price.from_turkish_format(row.get("price", ""))
+            if fields is not None:
+                price, rating, star_dist, total_comment_count, total_questions, favorite_count = fields
+            else:
+                # Parse price
+                price = Price.from_turkish_format(row.get("price", ""))
 
-            # Parse rating
-            rating = Rating.create(
-                score=self._safe_float(row.get("rating_score", row.get("rating", ""))),
-                count=self._safe_int(row.get("total_rating_count", row.get("rating_count", ""))),
-                average=self._safe_float(row.get("average_rating", "")),
-            )
+                # Parse rating
+                rating = Rating.create(
+                    score=cls._safe_float(row.get("rating_score", row.get("rating", ""))),
+                    count=cls._safe_int(row.get("total_rating_count", row.get("rating_count", ""))),
+                    average=cls._safe_float(row.get("average_rating", "")),
+                )
 
-            # Parse star distribution
-            star_dist = StarDistribution.create(
-                star_0=self._safe_int(row.get("star_0_count", "")),
-                star_1=self._safe_int(row.get("star_1_count", "")),
-                star_2=self._safe_int(row.get("star_2_count", "")),
-                star_3=self._safe_int(row.get("star_3_count", "")),
-                star_4=self._safe_int(row.get("star_4_count", "")),
-                star_5=self._safe_int(row.get("star_5_count", "")),
-            )
+                # Parse star distribution
+                star_dist = StarDistribution.create(
+                    star_0=cls._safe_int(row.get("star_0_count", "")),
+                    star_1=cls._safe_int(row.get("star_1_count", "")),
+                    star_2=cls._safe_int(row.get("star_2_count", "")),
+                    star_3=cls._safe_int(row.get("star_3_count", "")),
+                    star_4=cls._safe_int(row.get("star_4_count", "")),
+                    star_5=cls._safe_int(row.get("star_5_count", "")),
+                )
+                total_comment_count = cls._safe_int(row.get("total_comment_count", ""))
+                total_questions = cls._safe_int(row.get("total_questions", ""))
+                # Filled in from the social proofs by ProductCatalog.load
+                favorite_count = 0
 
             # Parse comments
-            comments = self._parse_comments(row.get("comments", ""))
+            comments = cls._parse_comments(row.get("comments", ""))
 
             # Parse social proofs
             social_proofs = [
@@ -89,49 +360,28 @@ class CsvProductRepository:
                 product_id=product_id,
                 name=name,
                 url=row.get("url", "").strip(),
-                subcategory=row.get("subcategory", "").strip(),
+                subcategory=sys.intern(row.get("subcategory", "").strip()),
                 description=row.get("description", "").strip(),
                 price=price,
                 rating=rating,
                 star_distribution=star_dist,
                 comments=comments,
                 social_proofs=social_proofs,
-                color=row.get("Renk", "").strip() or None,
-                origin=row.get("Menşei", "").strip() or None,
-                total_comment_count=self._safe_int(row.get("total_comment_count", "")),
-                total_questions=self._safe_int(row.get("total_questions", "")),
+                color=sys.intern(row.get("Renk", "").strip()) or None,
+                origin=sys.intern(row.get("Menşei", "").strip()) or None,
+                total_comment_count=total_comment_count,
+                total_questions=total_questions,
+                favorite_count=favorite_count,
             )
         except Exception as e:
             # Skip malformed rows silently
             print(f"Uyarı: Satır işlenirken hata: {e}")
             return None
 
-    def _parse_comments(self, raw: str) -> List[Comment]:
-        """Parse JSON comment array from CSV field."""
-        if not raw or raw.strip() in ("", "[]"):
-            return []
-        try:
-            data = json.loads(raw)
-            if isinstance(data, list):
-                return [Comment.from_dict(c) for c in data if isinstance(c, dict)]
-        except (json.JSONDecodeError, TypeError):
-            pass
-        return []
-
     @staticmethod
-    def _safe_float(value: str) -> float:
-        if not value or not str(value).strip():
-            return 0.0
-        try:
-            return float(str(value).strip())
-        except ValueError:
-            return 0.0
+    def _parse_comments(raw: str) -> LazyComments:
+        """Wrap the JSON comment array from the CSV field; comments are decoded on first use."""
+        return LazyComments.from_json(raw)
 
-    @staticmethod
-    def _safe_int(value: str) -> int:
-        if not value or not str(value).strip():
-            return 0
-        try:
-            return int(float(str(value).strip()))
-        except ValueError:
-            return 0
+    _safe_float = staticmethod(parse_float)
+    _safe_int = staticmethod(parse_int)
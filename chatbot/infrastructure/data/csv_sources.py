@@ -0,0 +1,39 @@
+"""CSV source resolution - turns `BEAUTYBOT_CSV_PATH` into the list of CSV shards to load."""
+
+from __future__ import annotations
+import glob
+import os
+from pathlib import Path
+from typing import List
+
+DEFAULT_CSV_NAME = "all_categories_20250207_031918.csv"
+
+
+def default_csv_path() -> str:
+    """CSV source from `BEAUTYBOT_CSV_PATH`, falling back to the export in the project root."""
+    csv_path = os.environ.get("BEAUTYBOT_CSV_PATH")
+    if not csv_path:
+        # Default: look for CSV in project root
+        project_root = Path(__file__).resolve().parents[3]
+        csv_path = str(project_root / DEFAULT_CSV_NAME)
+    return csv_path
+
+
+def resolve_csv_sources(source: str) -> List[Path]:
+    """Expand a CSV source into shard paths, sorted so load order is deterministic.
+
+    `source` may be a single CSV file, a directory (every `*.csv` in it) or a
+    glob pattern such as `exports/*_2025*.csv`.
+    """
+    if glob.has_magic(source):
+        paths = [Path(p) for p in glob.glob(source) if os.path.isfile(p)]
+    elif os.path.isdir(source):
+        paths = [p for p in Path(source).glob("*.csv") if p.is_file()]
+    elif os.path.exists(source):
+        paths = [Path(source)]
+    else:
+        paths = []
+
+    if not paths:
+        raise FileNotFoundError(f"CSV dosyası bulunamadı: {source}")
+    return sorted(paths)
@@ -0,0 +1,14 @@
+"""Repository selection - picks the product repository implementation for a data source."""
+
+from __future__ import annotations
+from pathlib import Path
+
+from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+from chatbot.infrastructure.data.sqlite_product_repository import SQLITE_SUFFIXES, SqliteProductRepository
+
+
+def create_repository(source: str):
+    """SQLite repository for `.db`/`.sqlite`/`.sqlite3` files, CSV repository otherwise."""
+    if Path(source).suffix.lower() in SQLITE_SUFFIXES:
+        return SqliteProductRepository(source)
+    return CsvProductRepository(source)
@@ -0,0 +1,240 @@
+"""SQLite Product Repository - stores the catalog in an indexed local SQLite file."""
+
+from __future__ import annotations
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.entities.product_catalog import CatalogDelta, ProductCatalog
+from chatbot.domain.text_normalizer import fold
+from chatbot.domain.value_objects.price import Price
+from chatbot.domain.value_objects.rating import Rating
+from chatbot.domain.value_objects.lazy_comments import LazyComments
+from chatbot.domain.value_objects.star_distribution import StarDistribution
+from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    row_id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    description TEXT NOT NULL,
+    price_raw TEXT NOT NULL,
+    price REAL NOT NULL,
+    rating_score REAL NOT NULL,
+    rating_count INTEGER NOT NULL,
+    rating_average REAL NOT NULL,
+    star_0 INTEGER NOT NULL,
+    star_1 INTEGER NOT NULL,
+    star_2 INTEGER NOT NULL,
+    star_3 INTEGER NOT NULL,
+    star_4 INTEGER NOT NULL,
+    star_5 INTEGER NOT NULL,
+    comments_json TEXT,
+    loaded_comments INTEGER NOT NULL,
+    positive_comments INTEGER NOT NULL,
+    negative_comments INTEGER NOT NULL,
+    neutral_comments INTEGER NOT NULL,
+    comment_count INTEGER NOT NULL,
+    social_proofs TEXT NOT NULL,
+    color TEXT,
+    origin TEXT,
+    total_comment_count INTEGER NOT NULL,
+    total_questions INTEGER NOT NULL,
+    favorite_count INTEGER NOT NULL,
+    comment_days BLOB
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name, description, comments,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_COLUMNS = (
+    "row_id, product_id, name, url, subcategory, description, price_raw, price, "
+    "rating_score, rating_count, rating_average, star_0, star_1, star_2, star_3, star_4, star_5, "
+    "comments_json, loaded_comments, positive_comments, negative_comments, neutral_comments, "
+    "comment_count, social_proofs, color, origin, total_comment_count, total_questions, favorite_count, "
+    "comment_days"
+)
+# Packed comment dates (`LazyComments.days`); databases imported before the column read NULL
+# and parse the dates from the comments on first use
+_OPTIONAL_COLUMNS = ("comment_days",)
+_PLACEHOLDERS = ", ".join("?" * len(_COLUMNS.split(", ")))
+# `PRAGMA user_version` of databases whose full-text columns hold `fold()`ed text; the
+# tokenizer's diacritic removal alone leaves "ı" and "İ" apart from "i"
+_FOLDED_FTS_VERSION = 1
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+class SqliteProductRepository:
+    """Infrastructure service that loads products from a local SQLite database.
+
+    `load_catalog` rebuilds the same ProductCatalog the CSV repository would
+    (row order is the import order), so every query but keyword search is
+    answered in memory by the catalog's own indexes. What the database adds
+    is an FTS5 index over name, description and comment text, which keyword
+    search is pushed down to until a delta changes the in-memory catalog.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self._db_path = Path(db_path)
+        if not self._db_path.exists():
+            raise FileNotFoundError(f"SQLite veritabanı bulunamadı: {db_path}")
+        self._select_list: str | None = None
+        self._folded_fts: bool | None = None
+
+    @classmethod
+    def import_from_csv(cls, csv_path: str, db_path: str) -> int:
+        """Create (or replace) the database from a CSV source. Returns the number of products."""
+        catalog = CsvProductRepository(csv_path, use_snapshot=False).load_catalog()
+        db_path = Path(db_path)
+        tmp_path = db_path.with_name(db_path.name + ".tmp")
+        tmp_path.unlink(missing_ok=True)
+
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {_FOLDED_FTS_VERSION}")
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO products ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                    (cls._product_to_row(row_id, p) for row_id, p in enumerate(catalog.products)),
+                )
+                conn.executemany(
+                    "INSERT INTO products_fts (rowid, name, description, comments) VALUES (?, ?, ?, ?)",
+                    (
+                        (row_id, fold(p.name), fold(p.description), fold(cls._comment_text(p.comments)))
+                        for row_id, p in enumerate(catalog.products)
+                    ),
+                )
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        tmp_path.replace(db_path)
+        return catalog.total_products
+
+    # --- Repository interface ---
+
+    def load_catalog(self) -> ProductCatalog:
+        """Load every product, in import order, into a ProductCatalog."""
+        # The file may have been re-imported since the last load
+        self._select_list = self._folded_fts = None
+        catalog = ProductCatalog()
+        catalog.load(self._select("ORDER BY row_id"))
+        return catalog
+
+    def load_delta(self, delta_path: str) -> CatalogDelta:
+        """Parse a partial CSV export (same format as the CSV repository)."""
+        return CsvProductRepository.load_delta(delta_path)
+
+    def source_signature(self) -> tuple:
+        stat = self._db_path.stat()
+        return ((str(self._db_path), stat.st_size, stat.st_mtime_ns),)
+
+    # --- Pushed-down queries ---
+
+    def search(self, keyword: str, limit: int = 10) -> List[Product]:
+        """Full-text search over name, description and comments, best BM25 match first."""
+        terms = [t for t in keyword.split() if t]
+        if not terms:
+            return []
+        if self._has_folded_fts():
+            terms = [fold(t) for t in terms]
+        # Quote every term so user input cannot inject FTS5 query syntax
+        query = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        return self._select(
+            "JOIN (SELECT rowid AS hit, bm25(products_fts) AS rank FROM products_fts "
+            "WHERE products_fts MATCH ?) ON hit = row_id ORDER BY rank, row_id LIMIT ?",
+            (query, limit),
+        )
+
+    # --- Private helpers ---
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)
+
+    def _has_folded_fts(self) -> bool:
+        # Databases imported before folding keep matching the raw terms until re-imported
+        if self._folded_fts is None:
+            conn = self._connect()
+            try:
+                self._folded_fts = conn.execute("PRAGMA user_version").fetchone()[0] >= _FOLDED_FTS_VERSION
+            finally:
+                conn.close()
+        return self._folded_fts
+
+    def _select(self, clause: str, params: Iterable = ()) -> List[Product]:
+        conn = self._connect()
+        try:
+            if self._select_list is None:
+                present = {row[1] for row in conn.execute("PRAGMA table_info(products)")}
+                self._select_list = ", ".join(
+                    name if name in present or name not in _OPTIONAL_COLUMNS else "NULL"
+                    for name in _COLUMNS.split(", ")
+                )
+            rows = conn.execute(f"SELECT {self._select_list} FROM products {clause}", tuple(params)).fetchall()
+        finally:
+            conn.close()
+        return [self._row_to_product(row) for row in rows]
+
+    @staticmethod
+    def _product_to_row(row_id: int, p: Product) -> tuple:
+        sd = p.star_distribution
+        comments = p.comments
+        return (
+            row_id, p.product_id, p.name, p.url, p.subcategory, p.description,
+            p.price.raw, p.price.amount,
+            p.rating.score, p.rating.count, p.rating.average,
+            sd.star_0, sd.star_1, sd.star_2, sd.star_3, sd.star_4, sd.star_5,
+            comments.to_json() if comments else None, len(comments),
+            comments.positive_count, comments.negative_count, comments.neutral_count,
+            p.comment_count, json.dumps(p.social_proofs, ensure_ascii=False),
+            p.color, p.origin, p.total_comment_count, p.total_questions, p.favorite_count,
+            comments.days.tobytes() if comments else None,
+        )
+
+    @staticmethod
+    def _row_to_product(row: tuple) -> Product:
+        (
+            _row_id, product_id, name, url, subcategory, description, price_raw, price,
+            rating_score, rating_count, rating_average, s0, s1, s2, s3, s4, s5,
+            comments_json, loaded_comments, positive, negative, neutral,
+            _comment_count, social_proofs, color, origin, total_comment_count, total_questions, favorite_count,
+            comment_days,
+        ) = row
+        comments = (
+            LazyComments(comments_json.encode("utf-8"), loaded_comments, positive, negative, neutral, days=comment_days)
+            if comments_json
+            else LazyComments()
+        )
+        return Product(
+            product_id=product_id,
+            name=name,
+            url=url,
+            subcategory=subcategory,
+            description=description,
+            price=Price(raw=price_raw, amount=price),
+            rating=Rating(score=rating_score, count=rating_count, average=rating_average),
+            star_distribution=StarDistribution(s0, s1, s2, s3, s4, s5),
+            comments=comments,
+            social_proofs=json.loads(social_proofs),
+            color=color,
+            origin=origin,
+            total_comment_count=total_comment_count,
+            total_questions=total_questions,
+            favorite_count=favorite_count,
+        )
+
+    @staticmethod
+    def _comment_text(comments: LazyComments) -> str:
+        if not comments:
+            return ""
+        data = json.loads(comments.to_json())
+        return "\n".join(str(c.get("comment", "")) for c in data if isinstance(c, dict))
@@ -1,3 +1,3 @@
-from .gemini_client import GeminiClient
+from .gemini_client import Conversation, GeminiClient
 
-__all__ = ["GeminiClient"]
+__all__ = ["Conversation", "GeminiClient"]
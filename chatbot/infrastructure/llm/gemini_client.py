@@ -1,16 +1,53 @@
 """Gemini LLM Client - infrastructure service for interacting with Google Gemini API."""
 
 from __future__ import annotations
-from typing import Generator
+import threading
+from typing import Generator, List
 
 from google import genai
 from google.genai import types
 
 
+class Conversation:
+    """History of one chat: the context prefix it started with and its turns.
+
+    The prefix is the client's shared list, never copied, so any number of
+    conversations cost only their own turns (`size`, in UTF-8 bytes of text).
+    A question and its answer are recorded together under a lock, so
+    concurrent requests on one conversation never interleave their turns.
+    """
+
+    __slots__ = ("context", "turns", "size", "_lock")
+
+    def __init__(self, context: List[types.Content]) -> None:
+        self.context = context
+        self.turns: List[types.Content] = []
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def history(self) -> List[types.Content]:
+        with self._lock:
+            return self.context + self.turns
+
+    def record(self, question: types.Content, answer: types.Content) -> None:
+        with self._lock:
+            self.turns += [question, answer]
+            self.size += _text_size(question) + _text_size(answer)
+
+    def trim(self, max_size: int) -> None:
+        """Drop the oldest exchanges until the turns fit in `max_size` bytes."""
+        with self._lock:
+            while self.turns and self.size > max_size:
+                dropped, self.turns = self.turns[:2], self.turns[2:]
+                self.size -= sum(_text_size(c) for c in dropped)
+
+
 class GeminiClient:
     """Infrastructure service that wraps the Google Gemini API for chat interactions.
 
-    Maintains conversation history for multi-turn chat and streams responses.
+    Streams responses for multi-turn chats. The history lives in `Conversation`
+    objects: callers serving many users keep one per user (`new_conversation`),
+    single-user callers use the client's own.
     """
 
     MODEL = "gemini-3-flash-preview"
@@ -35,22 +72,30 @@ Kuralların:
 - Olumsuz yorumları da dürüstçe paylaş, tek taraflı olma
 - Eğer bir bilgiye sahip değilsen, bunu açıkça belirt
 
-Aşağıda sana verilen analiz verileri, tüm katalog üzerinden yapılan kapsamlı bir analizdir.
-Bu verileri kullanarak kullanıcının sorularını yanıtla."""
+Konuşmanın başında sana tüm kataloğun kısa bir özeti verilir. Her sorunun yanında ise o soruyla
+ilgili kategori, ürün ve sıralama verileri gelir. Soruları bu verilere dayanarak yanıtla; bir sorunun
+verisi önceki sorulardakinden farklıysa en güncel olanı esas al."""
 
     def __init__(self, api_key: str) -> None:
         self._client = genai.Client(api_key=api_key)
-        self._history: list[types.Content] = []
+        # Context prefix for new conversations. A conversation keeps the prefix
+        # it started with, so re-injecting context (e.g. after a catalog
+        # reload) never changes a conversation mid-flight.
+        self._context: list[types.Content] = []
+        self._conversation = Conversation(self._context)
         self._context_injected = False
 
     def inject_context(self, analysis_context: str) -> None:
-        """Inject the product analysis context as the first message in the conversation."""
+        """Set the product analysis context used as the first message of new conversations.
+
+        Conversations adopt it on their next message only if they have no turns yet.
+        """
         context_message = types.Content(
             role="user",
             parts=[
                 types.Part.from_text(
-                    text=f"İşte güzellik ürünleri veritabanının kapsamlı analizi:\n\n{analysis_context}\n\n"
-                    "Bu verileri kullanarak sorularıma yanıt vereceksin. Hazır mısın?"
+                    text=f"İşte güzellik ürünleri veritabanının özet analizi:\n\n{analysis_context}\n\n"
+                    "Her sorumla birlikte o soruyla ilgili ayrıntılı verileri de göndereceğim. Hazır mısın?"
                 ),
             ],
         )
@@ -58,26 +103,55 @@ Bu verileri kullanarak kullanıcının sorularını yanıtla."""
             role="model",
             parts=[
                 types.Part.from_text(
-                    text="Evet, güzellik ürünleri veritabanının analizini aldım. "
-                    "Tüm kategoriler, puanlar, yorumlar, fiyat aralıkları ve trend ürünler hakkında "
-                    "detaylı bilgiye sahibim. Sorularınızı yanıtlamaya hazırım!"
+                    text="Evet, güzellik ürünleri veritabanının özet analizini aldım. "
+                    "Sorularınızı, her biriyle gelen ayrıntılı ürün ve kategori verilerine dayanarak "
+                    "yanıtlamaya hazırım!"
                 ),
             ],
         )
-        self._history = [context_message, ack_message]
+        self._context = [context_message, ack_message]
         self._context_injected = True
 
-    def chat_stream(self, user_message: str) -> Generator[str, None, None]:
-        """Send a message and stream the response back, maintaining conversation history."""
+    def new_conversation(self) -> Conversation:
+        """An empty conversation on the latest analysis context."""
+        return Conversation(self._context)
+
+    def chat_stream(
+        self, user_message: str, context: str | None = None, conversation: Conversation | None = None
+    ) -> Generator[str, None, None]:
+        """Send a message and stream the response back, maintaining conversation history.
+
+        `context` is catalog data retrieved for this message. It is sent along
+        with the message but not kept in the history, so later turns only
+        carry the data retrieved for them. The exchange is recorded in
+        `conversation` (default: the client's own) once the answer is complete.
+        """
         if not self._context_injected:
             raise RuntimeError("Önce inject_context() ile analiz bağlamı yüklenmeli.")
 
-        # Add user message to history
+        # Bind to the current conversation so a concurrent reset or context
+        # reload does not redirect this stream's history
+        if conversation is None:
+            conversation = self._conversation
+        if not conversation.turns:
+            conversation.context = self._context
+
         user_content = types.Content(
             role="user",
             parts=[types.Part.from_text(text=user_message)],
         )
-        self._history.append(user_content)
+        # The request carries the retrieved data; the history keeps only the message
+        contents = conversation.history()
+        request_content = user_content
+        if context:
+            request_content = types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_text(
+                        text=f"Bu soruyla ilgili katalog verileri:\n\n{context}\n\nSoru: {user_message}"
+                    ),
+                ],
+            )
 
         config = types.GenerateContentConfig(
             system_instruction=self.SYSTEM_PROMPT,
@@ -88,7 +162,7 @@ Bu verileri kullanarak kullanıcının sorularını yanıtla."""
 
         for chunk in self._client.models.generate_content_stream(
             model=self.MODEL,
-            contents=self._history,
+            contents=contents + [request_content],
             config=config,
         ):
             text = chunk.text
@@ -96,21 +170,21 @@ Bu verileri kullanarak kullanıcının sorularını yanıtla."""
                 full_response.append(text)
                 yield text
 
-        # Add assistant response to history
+        # Add the exchange to the history
         assistant_content = types.Content(
             role="model",
             parts=[types.Part.from_text(text="".join(full_response))],
         )
-        self._history.append(assistant_content)
+        conversation.record(user_content, assistant_content)
 
-    def chat(self, user_message: str) -> str:
+    def chat(self, user_message: str, context: str | None = None, conversation: Conversation | None = None) -> str:
         """Send a message and return the full response (non-streaming)."""
-        return "".join(self.chat_stream(user_message))
+        return "".join(self.chat_stream(user_message, context, conversation))
 
     def reset_conversation(self) -> None:
-        """Reset conversation history but keep the analysis context."""
-        if self._context_injected and len(self._history) >= 2:
-            self._history = self._history[:2]  # Keep only context + ack
-        else:
-            self._history = []
-            self._context_injected = False
+        """Start a new conversation (the client's own) on the latest analysis context."""
+        self._conversation = self.new_conversation()
+
+
+def _text_size(content: types.Content) -> int:
+    return sum(len(part.text.encode("utf-8")) for part in content.parts if part.text)
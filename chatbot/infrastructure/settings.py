@@ -0,0 +1,35 @@
+"""Settings - numeric configuration read from environment variables."""
+
+from __future__ import annotations
+import logging
+import math
+import os
+from typing import Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", int, float)
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer setting; an unset, empty or malformed value gives `default` (the latter with a warning)."""
+    return _env_number(name, default, int)
+
+
+def env_float(name: str, default: float) -> float:
+    """Finite float setting; an unset, empty or malformed value gives `default` (the latter with a warning)."""
+    return _env_number(name, default, float)
+
+
+def _env_number(name: str, default: T, cast: Callable[[str], T]) -> T:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        value = None
+    if value is None or not math.isfinite(value):
+        logger.warning("Uyarı: %s=%r geçersiz, varsayılan %s kullanılıyor.", name, raw, default)
+        return default
+    return value
@@ -5,6 +5,7 @@ import sys
 import os
 
 from chatbot.application.services.chatbot_service import ChatbotService
+from chatbot.infrastructure.data.csv_sources import default_csv_path
 
 
 # ANSI color codes
@@ -34,6 +35,7 @@ BANNER = f"""
 HELP_TEXT = f"""
 {Colors.YELLOW}Komutlar:{Colors.RESET}
   {Colors.GREEN}/stats{Colors.RESET}    - Hızlı istatistikleri göster (LLM kullanmadan)
+  {Colors.GREEN}/ara{Colors.RESET} ...  - Ürün ara, yazım hatalarına toleranslı (örn. /ara maskra)
   {Colors.GREEN}/reset{Colors.RESET}    - Konuşmayı sıfırla
   {Colors.GREEN}/help{Colors.RESET}     - Bu yardım mesajını göster
   {Colors.GREEN}/quit{Colors.RESET}     - Chatbot'tan çık
@@ -105,6 +107,21 @@ def run_cli(csv_path: str, api_key: str) -> None:
                     print(f"{Colors.RED}Hata: {e}{Colors.RESET}")
                 continue
 
+            elif command == "/ara" or command.startswith("/ara "):
+                query = user_input[4:].strip()
+                if not query:
+                    print(f"{Colors.RED}Kullanım: /ara <ürün veya kategori>{Colors.RESET}\n")
+                    continue
+                results = chatbot.search_products(query)
+                if not results:
+                    print(f"{Colors.DIM}Sonuç bulunamadı.{Colors.RESET}\n")
+                    continue
+                print(f"\n{Colors.YELLOW}🔎 Arama Sonuçları:{Colors.RESET}")
+                for r in results:
+                    print(f"  - {r['name']} ({r['category']}) - {r['price']}, {r['rating']}")
+                print()
+                continue
+
             elif command == "/reset":
                 chatbot.reset_conversation()
                 print(f"{Colors.GREEN}✓ Konuşma sıfırlandı.{Colors.RESET}\n")
@@ -125,14 +142,36 @@ def run_cli(csv_path: str, api_key: str) -> None:
             print(f"\n{Colors.RED}Yanıt alınırken hata oluştu: {e}{Colors.RESET}\n")
 
 
+def build_snapshot_main() -> None:
+    """Prebuild the catalog snapshot (e.g. at deploy time) so the first boot skips CSV parsing."""
+    from chatbot.infrastructure.data.csv_product_repository import CsvProductRepository
+
+    csv_path = default_csv_path()
+    try:
+        snapshot_path = CsvProductRepository(csv_path, use_snapshot=True).build_snapshot()
+    except (FileNotFoundError, OSError) as e:
+        print(f"{Colors.RED}Hata: {e}{Colors.RESET}")
+        sys.exit(1)
+    print(f"{Colors.GREEN}✓ Katalog önbelleği oluşturuldu: {snapshot_path}{Colors.RESET}")
+
+
+def import_sqlite_main(db_path: str) -> None:
+    """Import the CSV source into a SQLite database that can replace it as `BEAUTYBOT_CSV_PATH`."""
+    from chatbot.infrastructure.data.sqlite_product_repository import SqliteProductRepository
+
+    csv_path = default_csv_path()
+    try:
+        count = SqliteProductRepository.import_from_csv(csv_path, db_path)
+    except (FileNotFoundError, OSError) as e:
+        print(f"{Colors.RED}Hata: {e}{Colors.RESET}")
+        sys.exit(1)
+    print(f"{Colors.GREEN}✓ {count} ürün SQLite veritabanına aktarıldı: {db_path}{Colors.RESET}")
+
+
 def main() -> None:
     """Entry point for the CLI chatbot."""
     # Determine CSV path
-    csv_path = os.environ.get("BEAUTYBOT_CSV_PATH")
-    if not csv_path:
-        # Default: look for CSV in project root
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        csv_path = os.path.join(project_root, "all_categories_20250207_031918.csv")
+    csv_path = default_csv_path()
 
     # Get API key
     api_key = os.environ.get("GEMINI_API_KEY")
@@ -3,9 +3,21 @@
 from __future__ import annotations
 import os
 import json
+import re
+import secrets
+import threading
 from flask import Flask, request, jsonify, Response, stream_with_context, send_from_directory
 
 from chatbot.application.services.chatbot_service import ChatbotService
+from chatbot.application.services.catalog_watcher import CatalogWatcher
+from chatbot.domain.entities.catalog_query import CatalogQuery
+from chatbot.infrastructure.data.csv_sources import default_csv_path
+from chatbot.infrastructure.settings import env_float
+
+# Conversations are per browser session: a cookie, or this header for other clients
+SESSION_COOKIE = "beautybot_session"
+SESSION_HEADER = "X-Session-Id"
+_SESSION_ID = re.compile(r"[A-Za-z0-9_-]{16,64}")
 
 
 def create_app(csv_path: str | None = None, api_key: str | None = None) -> Flask:
@@ -19,10 +31,8 @@ def create_app(csv_path: str | None = None, api_key: str | None = None) -> Flask
 
     # Resolve paths
     if not csv_path:
-        csv_path = os.environ.get("BEAUTYBOT_CSV_PATH")
-    if not csv_path:
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        csv_path = os.path.join(project_root, "all_categories_20250207_031918.csv")
+        # File, directory of per-category CSVs, or glob
+        csv_path = default_csv_path()
 
     if not api_key:
         api_key = os.environ.get("GEMINI_API_KEY")
@@ -34,6 +44,19 @@ def create_app(csv_path: str | None = None, api_key: str | None = None) -> Flask
     status = chatbot.initialize()
     print(f"✓ {status}")
 
+    # Reload the catalog in the background when the CSV changes (0 disables polling)
+    reload_interval = env_float("BEAUTYBOT_RELOAD_INTERVAL", 30.0)
+    if reload_interval > 0:
+        CatalogWatcher(chatbot, interval=reload_interval).start()
+
+    admin_token = os.environ.get("BEAUTYBOT_ADMIN_TOKEN")
+
+    def is_admin() -> bool:
+        """Whether the request carries the admin token (admin routes are off without one)."""
+        return bool(admin_token) and secrets.compare_digest(
+            request.headers.get("X-Admin-Token", "").encode(), admin_token.encode()
+        )
+
     # --- Routes ---
 
     @app.route("/")
@@ -55,20 +78,107 @@ def create_app(csv_path: str | None = None, api_key: str | None = None) -> Flask
             "positive_ratio": sentiment["positive_ratio"],
             "negative_ratio": sentiment["negative_ratio"],
             "trending_count": overview["trending_count"],
+            "catalog_version": chatbot.catalog_status()["catalog_version"],
         })
 
     @app.route("/api/insights")
     def insights():
-        """Return detailed insights as JSON."""
+        """Return detailed insights as JSON.
+
+        `rating_key` (rating, bayesian, wilson) picks the rating behind top_rated and best_value.
+        """
         analyzer = chatbot._analysis_service.analyzer
+        key = request.args.get("rating_key", "rating")
+        try:
+            top_rated = analyzer.top_rated_products(5, key=key)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         return jsonify({
             "top_commented": analyzer.most_discussed_products(5),
             "top_engaging": analyzer.engagement_leaders(5),
+            "top_rated": top_rated,
             "polarizing": analyzer.polarizing_products(5),
-            "best_value": analyzer.best_value_products(5),
+            "best_value": analyzer.best_value_products(5, key),
             "price_by_category": analyzer.price_comparison_by_category(),
+            "comment_trends": analyzer.trend_summary(5),
         })
 
+    @app.route("/api/trends")
+    def trends():
+        """Comment activity and rising products: /api/trends?period=week&category=ruj&limit=10
+
+        `product_id` narrows the activity histogram to one product; `period` is week or month.
+        """
+        analyzer = chatbot._analysis_service.analyzer
+        args = request.args
+        category = args.get("category") or None
+        limit = min(max(args.get("limit", 10, type=int), 1), 50)
+        try:
+            activity = analyzer.comment_activity(args.get("period", "month"), category, args.get("product_id") or None)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"activity": activity, "rising": analyzer.comment_trends(limit, category)})
+
+    @app.route("/api/prices")
+    def prices():
+        """Price distribution and price position: /api/prices?category=ruj&price=200
+
+        `price` adds the share of the category's products that cost more
+        (cheaper_than); `product_id` does the same for a product's own price.
+        A `price` that is not a positive number is a 400, an unknown product a 404.
+        """
+        analyzer = chatbot._analysis_service.analyzer
+        args = request.args
+        category = args.get("category") or None
+        product_id = args.get("product_id") or None
+        if product_id is not None:
+            try:
+                return jsonify({"position": analyzer.product_price_position(product_id)})
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 404
+        distribution = chatbot._analysis_service.catalog.price_range_by_category(category) if category else None
+        position = None
+        if "price" in args:
+            try:
+                position = analyzer.price_position(float(args["price"]), category)
+            except ValueError:
+                return jsonify({"error": "Fiyat pozitif bir sayı olmalı."}), 400
+        return jsonify({"category": category, "distribution": distribution, "position": position})
+
+    @app.route("/api/search")
+    def search():
+        """Product search with typo tolerance: /api/search?q=maskra&limit=5"""
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "Arama sorgusu gerekli."}), 400
+        limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+        return jsonify({"query": query, "results": chatbot.search_products(query, limit)})
+
+    @app.route("/api/products")
+    def products():
+        """Filtered product listing: /api/products?max_price=100&min_rating=4&sort=comments&offset=0&limit=20
+
+        Filters: category, min_price, max_price, min_rating, min_comments, color, origin.
+        Sort: rating, comments, favorites, engagement, polarization, bayesian, wilson, price, price_desc.
+        """
+        args = request.args
+        try:
+            query = CatalogQuery(
+                category=args.get("category") or None,
+                min_price=args.get("min_price", type=float),
+                max_price=args.get("max_price", type=float),
+                min_rating=args.get("min_rating", type=float),
+                min_comments=args.get("min_comments", type=int),
+                color=args.get("color") or None,
+                origin=args.get("origin") or None,
+                sort=args.get("sort", "rating"),
+                offset=max(args.get("offset", 0, type=int), 0),
+                limit=min(max(args.get("limit", 20, type=int), 1), 50),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(chatbot.query_products(query))
+
     @app.route("/api/chat", methods=["POST"])
     def chat():
         """Handle chat message and return streamed response via SSE."""
@@ -80,32 +190,89 @@ def create_app(csv_path: str | None = None, api_key: str | None = None) -> Flask
         if not message:
             return jsonify({"error": "Boş mesaj gönderilemez."}), 400
 
+        session_id = _session_id()
+        is_new = session_id is None
+        if is_new:
+            session_id = secrets.token_urlsafe(24)
+
         def generate():
             try:
-                for chunk in chatbot.chat_stream(message):
+                for chunk in chatbot.chat_stream(message, session_id):
                     yield f"data: {json.dumps({'text': chunk})}\n\n"
                 yield f"data: {json.dumps({'done': True})}\n\n"
             except Exception as e:
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
 
-        return Response(
+        response = Response(
             stream_with_context(generate()),
             mimetype="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "X-Accel-Buffering": "no",
+                SESSION_HEADER: session_id,
             },
         )
+        if is_new:
+            response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="Lax")
+        return response
+
+    @app.route("/api/admin/reload", methods=["POST"])
+    def admin_reload():
+        """Rebuild the catalog from the CSV in the background and swap it in."""
+        if not is_admin():
+            return jsonify({"error": "Yetkisiz."}), 403
+        if chatbot.catalog_status()["reloading"]:
+            return jsonify({"status": "busy", "message": "Katalog şu anda güncelleniyor."}), 409
+
+        threading.Thread(target=chatbot.reload, name="catalog-reload", daemon=True).start()
+        return jsonify({"status": "started", "message": "Katalog yeniden yükleniyor."}), 202
+
+    @app.route("/api/admin/delta", methods=["POST"])
+    def admin_delta():
+        """Apply a partial CSV export (a path on the server) to the loaded catalog."""
+        if not is_admin():
+            return jsonify({"error": "Yetkisiz."}), 403
+        data = request.get_json(silent=True) or {}
+        if not data.get("path"):
+            return jsonify({"error": "Delta CSV yolu gerekli."}), 400
+        try:
+            result = chatbot.apply_delta(data["path"])
+        except FileNotFoundError as e:
+            return jsonify({"error": str(e)}), 404
+        if result is None:
+            return jsonify({"status": "busy", "message": "Katalog şu anda güncelleniyor, daha sonra tekrar deneyin."}), 409
+        return jsonify({"status": "ok", **result, **chatbot.catalog_status()})
+
+    @app.route("/api/status")
+    def status():
+        """Return the served catalog version and when it was loaded."""
+        catalog = chatbot.catalog_status()
+        return jsonify({key: catalog[key] for key in ("catalog_version", "loaded_at", "last_reload_seconds")})
+
+    @app.route("/api/admin/status")
+    def admin_status():
+        """Return the served catalog version, reload timings, cache and session metrics."""
+        if not is_admin():
+            return jsonify({"error": "Yetkisiz."}), 403
+        return jsonify(chatbot.catalog_status())
 
     @app.route("/api/reset", methods=["POST"])
     def reset():
-        """Reset the conversation."""
-        chatbot.reset_conversation()
+        """Reset the caller's conversation."""
+        session_id = _session_id()
+        if session_id is not None:
+            chatbot.reset_conversation(session_id)
         return jsonify({"status": "ok", "message": "Konuşma sıfırlandı."})
 
     return app
 
 
+def _session_id() -> str | None:
+    """The request's session id from the header or cookie, if well-formed."""
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    return session_id if session_id and _SESSION_ID.fullmatch(session_id) else None
+
+
 def main() -> None:
     """Entry point for the web server."""
     import sys
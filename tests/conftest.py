@@ -0,0 +1,89 @@
+"""Shared fixtures: small synthetic catalogs built from Product objects, no data files needed."""
+
+from __future__ import annotations
+import json
+import random
+from typing import Callable, List
+
+import pytest
+
+from chatbot.domain.entities.product import Product
+from chatbot.domain.value_objects.lazy_comments import LazyComments
+from chatbot.domain.value_objects.price import Price
+from chatbot.domain.value_objects.rating import Rating
+from chatbot.domain.value_objects.star_distribution import StarDistribution
+
+CATEGORIES = ("Ruj", "Maskara", "Nemlendirici", "Şampuan")
+WORDS = ("mat", "nemlendirici", "kalıcı", "doğal", "hafif", "parlak", "vegan", "onarıcı")
+COMMENTS = (
+    "Kokusu çok güzel, fiyatı da uygun",
+    "Ambalajı kırık geldi, kargo geç",
+    "Rengi tam istediğim gibi, kalıcılığı süper",
+    "Cildimi kurutmadı, dokusu hafif",
+    "Pahalı ama kalitesi iyi",
+    "",
+)
+
+
+def make_product(
+    product_id: str,
+    category: str = "Ruj",
+    price: float = 100.0,
+    score: float = 4.0,
+    rating_count: int = 10,
+    comments: List[dict] | None = None,
+    name: str | None = None,
+) -> Product:
+    """A product with the given fields; comments are export-style dicts (rate, comment, date, likes)."""
+    raw = json.dumps(comments or [], ensure_ascii=False)
+    return Product(
+        product_id=product_id,
+        name=name or f"Ürün {product_id}",
+        url=f"https://example.com/{product_id}",
+        subcategory=category,
+        description="",
+        price=Price(raw=f"{price} TL" if price else "", amount=price),
+        rating=Rating.create(score, rating_count, score),
+        star_distribution=StarDistribution.create(star_4=rating_count // 2, star_5=rating_count - rating_count // 2),
+        comments=LazyComments.from_json(raw),
+        total_comment_count=len(comments or []),
+    )
+
+
+def random_products(count: int, seed: int = 0, prefix: str = "p") -> List[Product]:
+    """`count` products with varied categories, prices, ratings, names and dated comments."""
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        comments = [
+            {
+                "userFullName": "A** B**",
+                "rate": rng.randint(1, 5),
+                "comment": rng.choice(COMMENTS),
+                "date": f"{rng.randint(1, 28)} {rng.choice(('Ocak', 'Mart', 'Haziran', 'Ekim'))} 202{rng.randint(2, 4)}",
+                "likes": rng.randint(0, 30),
+            }
+            for _ in range(rng.randint(0, 6))
+        ]
+        products.append(
+            make_product(
+                f"{prefix}{i}",
+                category=rng.choice(CATEGORIES + ("",)),
+                price=rng.choice((0.0, round(rng.uniform(20, 2000), 2))),
+                score=rng.choice((0.0, round(rng.uniform(1, 5), 1))),
+                rating_count=rng.randint(0, 400),
+                comments=comments,
+                name=" ".join(rng.sample(WORDS, 3)),
+            )
+        )
+    return products
+
+
+@pytest.fixture
+def product_factory() -> Callable[..., Product]:
+    return make_product
+
+
+@pytest.fixture
+def product_batch() -> Callable[..., List[Product]]:
+    return random_products
@@ -0,0 +1,44 @@
+"""AggregationEngine: the vectorized snapshot must equal a plain loop over the products."""
+
+from __future__ import annotations
+
+import pytest
+
+from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.services.aggregation_engine import AggregationEngine
+
+
+def test_snapshot_matches_a_per_product_loop(product_batch):
+    catalog = ProductCatalog()
+    catalog.load(product_batch(150))
+    snapshot = AggregationEngine(catalog).build()
+    products = catalog.products
+
+    rated = [p for p in products if p.rating.has_data]
+    assert snapshot.total_products == len(products)
+    assert snapshot.products_with_ratings == len(rated)
+    assert snapshot.products_with_comments == sum(p.has_comments for p in products)
+    assert snapshot.average_rating == pytest.approx(sum(p.rating.score for p in rated) / len(rated))
+    assert snapshot.total_comments == sum(len(p.comments) for p in products)
+    assert snapshot.sentiment_counts == (
+        sum(p.comments.positive_count for p in products),
+        sum(p.comments.negative_count for p in products),
+        sum(p.comments.neutral_count for p in products),
+    )
+
+    assert list(snapshot.categories) == catalog.categories
+    for category, stats in snapshot.categories.items():
+        members = [p for p in products if p.subcategory == category]
+        priced = [p.price.amount for p in members if p.price.is_valid]
+        scores = [p.rating.score for p in members if p.rating.has_data]
+        assert stats.product_count == len(members)
+        assert stats.rated_count == len(scores)
+        assert stats.commented_count == sum(p.has_comments for p in members)
+        assert stats.total_comments == sum(len(p.comments) for p in members)
+        assert stats.total_favorites == sum(p.favorite_count for p in members)
+        assert stats.average_rating == pytest.approx(sum(scores) / len(scores) if scores else 0)
+        if priced:
+            assert stats.price_range == pytest.approx((min(priced), max(priced), sum(priced) / len(priced)))
+        else:
+            assert stats.price_range is None
+        assert list(stats.top_rated) == catalog.top_rated_by_category(category, AggregationEngine.CATEGORY_DEPTH)
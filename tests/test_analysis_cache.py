@@ -0,0 +1,32 @@
+"""AnalysisCache: per-version results, bounded in entries, handed out as copies."""
+
+from __future__ import annotations
+
+from chatbot.domain.services.analysis_cache import AnalysisCache
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = AnalysisCache(max_entries=2)
+    cache.get_or_compute(1, "a", lambda: 1)
+    cache.get_or_compute(1, "b", lambda: 2)
+    cache.get_or_compute(1, "a", lambda: 0)  # hit: "a" becomes most recent
+    cache.get_or_compute(1, "c", lambda: 3)
+
+    assert cache.get_or_compute(1, "a", lambda: 0) == 1
+    assert cache.get_or_compute(1, "b", lambda: 20) == 20
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 2
+
+
+def test_a_new_version_drops_every_entry():
+    cache = AnalysisCache()
+    cache.get_or_compute(1, "a", lambda: 1)
+    assert cache.get_or_compute(2, "a", lambda: 2) == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_callers_get_their_own_copy_of_mutable_results():
+    cache = AnalysisCache()
+    first = cache.get_or_compute(1, "a", lambda: {"items": [1, 2]})
+    first["items"].append(3)
+    assert cache.get_or_compute(1, "a", lambda: None) == {"items": [1, 2]}
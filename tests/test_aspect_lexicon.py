@@ -0,0 +1,37 @@
+"""Aspect lexicon: which words name an aspect, and batch extraction over joined comments."""
+
+from __future__ import annotations
+
+import pytest
+
+from chatbot.domain.aspect_lexicon import ASPECT_KEYS, extract_aspects, match_aspect
+from chatbot.domain.text_normalizer import fold
+
+
+@pytest.mark.parametrize(
+    "word, aspect",
+    [
+        ("tonu", "renk"),
+        ("renginde", "renk"),
+        ("kutusunda", "ambalaj"),
+        ("kapağı", "ambalaj"),
+        ("kalıcılığı", "kalicilik"),
+        ("fiyatıyla", "fiyat"),
+        ("kurutuyor", "cilt"),
+        ("gözeneği", "kapaticilik"),
+        ("kokmuyor", "koku"),
+    ],
+)
+def test_inflected_terms_match(word, aspect):
+    assert match_aspect(fold(word)) == aspect
+
+
+@pytest.mark.parametrize("word", ["tonik", "kütüphane", "paramparça", "dokunma", "şişirdi"])
+def test_longer_words_sharing_a_prefix_do_not_match(word):
+    assert match_aspect(fold(word)) is None
+
+
+def test_separator_inside_a_comment_keeps_comment_offsets():
+    comments, aspects, sentiment = extract_aspects(["rengi\x00 güzel", "kargo berbat", "kokusu"], [5, 1, 3])
+    found = {(int(c), ASPECT_KEYS[a], int(s)) for c, a, s in zip(comments, aspects, sentiment)}
+    assert found == {(0, "renk", 1), (1, "ambalaj", -1), (2, "koku", 0)}
@@ -0,0 +1,132 @@
+"""ProductCatalog.apply_delta: a patched catalog must answer like one rebuilt from the same products."""
+
+from __future__ import annotations
+import dataclasses
+
+import pytest
+
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.catalog_query import CatalogQuery
+from chatbot.domain.entities.leaderboards import Leaderboards
+from chatbot.domain.entities.product_catalog import CatalogDelta, PRICE_QUANTILES, ProductCatalog
+from chatbot.domain.services.product_analyzer import ProductAnalyzer
+
+
+def _loaded(products):
+    catalog = ProductCatalog()
+    catalog.load(list(products))
+    return catalog
+
+
+def _ids(products):
+    return [p.product_id for p in products]
+
+
+def _answers(catalog: ProductCatalog) -> dict:
+    """Everything the indexes serve, in comparable form."""
+    columns = catalog.columns
+    categories = catalog.categories + [None]
+    analyzer = ProductAnalyzer(catalog)
+    return {
+        "products": _ids(catalog.products),
+        "by_id": all(catalog.get_by_id(p.product_id) is p for p in catalog.products),
+        "rows": [catalog.row_of(p.product_id) for p in catalog.products],
+        "category_counts": catalog.category_counts,
+        "columns": {name: getattr(columns, name).tolist() for name in (*CatalogColumns._SCHEMA, "bayesian_rating", "wilson_score")},
+        "rankings": {
+            (metric, category): _ids(catalog.ranking(metric, limit=50, category=category))
+            for metric in Leaderboards.METRICS
+            for category in categories
+        },
+        "queries": [
+            (_ids(page.products), page.total, page.facets)
+            for page in (
+                catalog.query(CatalogQuery(limit=200)),
+                catalog.query(CatalogQuery(min_price=100, max_price=900, sort="price", limit=200)),
+                catalog.query(CatalogQuery(category="Ruj", min_rating=3, sort="comments", limit=200)),
+            )
+        ],
+        "price_counts": [catalog.price_sketch.count(category) for category in categories],
+        "price_quantiles": catalog.price_sketch.category_quantiles(PRICE_QUANTILES),
+        "search": [_ids(catalog.search(word, limit=200)) for word in ("mat", "doğal vegan", "Ürün")],
+        "fuzzy": [_ids(catalog.fuzzy_search(word, limit=50)) for word in ("nemlendrici", "parlk")],
+        "timeline": (catalog.timeline.histogram("month")[0], catalog.timeline.histogram("month")[1].tolist()),
+        "rising": catalog.timeline.rising(20).tolist(),
+        "aspects": catalog.aspects.totals().tolist(),
+        "context": analyzer.generate_llm_context(),
+    }
+
+
+def test_apply_delta_matches_a_full_reload(product_batch):
+    products = product_batch(120)
+    catalog = _loaded(products)
+    catalog.aspects  # built, so the delta has to patch it too
+    replaced = [dataclasses.replace(p, product_id=products[i].product_id) for i, p in enumerate(product_batch(30, seed=1))]
+    added = product_batch(25, seed=2, prefix="new")
+    deleted = [products[i].product_id for i in (0, 5, 17, 64, 119)]
+    delta = CatalogDelta(upserts=replaced + added, deletions=deleted + ["unknown"])
+
+    result = catalog.apply_delta(delta)
+
+    expected = list(products)
+    for i, p in enumerate(replaced):
+        expected[i] = p
+    expected = [p for p in expected + added if p.product_id not in deleted]
+    # Three of the replaced products are deleted as well
+    assert result == {"updated": 27, "added": 25, "deleted": 5}
+    assert _answers(catalog) == _answers(_loaded(expected))
+
+
+def test_apply_delta_dropping_a_category(product_factory):
+    catalog = _loaded([product_factory("a", "Ruj"), product_factory("b", "Maskara"), product_factory("c", "Ruj")])
+    catalog.apply_delta(CatalogDelta(upserts=[product_factory("c", "Ruj", price=50)], deletions=["b"]))
+    assert catalog.categories == ["Ruj"]
+    assert _answers(catalog) == _answers(_loaded([catalog.products[0], catalog.products[1]]))
+
+
+def test_duplicate_ids_in_a_delta_take_the_last_row(product_factory):
+    catalog = _loaded([product_factory("a"), product_factory("b")])
+    first, last = product_factory("new", price=10), product_factory("new", price=20)
+    update_1, update_2 = product_factory("a", price=30), product_factory("a", price=40)
+
+    result = catalog.apply_delta(CatalogDelta(upserts=[first, update_1, last, update_2]))
+
+    assert result == {"updated": 1, "added": 1, "deleted": 0}
+    assert _ids(catalog.products) == ["a", "b", "new"]
+    assert catalog.get_by_id("new") is last and catalog.get_by_id("a") is update_2
+    assert _answers(catalog) == _answers(_loaded([update_2, catalog.products[1], last]))
+
+
+def test_deletion_wins_over_an_upsert(product_factory):
+    catalog = _loaded([product_factory("a"), product_factory("b")])
+    result = catalog.apply_delta(CatalogDelta(upserts=[product_factory("a", price=5)], deletions=["a"]))
+    assert result == {"updated": 0, "added": 0, "deleted": 1}
+    assert _ids(catalog.products) == ["b"]
+
+
+def test_copy_is_independent_of_the_original(product_batch):
+    products = product_batch(60)
+    catalog = _loaded(products)
+    before = _answers(catalog)
+
+    changed = catalog.copy()
+    changed.apply_delta(CatalogDelta(upserts=product_batch(10, seed=3, prefix="new"), deletions=[products[3].product_id]))
+
+    assert _answers(catalog) == before
+    assert changed.total_products == 69
+    assert changed.version == catalog.version + 1
+
+
+def test_a_failing_delta_leaves_the_served_catalog_untouched(product_batch, monkeypatch):
+    catalog = _loaded(product_batch(40))
+    before = _answers(catalog)
+    changed = catalog.copy()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("index failure")
+
+    monkeypatch.setattr(changed.price_sketch, "apply", fail)
+    with pytest.raises(RuntimeError):
+        changed.apply_delta(CatalogDelta(upserts=product_batch(5, seed=4, prefix="new")))
+    assert _answers(catalog) == before
+
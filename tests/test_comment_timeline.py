@@ -0,0 +1,44 @@
+"""CommentTimeline: week and month buckets of comment dates, and trend windows."""
+
+from __future__ import annotations
+from datetime import date, timedelta
+
+from chatbot.domain.entities.comment_timeline import CommentTimeline
+
+
+def _comments(*days: date) -> list:
+    return [{"rate": 5, "comment": "", "date": day.strftime("%d.%m.%Y"), "likes": 0} for day in days]
+
+
+def test_months_and_monday_weeks(product_factory):
+    products = [
+        product_factory("a", comments=_comments(date(2024, 1, 31), date(2024, 3, 1))),
+        product_factory("b", comments=_comments(date(2024, 3, 4), date(2024, 3, 10)) + [{"rate": 4, "date": "?"}]),
+    ]
+    timeline = CommentTimeline(products)
+
+    first, counts = timeline.histogram("month")
+    assert timeline.bucket_start(first, "month") == "2024-01"
+    assert counts.tolist() == [1, 0, 3]
+
+    first, counts = timeline.histogram("week", rows=[1])
+    # 2024-03-04 is a Monday and 2024-03-10 the Sunday of the same week
+    assert timeline.bucket_start(first, "week") == "2024-03-04"
+    assert counts.tolist() == [2]
+
+
+def test_rising_compares_the_last_two_windows(product_factory):
+    newest = date(2024, 6, 30)
+    window = CommentTimeline.WINDOW_DAYS
+    recent = [newest - timedelta(days=k) for k in range(5)]
+    older = [newest - timedelta(days=window + k) for k in range(5)]
+    products = [
+        product_factory("growing", comments=_comments(*recent, older[0])),
+        product_factory("steady", comments=_comments(*recent, *older)),
+        product_factory("quiet", comments=_comments(newest - timedelta(days=1))),
+    ]
+    timeline = CommentTimeline(products)
+
+    assert timeline.recent.tolist() == [5, 5, 1]
+    assert timeline.previous.tolist() == [1, 5, 0]
+    assert timeline.rising().tolist() == [0]
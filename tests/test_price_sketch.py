@@ -0,0 +1,74 @@
+"""Prices: sketched quantiles and percentile ranks, and which prices filters and sorts accept."""
+
+from __future__ import annotations
+import math
+
+import numpy as np
+import pytest
+
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.catalog_query import CatalogQuery
+from chatbot.domain.entities.price_sketch import PriceSketch
+from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.services.product_analyzer import ProductAnalyzer
+
+
+def _sketch(products):
+    return PriceSketch(CatalogColumns(products, sorted({p.subcategory for p in products if p.subcategory})))
+
+
+def test_quantiles_are_within_the_bucket_width(product_factory):
+    prices = np.random.default_rng(0).lognormal(5, 1, 2000).round(2)
+    products = [product_factory(f"p{i}", "Ruj", price=float(price)) for i, price in enumerate(prices)]
+    sketch = _sketch(products)
+
+    for q, estimate in zip((0.1, 0.5, 0.9), sketch.quantiles((0.1, 0.5, 0.9), "Ruj")):
+        exact = np.sort(prices)[math.ceil(q * len(prices)) - 1]
+        assert estimate == pytest.approx(exact, rel=PriceSketch.GROWTH - 1)
+    assert sketch.category_quantiles((0.1, 0.5, 0.9))["Ruj"] == sketch.quantiles((0.1, 0.5, 0.9), "Ruj")
+    assert sketch.percentile_rank(float(np.median(prices)), "Ruj") == pytest.approx(0.5, abs=0.02)
+
+
+def test_prices_that_are_not_finite_are_skipped(product_factory):
+    products = [
+        product_factory("a", price=100.0),
+        product_factory("b", price=math.inf),
+        product_factory("c", price=math.nan),
+        product_factory("d", price=0.0),
+    ]
+    sketch = _sketch(products)
+    assert sketch.count("Ruj") == 1
+
+    sketch.apply(removed=[products[0]], added=[product_factory("e", price=-math.inf), product_factory("f", price=50.0)])
+    assert sketch.count("Ruj") == 1
+    assert sketch.quantiles((0.5,), "Ruj") == [pytest.approx(50.0, rel=PriceSketch.GROWTH - 1)]
+
+
+def test_price_position_rejects_prices_that_are_not_positive(product_factory):
+    catalog = ProductCatalog()
+    catalog.load([product_factory("a", price=100.0), product_factory("b", price=300.0)])
+    analyzer = ProductAnalyzer(catalog)
+
+    assert analyzer.price_position(200.0, "Ruj")["cheaper_than"] == 50.0
+    for price in (0.0, -1.0, math.nan, math.inf):
+        with pytest.raises(ValueError):
+            analyzer.price_position(price, "Ruj")
+
+
+def test_price_filters_and_sorts_skip_prices_that_are_not_finite(product_factory):
+    catalog = ProductCatalog()
+    catalog.load([
+        product_factory("a", price=100.0),
+        product_factory("b", price=200.0),
+        product_factory("c", price=math.inf),
+        product_factory("d", price=math.nan),
+        product_factory("e", price=0.0),
+    ])
+
+    page = catalog.query(CatalogQuery(min_price=150))
+    assert [p.product_id for p in page.products] == ["b"]
+    assert catalog.query(CatalogQuery(max_price=math.inf)).total == catalog.price_sketch.count() == 2
+    assert [p.product_id for p in catalog.query(CatalogQuery(sort="price_desc")).products][:2] == ["b", "a"]
+    assert [p.product_id for p in catalog.query(CatalogQuery(sort="price")).products][:2] == ["a", "b"]
+    with pytest.raises(ValueError):
+        CatalogQuery(max_price=math.nan)
@@ -0,0 +1,65 @@
+"""Bayesian and Wilson rating scores of CatalogColumns and the rankings built on them."""
+
+from __future__ import annotations
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+
+from chatbot.domain.entities.catalog_columns import CatalogColumns
+from chatbot.domain.entities.product_catalog import ProductCatalog
+from chatbot.domain.value_objects.star_distribution import StarDistribution
+
+
+def _wilson(positive: int, total: int, z: float = CatalogColumns.WILSON_Z) -> float:
+    share = positive / total
+    centre = share + z * z / (2 * total)
+    spread = z * math.sqrt(share * (1 - share) / total + z * z / (4 * total * total))
+    return (centre - spread) / (1 + z * z / total)
+
+
+def test_scores_match_their_formulas(product_factory):
+    # star_distribution: rating_count // 2 four-star, the rest five-star ratings
+    products = [product_factory("a", rating_count=4), product_factory("b", rating_count=100), product_factory("c", rating_count=0)]
+    columns = CatalogColumns(products, ["Ruj"])
+
+    prior = (2 * 4 + 2 * 5 + 50 * 4 + 50 * 5) / 104
+    weight = CatalogColumns.PRIOR_WEIGHT
+    assert columns.category_prior[0] == pytest.approx(prior)
+    assert columns.bayesian_rating[0] == pytest.approx((weight * prior + 18) / (weight + 4))
+    assert columns.bayesian_rating[1] == pytest.approx((weight * prior + 450) / (weight + 100))
+    assert columns.wilson_score[0] == pytest.approx(_wilson(4, 4))
+    assert columns.wilson_score[1] == pytest.approx(_wilson(100, 100))
+    assert columns.wilson_score[2] == 0.0
+    assert columns.has_stars.tolist() == [True, True, False]
+
+
+def test_few_ratings_rank_below_many_under_confidence_weighted_keys(product_factory):
+    def rated(product_id, score, **stars):
+        product = product_factory(product_id, score=score, rating_count=sum(stars.values()))
+        return dataclasses.replace(product, star_distribution=StarDistribution.create(**stars))
+
+    catalog = ProductCatalog()
+    catalog.load([
+        rated("few", 5.0, star_5=2),
+        rated("many", 4.8, star_4=80, star_5=320),
+        rated("poor", 2.0, star_1=50, star_3=50),
+        rated("none", 0.0),
+    ])
+
+    assert [p.product_id for p in catalog.top_rated(4)] == ["few", "many", "poor"]
+    assert [p.product_id for p in catalog.top_rated(4, key="bayesian")] == ["many", "few", "poor"]
+    assert [p.product_id for p in catalog.top_rated(4, key="wilson")] == ["many", "few", "poor"]
+
+
+def test_rating_keys_rank_by_their_own_scores(product_batch):
+    catalog = ProductCatalog()
+    catalog.load(product_batch(80))
+    for key in CatalogColumns.RATING_KEYS:
+        scale, eligible = catalog.columns.rating_scale(key)
+        rows = [catalog.row_of(p.product_id) for p in catalog.top_rated(80, key=key)]
+        assert np.all(np.diff(scale[rows]) <= 0)
+        assert eligible[rows].all()
+    with pytest.raises(ValueError):
+        catalog.top_rated(5, key="unknown")